@@ -0,0 +1,77 @@
+"""Compares the stdlib and fast JSON paths on the bridge's hot payloads
+
+run with `python -m benchmarks.bench_json`, orjson must be installed to see
+the fast path numbers
+"""
+
+import json
+import timeit
+
+from mcp_bridge import fastjson
+
+CHUNK = json.dumps(
+    {
+        "id": "chatcmpl-1",
+        "object": "chat.completion.chunk",
+        "created": 1,
+        "model": "test-model",
+        "choices": [
+            {"index": 0, "delta": {"content": "Hello"}, "finish_reason": None}
+        ],
+    }
+)
+
+JSONRPC_REQUEST = {
+    "jsonrpc": "2.0",
+    "method": "tools/call",
+    "id": 1,
+    "params": {"name": "run_query", "arguments": {"sql": "select 1", "limit": 100}},
+}
+
+ROWS = [{"id": i, "name": f"row {i}"} for i in range(200)]
+
+JSONRPC_RESPONSE = json.dumps(
+    {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": {
+            "content": [{"type": "text", "text": json.dumps(ROWS)}],
+            "isError": False,
+        },
+    }
+)
+
+
+def bench(label: str, stdlib, fast, number: int) -> None:
+    stdlib_us = timeit.timeit(stdlib, number=number) / number * 1e6
+    fast_us = timeit.timeit(fast, number=number) / number * 1e6
+    print(
+        f"{label:<28} stdlib {stdlib_us:8.2f} us  fast {fast_us:8.2f} us  "
+        f"x{stdlib_us / fast_us:5.2f}"
+    )
+
+
+def main() -> None:
+    print(f"orjson installed: {fastjson.HAS_ORJSON}")
+    bench(
+        "SSE chunk decode",
+        lambda: json.loads(CHUNK),
+        lambda: fastjson.loads(CHUNK),
+        100_000,
+    )
+    bench(
+        "JSON-RPC request encode",
+        lambda: json.dumps(JSONRPC_REQUEST).encode(),
+        lambda: fastjson.dumps(JSONRPC_REQUEST),
+        100_000,
+    )
+    bench(
+        "JSON-RPC response decode",
+        lambda: json.loads(JSONRPC_RESPONSE),
+        lambda: fastjson.loads(JSONRPC_RESPONSE),
+        10_000,
+    )
+
+
+if __name__ == "__main__":
+    main()
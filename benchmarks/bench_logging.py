@@ -0,0 +1,67 @@
+"""Measures the per-token cost of the streaming debug log line
+
+compares the eager f-string form with loguru's deferred formatting and with
+the debug_enabled() guard used on hot paths, at INFO (debug disabled) and
+DEBUG (debug written to a discarding sink).
+run with `python -m benchmarks.bench_logging`
+"""
+
+import json
+import timeit
+
+from types import SimpleNamespace
+
+from loguru import logger
+
+import mcp_bridge.config as bridge_config
+from mcp_bridge.log_utils import debug_enabled
+
+EVENT = "message"
+DATA = json.dumps(
+    {
+        "id": "chatcmpl-1",
+        "object": "chat.completion.chunk",
+        "created": 1,
+        "model": "test-model",
+        "choices": [
+            {"index": 0, "delta": {"content": "Hello"}, "finish_reason": None}
+        ],
+    }
+)
+
+
+def eager() -> None:
+    logger.debug(f"event: {EVENT},\ndata: {DATA},\nid: {None},\nretry: {None}")
+
+
+def deferred() -> None:
+    logger.debug("event: {},\ndata: {},\nid: {},\nretry: {}", EVENT, DATA, None, None)
+
+
+def guarded(debug: bool) -> None:
+    if debug:
+        logger.debug(
+            "event: {},\ndata: {},\nid: {},\nretry: {}", EVENT, DATA, None, None
+        )
+
+
+def main() -> None:
+    for level, number in (("INFO", 200_000), ("DEBUG", 20_000)):
+        logger.remove()
+        logger.add(lambda _: None, level=level)
+        bridge_config.config = SimpleNamespace(
+            logging=SimpleNamespace(log_level=level)
+        )
+        # hot paths evaluate the guard once per request, not per token
+        debug = debug_enabled()
+        for label, func in (
+            ("f-string", eager),
+            ("format args", deferred),
+            ("guard", lambda: guarded(debug)),
+        ):
+            per_call = timeit.timeit(func, number=number) / number * 1e6
+            print(f"{level:<6} {label:<14} {per_call:7.2f} us per token")
+
+
+if __name__ == "__main__":
+    main()
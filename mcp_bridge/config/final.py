@@ -1,11 +1,26 @@
 from typing import Annotated, Literal, Union
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from mcp.client.stdio import StdioServerParameters
 from mcpx.client.transports.docker import DockerMCPServer
 
 
+class InferenceClientPool(BaseModel):
+    max_connections: int = Field(
+        100, ge=1, description="Maximum concurrent connections to the inference server"
+    )
+    max_keepalive_connections: int = Field(
+        20, ge=0, description="Maximum idle connections kept alive for reuse"
+    )
+    keepalive_expiry: float = Field(
+        30.0, ge=0, description="Seconds an idle keep-alive connection is retained"
+    )
+    http2: bool = Field(
+        False, description="Enable HTTP/2 (requires the optional h2 package)"
+    )
+
+
 class InferenceServer(BaseModel):
     base_url: str = Field(
         default="http://localhost:11434/v1",
@@ -14,6 +29,13 @@ class InferenceServer(BaseModel):
     api_key: str = Field(
         default="unauthenticated", description="API key for the inference server"
     )
+    timeout: float = Field(
+        10000, gt=0, description="Timeout for inference server requests in seconds"
+    )
+    pool: InferenceClientPool = Field(
+        default_factory=lambda: InferenceClientPool.model_construct(),
+        description="Shared inference HTTP client pool configuration",
+    )
 
 
 class Logging(BaseModel):
@@ -38,24 +60,164 @@ class Sampling(BaseModel):
     ] = []
 
 
-class SSEMCPServer(BaseModel):
+class SessionPoolOptions(BaseModel):
+    pool_size: int = Field(
+        1,
+        ge=1,
+        description="Sessions opened to the server, one process each for stdio and docker servers",
+    )
+
+
+class LazyStartOptions(BaseModel):
+    lazy: bool = Field(
+        False,
+        description="Start the server on its first request instead of at startup, tools are listed from the tool cache until then",
+    )
+    idle_timeout: float = Field(
+        600.0, gt=0, description="Seconds without requests after which a lazy server is stopped"
+    )
+
+
+class StdioMCPServerAutoscale(BaseModel):
+    min_size: int = Field(1, ge=1, description="Processes that are always kept running")
+    max_size: int = Field(4, ge=1, description="Most processes started for the server")
+    max_in_flight: int = Field(
+        1,
+        ge=1,
+        description="Requests sent to one process at a time, further requests wait in the bridge",
+    )
+    target_in_flight: float = Field(
+        1.0,
+        gt=0,
+        description="Requests in flight or waiting per process above which a process is added",
+    )
+    max_wait_p95: float = Field(
+        0.5,
+        ge=0,
+        description="Seconds requests may wait for a process (95th percentile) before one is added",
+    )
+    idle_cooldown: float = Field(
+        60.0,
+        ge=0,
+        description="Seconds a process above min_size has to be idle before it is stopped",
+    )
+    interval: float = Field(1.0, gt=0, description="Seconds between scaling decisions")
+
+    @model_validator(mode="after")
+    def check_bounds(self) -> "StdioMCPServerAutoscale":
+        if self.max_size < self.min_size:
+            raise ValueError("max_size must not be smaller than min_size")
+        return self
+
+
+class StdioMCPServer(StdioServerParameters, SessionPoolOptions, LazyStartOptions):
+    autoscale: StdioMCPServerAutoscale | None = Field(
+        None,
+        description="Grow and shrink the process pool with the load, replaces pool_size",
+    )
+
+
+class DockerMCPServerConfig(DockerMCPServer, SessionPoolOptions, LazyStartOptions):
+    pass
+
+
+class SSEMCPServer(SessionPoolOptions):
     # TODO: expand this once I find a good definition for this
     url: str = Field(description="URL of the MCP server")
 
 
+class HTTPMCPServerPool(BaseModel):
+    max_connections: int = Field(
+        10, ge=1, description="Maximum concurrent connections to the MCP server"
+    )
+    max_keepalive_connections: int = Field(
+        10, ge=0, description="Maximum idle connections kept alive for reuse"
+    )
+    keepalive_expiry: float = Field(
+        30.0, ge=0, description="Seconds an idle keep-alive connection is retained"
+    )
+    http2: bool = Field(
+        False, description="Enable HTTP/2 (requires the optional h2 package)"
+    )
+
+
+class HTTPMCPServerTimeouts(BaseModel):
+    connect: float = Field(10.0, gt=0, description="Connect timeout in seconds")
+    read: float = Field(
+        30.0, gt=0, description="Read timeout in seconds, also the default tool call deadline"
+    )
+    write: float = Field(30.0, gt=0, description="Write timeout in seconds")
+    pool: float = Field(
+        30.0, gt=0, description="Seconds a request waits for a free pooled connection"
+    )
+
+
 class HTTPMCPServer(BaseModel):
     """HTTP MCP Server - 使用HTTP POST和JSON-RPC 2.0协议"""
 
     url: str = Field(description="URL of the MCP server (HTTP POST endpoint)")
     protocol: Literal["http"] = Field(default="http", description="Protocol type")
+    pool: HTTPMCPServerPool = Field(
+        default_factory=lambda: HTTPMCPServerPool.model_construct(),
+        description="Connection pool of the MCP server client",
+    )
+    timeouts: HTTPMCPServerTimeouts = Field(
+        default_factory=lambda: HTTPMCPServerTimeouts.model_construct(),
+        description="Request timeouts of the MCP server client",
+    )
+    max_response_bytes: int = Field(
+        32 * 1024 * 1024,
+        ge=1,
+        description="Largest response body accepted from the MCP server",
+    )
 
 
 MCPServer = Annotated[
-    Union[StdioServerParameters, SSEMCPServer, HTTPMCPServer, DockerMCPServer],
+    Union[StdioMCPServer, SSEMCPServer, HTTPMCPServer, DockerMCPServerConfig],
     Field(description="MCP server configuration"),
 ]
 
 
+class McpStartup(BaseModel):
+    timeout: float = Field(
+        30.0, ge=0, description="Seconds startup waits for MCP servers to connect"
+    )
+    quorum: float = Field(
+        0.0,
+        ge=0,
+        le=1,
+        description="Fraction of MCP servers that must be connected before the bridge is ready",
+    )
+    tool_cache: str = Field(
+        "mcp_tool_cache.json",
+        description="File the tool lists of lazy MCP servers are persisted to",
+    )
+
+
+class McpSessions(BaseModel):
+    wait_timeout: float = Field(
+        5.0,
+        ge=0,
+        description="Seconds a request waits for a disconnected MCP server to reconnect",
+    )
+    server_wait_timeouts: dict[str, Annotated[float, Field(ge=0)]] = Field(
+        default_factory=dict, description="Per-server overrides of wait_timeout"
+    )
+    failure_threshold: int = Field(
+        3,
+        ge=1,
+        description="Consecutive failed connection attempts after which a server's circuit opens and requests fail fast",
+    )
+    reconnect_initial_delay: float = Field(
+        0.5, gt=0, description="Seconds before reconnecting after a session ends"
+    )
+    reconnect_max_delay: float = Field(
+        60.0,
+        gt=0,
+        description="Upper bound of the reconnect delay, which doubles with every failed attempt",
+    )
+
+
 class Network(BaseModel):
     host: str = Field("0.0.0.0", description="Host of the network")
     port: int = Field(8000, description="Port of the network")
@@ -103,11 +265,40 @@ class RouterToolsConfig(BaseModel):
     )
 
 
+class ToolEmbeddingConfig(BaseModel):
+    backend: str = Field(
+        "hashing",
+        description="Embedding backend: hashing (offline), sentence_transformers or a registered backend",
+    )
+    model: str | None = Field(
+        None, description="Model name for model based embedding backends"
+    )
+    dimensions: int = Field(
+        512, ge=16, description="Vector size of the hashing embedding backend"
+    )
+    min_similarity: float = Field(
+        0.0, description="Tools with a lower cosine similarity are never exposed"
+    )
+
+
 class DynamicToolFilterConfig(BaseModel):
     enabled: bool = Field(False, description="Enable context-based tool filtering")
     max_tools: int = Field(
         20, ge=1, description="Maximum tools exposed after dynamic filtering"
     )
+    context_user_messages: int = Field(
+        2, ge=1, description="Latest user messages used as the filter query"
+    )
+    context_max_chars: int = Field(
+        2000, ge=1, description="Maximum length of the filter query"
+    )
+    retrieval: Literal["keyword", "embedding"] = Field(
+        "keyword", description="How tools are matched against the request context"
+    )
+    embedding: ToolEmbeddingConfig = Field(
+        default_factory=lambda: ToolEmbeddingConfig.model_construct(),
+        description="Embedding retrieval configuration",
+    )
     include_router_fallback: bool = Field(
         True, description="Include router tools after dynamic filtering"
     )
@@ -126,6 +317,20 @@ class GatewayToolsConfig(BaseModel):
     cache_ttl_seconds: int = Field(
         60, ge=0, description="Tool registry cache TTL in seconds"
     )
+    stale_while_revalidate: bool = Field(
+        False,
+        description="Serve an expired tool registry snapshot while it is rebuilt in the background",
+    )
+    max_stale_seconds: int = Field(
+        300,
+        ge=0,
+        description="Maximum age beyond the TTL for serving an expired snapshot",
+    )
+    refresh_timeout_seconds: float = Field(
+        10.0,
+        gt=0,
+        description="Deadline for listing a single server's tools during refresh",
+    )
     include: list[ToolExposureRule] = Field(
         default_factory=lambda: [ToolExposureRule()],
         description="Tool exposure include rules",
@@ -143,11 +348,30 @@ class GatewayToolsConfig(BaseModel):
     )
 
 
+class GatewayToolCallsConfig(BaseModel):
+    max_parallel_calls: int = Field(
+        8, ge=1, description="Maximum tool calls executed concurrently per request"
+    )
+    max_concurrent_per_server: int | None = Field(
+        None,
+        ge=1,
+        description="Default limit of in-flight tool calls per MCP server (unlimited if unset)",
+    )
+    server_limits: dict[str, Annotated[int, Field(ge=1)]] = Field(
+        default_factory=dict,
+        description="Per-server overrides of in-flight tool call limits",
+    )
+
+
 class GatewayConfig(BaseModel):
     tools: GatewayToolsConfig = Field(
         default_factory=lambda: GatewayToolsConfig.model_construct(),
         description="Gateway tool exposure configuration",
     )
+    tool_calls: GatewayToolCallsConfig = Field(
+        default_factory=lambda: GatewayToolCallsConfig.model_construct(),
+        description="Gateway tool call concurrency configuration",
+    )
 
 
 class Security(BaseModel):
@@ -186,6 +410,16 @@ class Settings(BaseSettings):
         default_factory=dict, description="MCP servers configuration"
     )
 
+    mcp_startup: McpStartup = Field(
+        default_factory=lambda: McpStartup.model_construct(),
+        description="MCP server startup config",
+    )
+
+    mcp_sessions: McpSessions = Field(
+        default_factory=lambda: McpSessions.model_construct(),
+        description="MCP server session config",
+    )
+
     sampling: Sampling = Field(
         default_factory=lambda: Sampling.model_construct(),
         description="sampling config",
@@ -0,0 +1,42 @@
+"""JSON helpers that use orjson when it is installed
+
+orjson is optional, without it everything falls back to the standard library.
+the helpers always produce compact JSON, and decoding errors are raised as
+json.JSONDecodeError in both cases (orjson's error subclasses it).
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+HAS_ORJSON = orjson is not None
+
+
+def loads(data: str | bytes | bytearray) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """serializes obj to compact UTF-8 encoded JSON"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # e.g. integers above 64 bit or non-str keys, which the stdlib handles
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def dumps_str(obj: Any) -> str:
+    return dumps(obj).decode()
+
+
+FastJSONResponse: type[JSONResponse] = ORJSONResponse if HAS_ORJSON else JSONResponse
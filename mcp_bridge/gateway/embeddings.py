@@ -0,0 +1,143 @@
+import hashlib
+import heapq
+import math
+from typing import Callable, Protocol
+
+from loguru import logger
+
+from mcp_bridge.config.final import ToolEmbeddingConfig
+from mcp_bridge.gateway.search_index import tokenize
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the pure python path is used without it
+    np = None
+
+Vector = list[float]
+
+
+class EmbeddingBackend(Protocol):
+    def embed(self, texts: list[str]) -> list[Vector]: ...
+
+
+class HashingEmbeddingBackend:
+    """Offline embedding backend based on the hashing trick
+
+    words and their character trigrams are hashed into a fixed number of signed
+    buckets, so texts sharing words or word stems end up close to each other.
+    """
+
+    def __init__(self, dimensions: int = 512) -> None:
+        self.dimensions = dimensions
+
+    def embed(self, texts: list[str]) -> list[Vector]:
+        return [self._embed(text) for text in texts]
+
+    def _embed(self, text: str) -> Vector:
+        vector = [0.0] * self.dimensions
+        for token in tokenize(text):
+            self._add(vector, token, 1.0)
+            padded = f"#{token}#"
+            for i in range(len(padded) - 2):
+                self._add(vector, padded[i : i + 3], 0.5)
+        return vector
+
+    def _add(self, vector: Vector, feature: str, weight: float) -> None:
+        digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        sign = 1.0 if value >> 63 else -1.0
+        vector[value % self.dimensions] += sign * weight
+
+
+class SentenceTransformerEmbeddingBackend:
+    """Local CPU embedding model from the optional sentence-transformers package"""
+
+    def __init__(self, model: str = "all-MiniLM-L6-v2") -> None:
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(model, device="cpu")
+
+    def embed(self, texts: list[str]) -> list[Vector]:
+        return self._model.encode(texts, normalize_embeddings=True).tolist()
+
+
+EmbeddingBackendFactory = Callable[[ToolEmbeddingConfig], EmbeddingBackend]
+
+EMBEDDING_BACKENDS: dict[str, EmbeddingBackendFactory] = {
+    "hashing": lambda cfg: HashingEmbeddingBackend(cfg.dimensions),
+    "sentence_transformers": lambda cfg: SentenceTransformerEmbeddingBackend(
+        cfg.model or "all-MiniLM-L6-v2"
+    ),
+}
+
+
+def register_embedding_backend(name: str, factory: EmbeddingBackendFactory) -> None:
+    """Makes a custom backend selectable with `embedding.backend`"""
+    EMBEDDING_BACKENDS[name] = factory
+
+
+def create_embedding_backend(cfg: ToolEmbeddingConfig) -> EmbeddingBackend:
+    factory = EMBEDDING_BACKENDS.get(cfg.backend)
+    if factory is None:
+        logger.warning(
+            f"unknown embedding backend '{cfg.backend}', falling back to hashing"
+        )
+        return HashingEmbeddingBackend(cfg.dimensions)
+
+    try:
+        return factory(cfg)
+    except ImportError as e:
+        logger.warning(
+            f"embedding backend '{cfg.backend}' is not available ({e}), "
+            "falling back to hashing"
+        )
+        return HashingEmbeddingBackend(cfg.dimensions)
+
+
+def _normalize(vector: Vector) -> Vector:
+    norm = math.sqrt(sum(value * value for value in vector))
+    if norm == 0:
+        return vector
+    return [value / norm for value in vector]
+
+
+class ToolVectorIndex:
+    """Normalized tool embeddings searched by cosine similarity
+
+    the embeddings are stored as a float32 matrix when numpy is installed and
+    as plain lists otherwise.
+    """
+
+    def __init__(self, vectors: list[Vector]) -> None:
+        self.size = len(vectors)
+        if np is not None and vectors:
+            matrix = np.asarray(vectors, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            self._matrix = matrix / np.where(norms == 0, 1.0, norms)
+        else:
+            self._matrix = [_normalize(vector) for vector in vectors]
+
+    def top_k(self, query_vector: Vector, k: int) -> list[tuple[int, float]]:
+        """Returns up to k (doc_id, similarity) pairs, most similar first"""
+        if not self.size or k < 1:
+            return []
+        k = min(k, self.size)
+
+        if np is not None:
+            query = np.asarray(query_vector, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            if norm:
+                query = query / norm
+            similarities = self._matrix @ query
+            candidates = np.argpartition(-similarities, k - 1)[:k]
+            return sorted(
+                ((int(doc_id), float(similarities[doc_id])) for doc_id in candidates),
+                key=lambda item: -item[1],
+            )
+
+        query = _normalize(query_vector)
+        similarities = (
+            (doc_id, sum(a * b for a, b in zip(row, query)))
+            for doc_id, row in enumerate(self._matrix)
+        )
+        return heapq.nlargest(k, similarities, key=lambda item: item[1])
@@ -0,0 +1,118 @@
+import math
+import re
+from bisect import bisect_left
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+CAMEL_CASE_PATTERN = re.compile(r"([a-z0-9])([A-Z])")
+CJK_PATTERN = re.compile(r"([\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]+)")
+
+# tool name > description > server
+FIELD_WEIGHTS = (3.0, 1.0, 0.5)
+PREFIX_MATCH_FACTOR = 0.5
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_EXPANSIONS = 64
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """Splits text into lowercase word tokens
+
+    snake_case and camelCase identifiers are split into their words, and runs of
+    CJK characters (which have no word separators) are indexed as bigrams.
+    """
+    tokens: list[str] = []
+    for word in TOKEN_PATTERN.findall(CAMEL_CASE_PATTERN.sub(r"\1 \2", text).lower()):
+        for part in CJK_PATTERN.split(word):
+            if not part:
+                continue
+            if CJK_PATTERN.fullmatch(part) and len(part) > 1:
+                tokens.extend(part[i : i + 2] for i in range(len(part) - 1))
+            else:
+                tokens.append(part)
+    return tokens
+
+
+class ToolSearchIndex:
+    """BM25 inverted index over documents made of (name, description, server)"""
+
+    def __init__(self, documents: list[tuple[str, str, str]]) -> None:
+        self.size = len(documents)
+        self._postings: dict[str, dict[int, list[int]]] = {}
+        self._lengths: list[list[int]] = []
+
+        totals = [0] * len(FIELD_WEIGHTS)
+        for doc_id, fields in enumerate(documents):
+            lengths = []
+            for field_index, text in enumerate(fields):
+                tokens = tokenize(text)
+                lengths.append(len(tokens))
+                totals[field_index] += len(tokens)
+                for token in tokens:
+                    term_frequencies = self._postings.setdefault(token, {}).setdefault(
+                        doc_id, [0] * len(FIELD_WEIGHTS)
+                    )
+                    term_frequencies[field_index] += 1
+            self._lengths.append(lengths)
+
+        self._average_lengths = [
+            max(total / self.size, 1.0) if self.size else 1.0 for total in totals
+        ]
+        self._vocabulary = sorted(self._postings)
+
+    def score(self, query: str) -> dict[int, float]:
+        """Returns the BM25 score of every document matching at least one query term"""
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            term_scores: dict[int, float] = {}
+            for index_term, factor in self._expand(term):
+                postings = self._postings[index_term]
+                idf = math.log(
+                    1 + (self.size - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                for doc_id, term_frequencies in postings.items():
+                    doc_score = factor * idf * self._field_score(doc_id, term_frequencies)
+                    if doc_score > term_scores.get(doc_id, 0.0):
+                        term_scores[doc_id] = doc_score
+
+            for doc_id, doc_score in term_scores.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + doc_score
+        return scores
+
+    def _expand(self, term: str) -> list[tuple[str, float]]:
+        """Finds the indexed terms matching a query term exactly or by prefix"""
+        expansions = []
+        if term in self._postings:
+            expansions.append((term, 1.0))
+        if len(term) < MIN_PREFIX_LENGTH:
+            return expansions
+
+        position = bisect_left(self._vocabulary, term)
+        while (
+            position < len(self._vocabulary)
+            and len(expansions) < MAX_PREFIX_EXPANSIONS
+            and self._vocabulary[position].startswith(term)
+        ):
+            if self._vocabulary[position] != term:
+                expansions.append((self._vocabulary[position], PREFIX_MATCH_FACTOR))
+            position += 1
+        return expansions
+
+    def _field_score(self, doc_id: int, term_frequencies: list[int]) -> float:
+        lengths = self._lengths[doc_id]
+        score = 0.0
+        for field_index, term_frequency in enumerate(term_frequencies):
+            if term_frequency == 0:
+                continue
+            normalization = BM25_K1 * (
+                1
+                - BM25_B
+                + BM25_B * lengths[field_index] / self._average_lengths[field_index]
+            )
+            score += (
+                FIELD_WEIGHTS[field_index]
+                * term_frequency
+                * (BM25_K1 + 1)
+                / (term_frequency + normalization)
+            )
+        return score
@@ -1,19 +1,38 @@
+import asyncio
 import fnmatch
 import hashlib
+import itertools
 import json
 import re
 import time
-from dataclasses import dataclass, field
-from typing import Any
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, TypeVar
 
 from loguru import logger
 from mcp import types
 
 import mcp_bridge.config as bridge_config
-from mcp_bridge.config.final import GatewayToolsConfig, ToolExposureRule
+from mcp_bridge import fastjson
+from mcp_bridge.config.final import (
+    DynamicToolFilterConfig,
+    GatewayToolCallsConfig,
+    GatewayToolsConfig,
+    ToolEmbeddingConfig,
+    ToolExposureRule,
+)
+from mcp_bridge.gateway.embeddings import (
+    EmbeddingBackend,
+    ToolVectorIndex,
+    create_embedding_backend,
+)
+from mcp_bridge.gateway.search_index import ToolSearchIndex, tokenize
 
 MAX_TOOL_NAME_LENGTH = 64
 TOOL_NAME_HASH_LENGTH = 8
+TOOL_PAYLOAD_CACHE_SIZE = 128
+
+T = TypeVar("T")
 
 
 @dataclass(frozen=True)
@@ -26,12 +45,45 @@ class ToolRef:
     collision_group: tuple[str, ...] = ()
 
 
+@dataclass(frozen=True)
+class ServerSegment:
+    """The tools of one server, rebuilt only when their content hash changes"""
+
+    server_name: str
+    content_hash: str
+    refs: list[ToolRef] = field(default_factory=list)
+    refs_by_name: dict[str, ToolRef] = field(default_factory=dict)
+    exposed_by_name: dict[str, list[ToolRef]] = field(default_factory=dict)
+    exposed_refs: list[ToolRef] = field(default_factory=list)
+
+
 @dataclass
 class ToolRegistrySnapshot:
+    segments: dict[str, ServerSegment] = field(default_factory=dict)
+    config_fingerprint: str = ""
     tools_by_server: dict[str, list[ToolRef]] = field(default_factory=dict)
     tools_by_gateway_name: dict[str, ToolRef] = field(default_factory=dict)
     collisions: dict[str, list[ToolRef]] = field(default_factory=dict)
+    refresh_latency: dict[str, float] = field(default_factory=dict)
+    stale_servers: set[str] = field(default_factory=set)
+    inventory_result: types.CallToolResult | None = None
+    search_index: ToolSearchIndex | None = None
+    search_refs: list[ToolRef] | None = None
+    vector_index: ToolVectorIndex | None = None
+    vector_index_config: ToolEmbeddingConfig | None = None
     created_at: float = field(default_factory=time.monotonic)
+    version: int = 0
+
+
+@dataclass(frozen=True)
+class RouterToolSet:
+    """Router tool names and definitions, rebuilt only when the router config changes"""
+
+    key: tuple[str, bool, bool, bool]
+    search_name: str
+    call_name: str
+    inventory_name: str
+    tools: list[types.Tool] = field(default_factory=list)
 
 
 @dataclass(frozen=True)
@@ -42,65 +94,317 @@ class ToolListContext:
 class GatewayToolRegistry:
     def __init__(self) -> None:
         self._snapshot: ToolRegistrySnapshot | None = None
+        self._server_semaphores: dict[str, tuple[int, asyncio.Semaphore]] = {}
+        self._refresh_task: asyncio.Task[ToolRegistrySnapshot] | None = None
+        self._dirty_servers: set[str] = set()
+        self._router_tool_set: RouterToolSet | None = None
+        self._embedding_backend: tuple[ToolEmbeddingConfig, EmbeddingBackend] | None = None
+        self._tool_payloads: OrderedDict[tuple, Any] = OrderedDict()
+        self._tool_payloads_config: GatewayToolsConfig | None = None
+        self._snapshot_versions = itertools.count(1)
 
     async def refresh(
         self, client_manager: Any, force: bool = False
     ) -> ToolRegistrySnapshot:
         tools_config = bridge_config.config.gateway.tools
-        if not force and self._snapshot and not self._is_expired(tools_config):
+        expired = self._is_expired(tools_config)
+        if not force and self._snapshot and not expired and not self._dirty_servers:
             return self._snapshot
 
-        raw_tools_by_name: dict[str, list[ToolRef]] = {}
-        tools_by_server: dict[str, list[ToolRef]] = {}
+        # only servers that reported a list change are re-queried until the TTL expires
+        full = force or expired
+        if (
+            not force
+            and self._snapshot
+            and tools_config.stale_while_revalidate
+            and not self._is_too_stale(tools_config)
+        ):
+            self._start_refresh(client_manager, full)
+            return self._snapshot
+
+        # shield so a cancelled caller does not cancel the refresh other callers share
+        return await asyncio.shield(self._start_refresh(client_manager, full))
+
+    def invalidate_server(self, server_name: str) -> None:
+        """Marks a server's tools as outdated, e.g. after tools/list_changed"""
+        logger.debug(f"Invalidating registry tools for {server_name}")
+        self._dirty_servers.add(server_name)
+
+    def _start_refresh(
+        self, client_manager: Any, full: bool = True
+    ) -> asyncio.Task[ToolRegistrySnapshot]:
+        """Starts a snapshot rebuild unless one is already running (single-flight)"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(
+                self._rebuild(client_manager, full)
+            )
+            self._refresh_task.add_done_callback(self._log_refresh_failure)
+        return self._refresh_task
+
+    def _log_refresh_failure(self, task: asyncio.Task[ToolRegistrySnapshot]) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Tool registry refresh failed: {task.exception()}")
 
+    async def _rebuild(
+        self, client_manager: Any, full: bool = True
+    ) -> ToolRegistrySnapshot:
+        tools_config = bridge_config.config.gateway.tools
+        previous = self._snapshot
+        if full or previous is None:
+            requery = None
+            self._dirty_servers.clear()
+        else:
+            requery = set(self._dirty_servers)
+            self._dirty_servers -= requery
+
+        refresh_latency: dict[str, float] = {}
+        stale_servers: set[str] = set()
+        server_results: dict[str, list[types.Tool]] = {}
+        reused: set[str] = set()
+
+        clients = []
         for server_name, client in client_manager.get_clients():
             if client is None:
                 logger.error(f"Client '{server_name}' not found")
                 continue
-
-            try:
-                result = await client.list_tools()
-            except Exception as e:
-                logger.error(f"Error listing tools for {server_name}: {e}")
-                continue
-
-            server_tools = []
-            for tool in result.tools:
-                exposed = self._matches_exposure_rules(
-                    server_name, tool.name, tools_config
+            clients.append((server_name, client))
+            if (
+                requery is not None
+                and server_name not in requery
+                and previous is not None
+                and server_name in previous.segments
+            ):
+                reused.add(server_name)
+                refresh_latency[server_name] = previous.refresh_latency.get(
+                    server_name, 0.0
                 )
-                tool_ref = ToolRef(
-                    server_name=server_name,
-                    tool_name=tool.name,
-                    gateway_name=self._gateway_name(
-                        server_name, tool.name, tools_config
-                    ),
-                    tool=tool,
-                    exposed=exposed,
+                if server_name in previous.stale_servers:
+                    stale_servers.add(server_name)
+
+        queried = [
+            (server_name, client)
+            for server_name, client in clients
+            if server_name not in reused
+        ]
+        results = await asyncio.gather(
+            *(
+                self._list_server_tools(
+                    server_name, client, tools_config.refresh_timeout_seconds
                 )
-                server_tools.append(tool_ref)
-                if exposed:
-                    raw_tools_by_name.setdefault(tool.name, []).append(tool_ref)
+                for server_name, client in queried
+            )
+        )
+        for (server_name, _), (server_result, latency) in zip(queried, results):
+            refresh_latency[server_name] = latency
+            if server_result is not None:
+                server_results[server_name] = server_result
+            elif previous is not None and server_name in previous.segments:
+                logger.warning(f"Keeping previous tools for {server_name}")
+                stale_servers.add(server_name)
+                reused.add(server_name)
+
+        snapshot = self._build_snapshot(
+            [server_name for server_name, _ in clients],
+            server_results,
+            reused,
+            previous,
+            tools_config,
+        )
+        snapshot.refresh_latency = refresh_latency
+        snapshot.stale_servers = stale_servers
+        if requery is not None and previous is not None:
+            # a partial rebuild does not reset the TTL of the untouched servers
+            snapshot.created_at = previous.created_at
+        snapshot.version = next(self._snapshot_versions)
 
-            tools_by_server[server_name] = server_tools
+        self._snapshot = snapshot
+        return snapshot
 
-        collisions = {
-            name: refs for name, refs in raw_tools_by_name.items() if len(refs) > 1
-        }
-        exposed_refs = self._build_exposed_refs(
-            tools_by_server, collisions, tools_config
+    def _build_snapshot(
+        self,
+        server_names: list[str],
+        server_results: dict[str, list[types.Tool]],
+        reused: set[str],
+        previous: ToolRegistrySnapshot | None,
+        tools_config: GatewayToolsConfig,
+    ) -> ToolRegistrySnapshot:
+        """Builds a snapshot, re-deriving only the servers and names that changed"""
+        fingerprint = self._config_fingerprint(tools_config)
+        previous_segments = (
+            previous.segments
+            if previous is not None and previous.config_fingerprint == fingerprint
+            else {}
         )
-        tools_by_gateway_name = {
-            tool_ref.gateway_name: tool_ref for tool_ref in exposed_refs
-        }
 
-        self._snapshot = ToolRegistrySnapshot(
-            tools_by_server=tools_by_server,
+        segments: dict[str, ServerSegment] = {}
+        changed: set[str] = set()
+        for server_name in server_names:
+            if server_name in reused:
+                assert previous is not None
+                reused_segment = previous.segments[server_name]
+                tools = [ref.tool for ref in reused_segment.refs]
+                content_hash = reused_segment.content_hash
+            elif server_name in server_results:
+                tools = server_results[server_name]
+                content_hash = self._content_hash(tools)
+            else:
+                continue
+
+            segment = previous_segments.get(server_name)
+            if segment is None or segment.content_hash != content_hash:
+                segment = self._build_segment(
+                    server_name, tools, content_hash, tools_config
+                )
+                changed.add(server_name)
+            segments[server_name] = segment
+        changed.update(set(previous_segments) - set(segments))
+
+        # collision handling depends on server order, so a reorder re-derives everything
+        previous_order = [name for name in previous_segments if name in segments]
+        current_order = [name for name in segments if name in previous_segments]
+        affected_names: set[str] | None = None
+        if previous is not None and previous_segments and previous_order == current_order:
+            affected_names = set()
+            for server_name in changed:
+                for segment in (
+                    previous_segments.get(server_name),
+                    segments.get(server_name),
+                ):
+                    if segment is not None:
+                        affected_names.update(segment.exposed_by_name)
+
+        if affected_names is None:
+            grouped: dict[str, list[ToolRef]] = {}
+            for segment in segments.values():
+                for name, refs in segment.exposed_by_name.items():
+                    grouped.setdefault(name, []).extend(refs)
+            collisions = {
+                name: refs for name, refs in grouped.items() if len(refs) > 1
+            }
+            rederive = set(segments)
+        else:
+            assert previous is not None
+            collisions = {
+                name: refs
+                for name, refs in previous.collisions.items()
+                if name not in affected_names
+            }
+            rederive = changed & set(segments)
+            for name in affected_names:
+                group: list[ToolRef] = []
+                for segment in segments.values():
+                    named_refs = segment.exposed_by_name.get(name)
+                    if named_refs:
+                        group.extend(named_refs)
+                        rederive.add(segment.server_name)
+                if len(group) > 1:
+                    collisions[name] = group
+
+        for server_name in rederive:
+            segments[server_name] = replace(
+                segments[server_name],
+                exposed_refs=self._derive_exposed_refs(
+                    segments[server_name], collisions, tools_config
+                ),
+            )
+
+        tools_by_gateway_name: dict[str, ToolRef] = {}
+        for segment in segments.values():
+            for tool_ref in segment.exposed_refs:
+                if tool_ref.gateway_name in tools_by_gateway_name:
+                    logger.warning(
+                        f"Gateway tool name collision skipped: {tool_ref.gateway_name}"
+                    )
+                    continue
+                tools_by_gateway_name[tool_ref.gateway_name] = tool_ref
+
+        self._log_collisions(
+            {
+                name: refs
+                for name, refs in collisions.items()
+                if affected_names is None or name in affected_names
+            },
+            tools_config,
+        )
+        return ToolRegistrySnapshot(
+            segments=segments,
+            config_fingerprint=fingerprint,
+            tools_by_server={
+                server_name: segment.refs for server_name, segment in segments.items()
+            },
             tools_by_gateway_name=tools_by_gateway_name,
             collisions=collisions,
         )
-        self._log_collisions(collisions, tools_config)
-        return self._snapshot
+
+    def _build_segment(
+        self,
+        server_name: str,
+        tools: list[types.Tool],
+        content_hash: str,
+        tools_config: GatewayToolsConfig,
+    ) -> ServerSegment:
+        refs: list[ToolRef] = []
+        refs_by_name: dict[str, ToolRef] = {}
+        exposed_by_name: dict[str, list[ToolRef]] = {}
+        for tool in tools:
+            exposed = self._matches_exposure_rules(server_name, tool.name, tools_config)
+            tool_ref = ToolRef(
+                server_name=server_name,
+                tool_name=tool.name,
+                gateway_name=self._gateway_name(server_name, tool.name, tools_config),
+                tool=tool,
+                exposed=exposed,
+            )
+            refs.append(tool_ref)
+            known_ref = refs_by_name.get(tool.name)
+            if known_ref is None or (exposed and not known_ref.exposed):
+                refs_by_name[tool.name] = tool_ref
+            if exposed:
+                exposed_by_name.setdefault(tool.name, []).append(tool_ref)
+
+        return ServerSegment(
+            server_name=server_name,
+            content_hash=content_hash,
+            refs=refs,
+            refs_by_name=refs_by_name,
+            exposed_by_name=exposed_by_name,
+        )
+
+    def _content_hash(self, tools: list[types.Tool]) -> str:
+        payload = json.dumps(
+            [tool.model_dump(mode="json") for tool in tools],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _config_fingerprint(self, tools_config: GatewayToolsConfig) -> str:
+        return json.dumps(
+            {
+                "mode": tools_config.mode,
+                "collision_strategy": tools_config.collision_strategy,
+                "name_template": tools_config.name_template,
+                "include": [rule.model_dump() for rule in tools_config.include],
+                "exclude": [rule.model_dump() for rule in tools_config.exclude],
+            },
+            sort_keys=True,
+        )
+
+    async def _list_server_tools(
+        self, server_name: str, client: Any, timeout: float
+    ) -> tuple[list[types.Tool] | None, float]:
+        started_at = time.monotonic()
+        try:
+            async with asyncio.timeout(timeout):
+                result = await client.list_tools()
+            tools = result.tools
+        except TimeoutError:
+            logger.error(f"Timed out listing tools for {server_name} after {timeout}s")
+            tools = None
+        except Exception as e:
+            logger.error(f"Error listing tools for {server_name}: {e}")
+            tools = None
+        return tools, time.monotonic() - started_at
 
     async def inventory(self, client_manager: Any) -> dict[str, list[ToolRef]]:
         snapshot = await self.refresh(client_manager)
@@ -113,13 +417,13 @@ class GatewayToolRegistry:
     ) -> list[types.Tool]:
         tools_config = bridge_config.config.gateway.tools
         if tools_config.mode == "router":
-            return self._build_router_tools(tools_config)
+            return list(self._build_router_tools(tools_config))
 
         snapshot = await self.refresh(client_manager)
         refs = list(snapshot.tools_by_gateway_name.values())
         if tools_config.dynamic_filter.enabled:
-            refs = self._filter_dynamic(
-                refs, context, tools_config.dynamic_filter.max_tools
+            refs = await self._filter_dynamic(
+                snapshot, refs, context, tools_config.dynamic_filter
             )
             if tools_config.dynamic_filter.include_router_fallback:
                 router_tools = self._build_router_tools(tools_config)
@@ -131,6 +435,43 @@ class GatewayToolRegistry:
 
         return self._tool_refs_to_tools(refs)
 
+    async def list_exposed_tool_payload(
+        self,
+        client_manager: Any,
+        context: ToolListContext | None,
+        namespace: str,
+        build: Callable[[list[types.Tool]], T],
+    ) -> T:
+        """Returns build(exposed tools), cached per snapshot version and context
+
+        callers use this to convert the exposed tools into a client specific
+        payload once instead of on every request. the config is not changed
+        after it is loaded, so the cache is only tied to the tools config object
+        instead of comparing its contents on every request.
+        """
+        tools_config = bridge_config.config.gateway.tools
+        if self._tool_payloads_config is not tools_config:
+            self._tool_payloads.clear()
+            self._tool_payloads_config = tools_config
+        version = 0
+        if tools_config.mode != "router":
+            version = (await self.refresh(client_manager)).version
+        query = (
+            context.query if context and tools_config.dynamic_filter.enabled else None
+        )
+        key = (namespace, version, query)
+
+        payload = self._tool_payloads.get(key)
+        if payload is not None:
+            self._tool_payloads.move_to_end(key)
+            return payload
+
+        payload = build(await self.list_exposed_tools(client_manager, context))
+        self._tool_payloads[key] = payload
+        while len(self._tool_payloads) > TOOL_PAYLOAD_CACHE_SIZE:
+            self._tool_payloads.popitem(last=False)
+        return payload
+
     async def call_exposed_tool(
         self,
         client_manager: Any,
@@ -146,9 +487,10 @@ class GatewayToolRegistry:
             and tools_config.dynamic_filter.include_router_fallback
         )
         if router_tools_exposed:
-            router_call_name = self._router_call_tool_name(tools_config)
-            router_search_name = self._router_search_tool_name(tools_config)
-            router_inventory_name = self._router_inventory_tool_name(tools_config)
+            router_tool_set = self._get_router_tool_set(tools_config)
+            router_call_name = router_tool_set.call_name
+            router_search_name = router_tool_set.search_name
+            router_inventory_name = router_tool_set.inventory_name
 
             if name == router_search_name and tools_config.router.expose_search_tool:
                 return await self.search_tools(
@@ -232,19 +574,19 @@ class GatewayToolRegistry:
             if include_schema is None
             else include_schema
         )
-        query_text = query or ""
-
-        candidates = []
-        for server_name, refs in snapshot.tools_by_server.items():
-            if server and server_name != server:
-                continue
-            for tool_ref in refs:
-                if not tool_ref.exposed:
-                    continue
-                score = self._score_tool(tool_ref, query_text)
-                if query_text and score <= 0:
-                    continue
-                candidates.append((score, tool_ref))
+        search_refs = self._get_search_refs(snapshot)
+        if tokenize(query or ""):
+            search_index = self._get_search_index(snapshot)
+            candidates = [
+                (score, search_refs[doc_id])
+                for doc_id, score in search_index.score(query or "").items()
+            ]
+        else:
+            candidates = [(1.0, tool_ref) for tool_ref in search_refs]
+        if server:
+            candidates = [
+                item for item in candidates if item[1].server_name == server
+            ]
 
         candidates.sort(
             key=lambda item: (-item[0], item[1].server_name, item[1].tool_name)
@@ -258,7 +600,7 @@ class GatewayToolRegistry:
             content=[
                 types.TextContent(
                     type="text",
-                    text=json.dumps({"tools": tools}, ensure_ascii=False),
+                    text=fastjson.dumps_str({"tools": tools}),
                 )
             ],
             isError=False,
@@ -281,18 +623,33 @@ class GatewayToolRegistry:
             return self._error_result(f"Server '{server}' not found")
 
         snapshot = await self.refresh(client_manager)
-        known_tools = snapshot.tools_by_server.get(server, [])
-        if require_exposed:
-            exists = any(
-                tool_ref.tool_name == tool and tool_ref.exposed
-                for tool_ref in known_tools
-            )
-        else:
-            exists = any(tool_ref.tool_name == tool for tool_ref in known_tools)
-        if not exists:
+        segment = snapshot.segments.get(server)
+        tool_ref = segment.refs_by_name.get(tool) if segment is not None else None
+        if tool_ref is None or (require_exposed and not tool_ref.exposed):
             return self._error_result(f"Tool '{tool}' not found on server '{server}'")
 
-        return await client.call_tool(tool, arguments or {}, timeout)
+        semaphore = self._server_semaphore(
+            server, bridge_config.config.gateway.tool_calls
+        )
+        if semaphore is None:
+            return await client.call_tool(tool, arguments or {}, timeout)
+        async with semaphore:
+            return await client.call_tool(tool, arguments or {}, timeout)
+
+    def _server_semaphore(
+        self, server: str, tool_calls_config: GatewayToolCallsConfig
+    ) -> asyncio.Semaphore | None:
+        limit = tool_calls_config.server_limits.get(
+            server, tool_calls_config.max_concurrent_per_server
+        )
+        if limit is None:
+            return None
+
+        current = self._server_semaphores.get(server)
+        if current is None or current[0] != limit:
+            current = (limit, asyncio.Semaphore(limit))
+            self._server_semaphores[server] = current
+        return current[1]
 
     def _is_expired(self, tools_config: GatewayToolsConfig) -> bool:
         if self._snapshot is None:
@@ -302,59 +659,56 @@ class GatewayToolRegistry:
             > tools_config.cache_ttl_seconds
         )
 
-    def _build_exposed_refs(
+    def _is_too_stale(self, tools_config: GatewayToolsConfig) -> bool:
+        if self._snapshot is None:
+            return True
+        return (
+            time.monotonic() - self._snapshot.created_at
+            > tools_config.cache_ttl_seconds + tools_config.max_stale_seconds
+        )
+
+    def _derive_exposed_refs(
         self,
-        tools_by_server: dict[str, list[ToolRef]],
+        segment: ServerSegment,
         collisions: dict[str, list[ToolRef]],
         tools_config: GatewayToolsConfig,
     ) -> list[ToolRef]:
         exposed_refs: list[ToolRef] = []
-        gateway_names: set[str] = set()
 
-        for refs in tools_by_server.values():
-            for tool_ref in refs:
-                if not tool_ref.exposed:
-                    continue
+        for tool_ref in segment.refs:
+            if not tool_ref.exposed:
+                continue
 
-                collision_group = collisions.get(tool_ref.tool_name, [])
-                gateway_name = tool_ref.gateway_name
+            collision_group = collisions.get(tool_ref.tool_name, [])
+            gateway_name = tool_ref.gateway_name
 
-                if tools_config.mode in {"flat", "filtered"} and collision_group:
-                    if tools_config.collision_strategy == "error":
+            if tools_config.mode in {"flat", "filtered"} and collision_group:
+                if tools_config.collision_strategy == "error":
+                    continue
+                if tools_config.collision_strategy == "first":
+                    if collision_group[0] != tool_ref:
                         continue
-                    if tools_config.collision_strategy == "first":
-                        if collision_group[0] != tool_ref:
-                            continue
-                        gateway_name = tool_ref.tool_name
-                    elif tools_config.collision_strategy == "namespace":
-                        gateway_name = self._namespaced_name(
-                            tool_ref.server_name, tool_ref.tool_name, tools_config
-                        )
-
-                elif tools_config.mode in {"namespaced"}:
+                    gateway_name = tool_ref.tool_name
+                elif tools_config.collision_strategy == "namespace":
                     gateway_name = self._namespaced_name(
                         tool_ref.server_name, tool_ref.tool_name, tools_config
                     )
 
-                if gateway_name in gateway_names:
-                    logger.warning(
-                        f"Gateway tool name collision skipped: {gateway_name}"
-                    )
-                    continue
+            elif tools_config.mode in {"namespaced"}:
+                gateway_name = self._namespaced_name(
+                    tool_ref.server_name, tool_ref.tool_name, tools_config
+                )
 
-                gateway_names.add(gateway_name)
-                exposed_refs.append(
-                    ToolRef(
-                        server_name=tool_ref.server_name,
-                        tool_name=tool_ref.tool_name,
-                        gateway_name=gateway_name,
-                        tool=tool_ref.tool,
-                        exposed=tool_ref.exposed,
-                        collision_group=tuple(
-                            ref.server_name for ref in collision_group
-                        ),
-                    )
+            exposed_refs.append(
+                ToolRef(
+                    server_name=tool_ref.server_name,
+                    tool_name=tool_ref.tool_name,
+                    gateway_name=gateway_name,
+                    tool=tool_ref.tool,
+                    exposed=tool_ref.exposed,
+                    collision_group=tuple(ref.server_name for ref in collision_group),
                 )
+            )
 
         return exposed_refs
 
@@ -371,6 +725,27 @@ class GatewayToolRegistry:
         return tools
 
     def _build_router_tools(self, tools_config: GatewayToolsConfig) -> list[types.Tool]:
+        return self._get_router_tool_set(tools_config).tools
+
+    def _get_router_tool_set(self, tools_config: GatewayToolsConfig) -> RouterToolSet:
+        router_config = tools_config.router
+        key = (
+            router_config.prefix,
+            router_config.expose_search_tool,
+            router_config.expose_call_tool,
+            router_config.expose_inventory_tool,
+        )
+        if self._router_tool_set is None or self._router_tool_set.key != key:
+            self._router_tool_set = RouterToolSet(
+                key=key,
+                search_name=self._router_search_tool_name(tools_config),
+                call_name=self._router_call_tool_name(tools_config),
+                inventory_name=self._router_inventory_tool_name(tools_config),
+                tools=self._create_router_tools(tools_config),
+            )
+        return self._router_tool_set
+
+    def _create_router_tools(self, tools_config: GatewayToolsConfig) -> list[types.Tool]:
         tools = []
         if tools_config.router.expose_search_tool:
             tools.append(
@@ -475,34 +850,89 @@ class GatewayToolRegistry:
             return False
         return any(fnmatch.fnmatch(tool_name, pattern) for pattern in rule.tools)
 
-    def _filter_dynamic(
+    async def _filter_dynamic(
         self,
+        snapshot: ToolRegistrySnapshot,
         refs: list[ToolRef],
         context: ToolListContext | None,
-        max_tools: int,
+        filter_config: DynamicToolFilterConfig,
     ) -> list[ToolRef]:
-        if not context or not context.query:
+        max_tools = filter_config.max_tools
+        if not context or not tokenize(context.query):
             return refs[:max_tools]
-        scored = [(self._score_tool(ref, context.query), ref) for ref in refs]
-        scored = [item for item in scored if item[0] > 0]
+
+        search_refs = self._get_search_refs(snapshot)
+        if filter_config.retrieval == "embedding":
+            vector_index = await self._get_vector_index(
+                snapshot, filter_config.embedding
+            )
+            backend = self._get_embedding_backend(filter_config.embedding)
+            [query_vector] = await asyncio.to_thread(backend.embed, [context.query])
+            matches = [
+                (doc_id, similarity)
+                for doc_id, similarity in vector_index.top_k(query_vector, max_tools)
+                if similarity > filter_config.embedding.min_similarity
+            ]
+        else:
+            matches = list(self._get_search_index(snapshot).score(context.query).items())
+
+        scores = {}
+        for doc_id, score in matches:
+            tool_ref = search_refs[doc_id]
+            scores[(tool_ref.server_name, tool_ref.tool_name)] = score
+        scored = [
+            (scores[(ref.server_name, ref.tool_name)], ref)
+            for ref in refs
+            if (ref.server_name, ref.tool_name) in scores
+        ]
         scored.sort(key=lambda item: (-item[0], item[1].server_name, item[1].tool_name))
         return [ref for _, ref in scored[:max_tools]]
 
-    def _score_tool(self, tool_ref: ToolRef, query: str) -> float:
-        if not query:
-            return 1.0
-        haystack = " ".join(
-            [
-                tool_ref.server_name,
-                tool_ref.tool_name,
-                tool_ref.gateway_name,
-                tool_ref.tool.description or "",
+    def _get_search_refs(self, snapshot: ToolRegistrySnapshot) -> list[ToolRef]:
+        """Exposed tools in the document order of the snapshot's search indexes"""
+        if snapshot.search_refs is None:
+            snapshot.search_refs = [
+                tool_ref
+                for refs in snapshot.tools_by_server.values()
+                for tool_ref in refs
+                if tool_ref.exposed
             ]
-        ).lower()
-        terms = [term for term in query.lower().split() if term]
-        if not terms:
-            return 1.0
-        return float(sum(1 for term in terms if term in haystack))
+        return snapshot.search_refs
+
+    def _get_search_index(self, snapshot: ToolRegistrySnapshot) -> ToolSearchIndex:
+        """Builds the snapshot's search index on first use"""
+        if snapshot.search_index is None:
+            snapshot.search_index = ToolSearchIndex(
+                [
+                    (
+                        f"{tool_ref.tool_name} {tool_ref.gateway_name}",
+                        tool_ref.tool.description or "",
+                        tool_ref.server_name,
+                    )
+                    for tool_ref in self._get_search_refs(snapshot)
+                ]
+            )
+        return snapshot.search_index
+
+    def _get_embedding_backend(self, cfg: ToolEmbeddingConfig) -> EmbeddingBackend:
+        if self._embedding_backend is None or self._embedding_backend[0] is not cfg:
+            self._embedding_backend = (cfg, create_embedding_backend(cfg))
+        return self._embedding_backend[1]
+
+    async def _get_vector_index(
+        self, snapshot: ToolRegistrySnapshot, cfg: ToolEmbeddingConfig
+    ) -> ToolVectorIndex:
+        """Embeds the snapshot's tools once per snapshot and embedding config"""
+        if snapshot.vector_index is None or snapshot.vector_index_config is not cfg:
+            backend = self._get_embedding_backend(cfg)
+            texts = [
+                f"{tool_ref.tool_name} {tool_ref.tool.description or ''} {tool_ref.server_name}"
+                for tool_ref in self._get_search_refs(snapshot)
+            ]
+            vectors = await asyncio.to_thread(backend.embed, texts)
+            snapshot.vector_index = ToolVectorIndex(vectors)
+            snapshot.vector_index_config = cfg
+        return snapshot.vector_index
 
     def _tool_ref_metadata(
         self, tool_ref: ToolRef, include_schema: bool
@@ -519,6 +949,13 @@ class GatewayToolRegistry:
 
     async def _inventory_result(self, client_manager: Any) -> types.CallToolResult:
         snapshot = await self.refresh(client_manager)
+        if snapshot.inventory_result is None:
+            snapshot.inventory_result = self._create_inventory_result(snapshot)
+        return snapshot.inventory_result
+
+    def _create_inventory_result(
+        self, snapshot: ToolRegistrySnapshot
+    ) -> types.CallToolResult:
         servers = {
             server_name: [ref.tool_name for ref in refs if ref.exposed]
             for server_name, refs in snapshot.tools_by_server.items()
@@ -527,7 +964,7 @@ class GatewayToolRegistry:
             content=[
                 types.TextContent(
                     type="text",
-                    text=json.dumps({"servers": servers}, ensure_ascii=False),
+                    text=fastjson.dumps_str({"servers": servers}),
                 )
             ],
             isError=False,
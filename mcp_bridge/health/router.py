@@ -1,8 +1,12 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
-from .types import HealthCheckResponse
+from .types import HealthCheckResponse, UnhealthyEvent
 from .manager import manager
 from mcp_bridge.openapi_tags import Tag
+from mcp_bridge.mcp_clients.McpClientManager import ClientManager
+from mcp_bridge.models.inferencePoolStats import InferencePoolStats
+from mcp_bridge.models.mcpStartupStatus import McpStartupStatus
+from mcp_bridge.openai_clients.genericHttpxClient import InferencePool
 
 router = APIRouter(tags=[Tag.health])
 
@@ -27,3 +31,34 @@ async def health():
         unhealthy_events=[],
     )
     return response
+
+
+@router.get("/health/ready", response_model=HealthCheckResponse)
+async def ready():
+    """Readiness check, fails until the startup quorum of MCP servers is connected"""
+    if not ClientManager.ready:
+        status = ClientManager.startup_status()
+        response = HealthCheckResponse(
+            status="error",
+            unhealthy_events=[
+                UnhealthyEvent(
+                    name=f"waiting for MCP servers ({status.connected}/{status.required} connected)",
+                    severity="error",
+                ),
+            ],
+        )
+        return JSONResponse(content=response.model_dump(), status_code=503)
+
+    return HealthCheckResponse(status="ok", unhealthy_events=[])
+
+
+@router.get("/health/inference-pool", response_model=InferencePoolStats)
+async def inference_pool_stats():
+    """Connection reuse statistics for the shared inference server client"""
+    return InferencePool.stats()
+
+
+@router.get("/health/mcp-startup", response_model=McpStartupStatus)
+async def mcp_startup_status():
+    """Progress of connecting the configured MCP servers"""
+    return ClientManager.startup_status()
@@ -1,5 +1,6 @@
 from contextlib import asynccontextmanager
 from mcp_bridge.mcp_clients.McpClientManager import ClientManager
+from mcp_bridge.openai_clients.genericHttpxClient import InferencePool
 from loguru import logger
 
 
@@ -9,6 +10,8 @@ async def lifespan(app):
 
     # startup
     logger.log("DEBUG", "Entered fastapi lifespan")
+    await InferencePool.start()
+    logger.log("DEBUG", "Started inference client pool")
     await ClientManager.initialize()
     logger.log("DEBUG", "Initialized MCP Client Manager")
 
@@ -17,5 +20,7 @@ async def lifespan(app):
     logger.log("DEBUG", "Returned form lifespan yield")
 
     # shutdown
+    await InferencePool.aclose()
+    logger.log("DEBUG", "Closed inference client pool")
 
     logger.log("DEBUG", "Exiting fastapi lifespan")
@@ -0,0 +1,17 @@
+"""Helpers for debug logging on hot paths
+
+a disabled loguru debug call still costs about half a microsecond, and an
+f-string message (or a model_dump() argument) is built even when nothing is
+logged. per-token and per-call paths check debug_enabled() once and skip their
+debug logging entirely when it is off, other debug calls pass their values as
+format arguments so loguru only formats emitted messages.
+"""
+
+import mcp_bridge.config as bridge_config
+
+
+def debug_enabled() -> bool:
+    """whether debug messages are emitted with the configured log level"""
+    logging_config = getattr(bridge_config.config, "logging", None)
+    # without a config loguru keeps its default handler, which logs debug
+    return getattr(logging_config, "log_level", "DEBUG") == "DEBUG"
@@ -4,6 +4,7 @@ from loguru import logger
 
 from mcp_bridge import __version__ as version
 from mcp_bridge.config import config
+from mcp_bridge.fastjson import FastJSONResponse
 from mcp_bridge.routers import secure_router, public_router
 from mcp_bridge.lifespan import lifespan
 from mcp_bridge.openapi_tags import tags_metadata
@@ -20,6 +21,7 @@ def create_app() -> FastAPI:
         version=version,
         lifespan=lifespan,
         openapi_tags=tags_metadata,
+        default_response_class=FastJSONResponse,
     )
 
     # setup tracing
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException
 from mcp.types import ListPromptsResult, ListToolsResult, ListResourcesResult
+from mcp_bridge.models.mcpHttpPoolStats import McpHttpPoolStats
 from mcp_bridge.models.mcpServerStatus import McpServerStatus
+from mcp_bridge.mcp_clients.HttpClient import HttpClient
 from mcp_bridge.mcp_clients.McpClientManager import ClientManager
 
 router = APIRouter(prefix="/servers")
@@ -48,3 +50,19 @@ async def get_server_status(server_name: str) -> McpServerStatus:
         raise HTTPException(status_code=404, detail=f"Server '{server_name}' not found")
 
     return await client.status()
+
+
+@router.get("/{server_name}/pool")
+async def get_server_pool(server_name: str) -> McpHttpPoolStats:
+    """Get the connection pool statistics of a specific HTTP MCP server"""
+
+    client = ClientManager.get_client(server_name)
+    if not client:
+        raise HTTPException(status_code=404, detail=f"Server '{server_name}' not found")
+
+    if not isinstance(client, HttpClient):
+        raise HTTPException(
+            status_code=404, detail=f"Server '{server_name}' is not an HTTP server"
+        )
+
+    return client.pool_stats()
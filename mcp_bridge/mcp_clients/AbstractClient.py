@@ -1,6 +1,8 @@
 import asyncio
+import contextlib
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from fastapi import HTTPException
 from mcp import McpError
 from mcp.types import (
@@ -12,9 +14,14 @@ from mcp.types import (
     GetPromptResult,
     TextResourceContents,
     BlobResourceContents,
+    ServerNotification,
+    ToolListChangedNotification,
 )
 from loguru import logger
 from pydantic import AnyUrl
+from mcp_bridge.config import config
+from mcp_bridge.gateway import ToolRegistry
+from mcp_bridge.mcp_clients.circuit_breaker import CircuitBreaker, backoff_delay
 from mcp_bridge.mcp_clients.session import McpClientSession
 from mcp_bridge.models.mcpServerStatus import McpServerStatus
 
@@ -23,21 +30,53 @@ class GenericMcpClient(ABC):
     name: str
     config: Any
     client: Any
-    session: McpClientSession | None = None
 
     def __init__(self, name: str) -> None:
         super().__init__()
-        self.session = None
+        self._session: McpClientSession | None = None
+        self._session_ready = asyncio.Event()
+        self._session_established = False
+        self._next_attempt_at: float | None = None
+        self._maintainer: asyncio.Task | None = None
+        # called whenever the session is set or cleared, e.g. by a session pool
+        self.on_session_change: Callable[[], None] | None = None
+        self.circuit = CircuitBreaker(config.mcp_sessions.failure_threshold)
         self.name = name
 
         logger.debug(f"initializing client class for {name}")
 
+    @property
+    def session(self) -> McpClientSession | None:
+        return self._session
+
+    @session.setter
+    def session(self, session: McpClientSession | None) -> None:
+        self._session = session
+        if session is None:
+            self._session_ready.clear()
+        else:
+            self._session_established = True
+            self._session_ready.set()
+        if self.on_session_change is not None:
+            self.on_session_change()
+
+    def is_ready(self) -> bool:
+        return self._session_ready.is_set()
+
+    async def wait_until_ready(self) -> None:
+        """Waits until the client has an initialized session"""
+        await self._session_ready.wait()
+
     @abstractmethod
     async def _maintain_session(self):
         pass
 
     async def _session_maintainer(self):
+        sessions = config.mcp_sessions
         while True:
+            self._session_established = False
+            self._next_attempt_at = None
+            self.circuit.attempt()
             try:
                 await self._maintain_session()
             except FileNotFoundError as e:
@@ -45,11 +84,55 @@ class GenericMcpClient(ABC):
             except Exception as e:
                 logger.error(f"failed to maintain session for {self.name}: {type(e)} {e.args}")
 
-            logger.debug(f"restarting session for {self.name}")
-            await asyncio.sleep(0.5)
+            # the session is gone, requests wait for the next one from here on
+            self.session = None
+            if self._session_established:
+                self.circuit.record_success()
+            else:
+                self.circuit.record_failure()
+                if self.circuit.is_open:
+                    logger.warning(
+                        "circuit open for {} after {} failed connection attempts",
+                        self.name,
+                        self.circuit.failures,
+                    )
+
+            delay = backoff_delay(
+                self.circuit.failures,
+                sessions.reconnect_initial_delay,
+                sessions.reconnect_max_delay,
+            )
+            self._next_attempt_at = time.monotonic() + delay
+            logger.debug("restarting session for {} in {:.2f}s", self.name, delay)
+            await asyncio.sleep(delay)
 
     async def start(self):
-        asyncio.create_task(self._session_maintainer())
+        self._maintainer = asyncio.create_task(self._session_maintainer())
+
+    async def stop(self):
+        """Stops maintaining the session, which closes it (and ends its process)"""
+        if self._maintainer is None:
+            return
+
+        self._maintainer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._maintainer
+        self._maintainer = None
+        self.session = None
+        logger.debug(f"stopped session for {self.name}")
+
+    async def handle_notification(self, notification: ServerNotification) -> None:
+        """Invalidate cached metadata when the server reports a list change"""
+        if isinstance(notification.root, ToolListChangedNotification):
+            logger.info(f"tool list changed for {self.name}")
+            self._invalidate_tools_cache()
+            ToolRegistry.invalidate_server(self.name)
+        else:
+            # resources and prompts are always fetched live, nothing to invalidate
+            logger.debug(f"{notification.root.method} received from {self.name}")
+
+    def _invalidate_tools_cache(self) -> None:
+        pass
 
     async def call_tool(
         self, name: str, arguments: dict, timeout: Optional[int] = None
@@ -129,12 +212,31 @@ class GenericMcpClient(ABC):
             logger.error(f"error listing prompts: {e}")
             return ListPromptsResult(prompts=[])
 
-    async def _wait_for_session(self, timeout: int = 5, http_error: bool = True):
+    def _session_wait_timeout(self) -> float:
+        sessions = config.mcp_sessions
+        return sessions.server_wait_timeouts.get(self.name, sessions.wait_timeout)
+
+    async def _wait_for_session(
+        self, timeout: float | None = None, http_error: bool = True
+    ):
+        if self.session is not None:
+            return
+
+        if self.circuit.is_open:
+            message = f"MCP server \"{self.name}\" is unavailable (circuit open)."
+            if http_error:
+                raise HTTPException(status_code=503, detail=message)
+
+            raise ConnectionError(message)
+
+        if timeout is None:
+            timeout = self._session_wait_timeout()
+
         try:
             async with asyncio.timeout(timeout):
+                logger.debug("waiting for session for {}", self.name)
                 while self.session is None:
-                    await asyncio.sleep(1)
-                    logger.debug(f"waiting for session for {self.name}")
+                    await self._session_ready.wait()
 
         except asyncio.TimeoutError:
             if http_error:
@@ -148,6 +250,16 @@ class GenericMcpClient(ABC):
 
     async def status(self) -> McpServerStatus:
         """Get the status of the MCP server"""
+        next_retry_in = None
+        if self.session is None and self._next_attempt_at is not None:
+            next_retry_in = max(0.0, self._next_attempt_at - time.monotonic())
+
         return McpServerStatus(
-            name=self.name, online=self.session is not None, enabled=True
+            name=self.name,
+            online=self.session is not None,
+            enabled=True,
+            circuit_state=self.circuit.state,
+            consecutive_failures=self.circuit.failures,
+            next_retry_in=next_retry_in,
+            sessions_online=int(self.session is not None),
         )
@@ -18,7 +18,9 @@ class DockerClient(GenericMcpClient):
     async def _maintain_session(self):
         async with docker_client(self.config) as client:
             logger.debug(f"made instance of docker client for {self.name}")
-            async with McpClientSession(*client) as session:
+            async with McpClientSession(
+                *client, notification_handler=self.handle_notification
+            ) as session:
                 await session.initialize()
                 logger.debug(f"finished initialise session for {self.name}")
                 self.session = session
@@ -1,248 +1,163 @@
-"""HTTP MCP Client - 通过HTTP POST JSON-RPC 2.0协议连接MCP服务器"""
+"""HTTP MCP Client - 通过Streamable HTTP传输连接MCP服务器"""
 
 import asyncio
+from datetime import timedelta
+
 import httpx
 import json
 from loguru import logger
+from pydantic import RootModel
+from mcp import McpError
+import mcp.types as types
 from mcp.types import (
     CallToolResult,
-    ListToolsResult,
     TextContent,
-    Tool,
     ListResourcesResult,
     ListPromptsResult,
 )
+from mcp_bridge.config import config as bridge_config
 from mcp_bridge.config.final import HTTPMCPServer
+from mcp_bridge.models.mcpHttpPoolStats import McpHttpPoolStats
+from mcp_bridge.mcp_clients.session import McpClientSession
 from .AbstractClient import GenericMcpClient
+from .streamable_http import RequestMetrics, streamable_http_client
+
+
+class RawResult(RootModel[dict]):
+    """未经校验的结果，用于兼容返回非标准内容的服务器"""
 
 
 class HttpClient(GenericMcpClient):
-    """HTTP MCP客户端 - 使用HTTP POST和JSON-RPC 2.0协议
-    
-    这个客户端不使用持久会话，而是为每个请求创建独立的HTTP请求。
+    """HTTP MCP客户端 - 使用Streamable HTTP传输
+
+    每个会话通过POST发送请求（可并发多路复用），并通过GET流接收服务器主动发送的消息，
+    通知与McpClientSession走同一处理路径。
     """
-    
+
     config: HTTPMCPServer
 
     def __init__(self, name: str, config: HTTPMCPServer) -> None:
         super().__init__(name=name)
         self.config = config
         self._http_client: httpx.AsyncClient | None = None
-        self._request_id = 0
-        self._session_id: str | None = None
-        self._is_initialized = False
-        self._tools_cache: list[Tool] = []
-
-    def _get_next_id(self) -> int:
-        """获取下一个请求ID"""
-        self._request_id += 1
-        return self._request_id
-
-    async def _send_jsonrpc_request(self, method: str, params: dict | None = None) -> dict:
-        """发送JSON-RPC 2.0请求"""
-        if not self._http_client:
-            raise RuntimeError("HTTP客户端未初始化")
-        
-        request_data = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "id": self._get_next_id()
-        }
-        
-        if params:
-            request_data["params"] = params
-        
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json, text/event-stream"
-        }
-        if self._session_id:
-            headers["mcp-session-id"] = self._session_id
-        
-        try:
-            logger.debug(f"📡 发送MCP请求到 {self.name}: {method} params={params}")
-            response = await self._http_client.post(
-                self.config.url,
-                json=request_data,
-                headers=headers,
-                timeout=30.0
-            )
-
-            logger.debug(f"📥 MCP原始响应 {self.name}: status={response.status_code}")
-
-            # Extract session ID from response headers if present
-            session_id = response.headers.get('mcp-session-id')
-            if session_id and not self._session_id:
-                self._session_id = session_id
-                logger.info(f"📌 获取到Session ID: {session_id[:20]}...")  # Log first 20 chars
-
-            if response.status_code != 200:
-                logger.error(f"❌ MCP请求失败 {self.name}: {response.status_code} - {response.text}")
-                raise RuntimeError(f"MCP请求失败: {response.status_code}")
-
-            # Handle both SSE (Server-Sent Events) and plain JSON formats
-            text = response.text
-            logger.debug(f"📥 MCP原始响应文本 {self.name}: {text[:200]}...")  # Log first 200 chars
-
-            result = None
-
-            # Try SSE format first (for graphiti and similar servers)
-            if 'data:' in text:
-                for line in text.split('\n'):
-                    line = line.strip()
-                    if line.startswith('data:'):
-                        json_str = line[5:].strip()  # Remove "data:" prefix
-                        if json_str:
-                            try:
-                                result = json.loads(json_str)
-                                break  # Use the first valid data message
-                            except json.JSONDecodeError as e:
-                                logger.warning(f"⚠️ 无法解析SSE数据: {json_str[:100]}... 错误: {e}")
-                                continue
-
-            # If no SSE format found, try plain JSON (for knowledge_base and similar servers)
-            if result is None:
-                try:
-                    result = json.loads(text)
-                    logger.debug(f"✅ 解析为纯JSON格式")
-                except json.JSONDecodeError as e:
-                    logger.error(f"❌ 无法解析JSON响应: {e}")
-                    raise RuntimeError(f"无法从响应中提取有效JSON数据")
-
-            logger.debug(f"📥 MCP响应 {self.name}: {result}")
+        self._http2 = False
+        self._metrics = RequestMetrics()
+
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """创建连接池客户端，并发请求通过多个连接（或HTTP/2多路复用）并行发送"""
+        pool = self.config.pool
+        timeouts = self.config.timeouts
+        client_kwargs = dict(
+            timeout=httpx.Timeout(
+                connect=timeouts.connect,
+                read=timeouts.read,
+                write=timeouts.write,
+                pool=timeouts.pool,
+            ),
+            limits=httpx.Limits(
+                max_connections=pool.max_connections,
+                max_keepalive_connections=pool.max_keepalive_connections,
+                keepalive_expiry=pool.keepalive_expiry,
+            ),
+            follow_redirects=True,
+            trust_env=False,  # 禁用环境变量代理，避免内网服务走代理
+        )
+
+        if pool.http2:
+            try:
+                client = httpx.AsyncClient(http2=True, **client_kwargs)
+                self._http2 = True
+                return client
+            except ImportError:
+                logger.warning(
+                    "http2 is enabled for {} but the h2 package is not installed, "
+                    "falling back to HTTP/1.1",
+                    self.name,
+                )
 
-            # 检查错误
-            if result.get("error") is not None:
-                error = result["error"]
-                error_msg = error.get('message', str(error)) if isinstance(error, dict) else str(error)
-                # "Method not found" 是可选方法不支持时的正常响应，使用debug级别
-                if "Method not found" in error_msg:
-                    logger.debug(f"MCP方法不支持 {self.name}: {error_msg}")
-                else:
-                    logger.error(f"❌ MCP错误 {self.name}: {error_msg}")
-                raise RuntimeError(f"MCP错误: {error_msg}")
-
-            # 返回结果
-            if "result" in result:
-                return result["result"]
-            return result
-            
-        except httpx.HTTPError as e:
-            error_msg = str(e) or repr(e) or type(e).__name__
-            logger.error(f"❌ HTTP错误 {self.name}: {type(e).__name__}: {error_msg}")
-            import traceback
-            logger.error(f"堆栈追踪:\n{traceback.format_exc()}")
-            raise RuntimeError(f"HTTP错误: {type(e).__name__}: {error_msg}")
-        except Exception as e:
-            error_msg = str(e) or repr(e) or type(e).__name__
-            logger.error(f"❌ 未知错误 {self.name}: {type(e).__name__}: {error_msg}")
-            import traceback
-            logger.error(f"堆栈追踪:\n{traceback.format_exc()}")
-            raise
+        self._http2 = False
+        return httpx.AsyncClient(**client_kwargs)
+
+    def pool_stats(self) -> McpHttpPoolStats:
+        """连接池统计信息"""
+        pool = self.config.pool
+        metrics = self._metrics
+        reused = max(metrics.requests - metrics.connections_opened, 0)
+        return McpHttpPoolStats(
+            name=self.name,
+            started=self._http_client is not None,
+            http2=self._http2,
+            max_connections=pool.max_connections,
+            max_keepalive_connections=pool.max_keepalive_connections,
+            requests=metrics.requests,
+            in_flight=metrics.in_flight,
+            peak_in_flight=metrics.peak_in_flight,
+            connections_opened=metrics.connections_opened,
+            reused_requests=reused,
+            reuse_rate=reused / metrics.requests if metrics.requests else 0.0,
+        )
 
     async def _maintain_session(self):
-        """维护HTTP MCP会话"""
+        """维护Streamable HTTP MCP会话"""
+        # 不使用环境变量中的代理设置（特别重要：Docker容器可能设置了代理）
+        self._http_client = self._create_http_client()
+        logger.info(f"📡 创建HTTP客户端连接到 {self.config.url} (禁用代理, http2={self._http2})")
         try:
-            # 创建HTTP客户端
-            if self._http_client is None:
-                # 不使用环境变量中的代理设置（特别重要：Docker容器可能设置了代理）
-                self._http_client = httpx.AsyncClient(
-                    timeout=30.0,
-                    follow_redirects=True,
-                    trust_env=False  # 禁用环境变量代理，避免内网服务走代理
-                )
-                logger.info(f"📡 创建HTTP客户端连接到 {self.config.url} (禁用代理)")
-            
-            # 初始化MCP连接
-            init_result = await self._send_jsonrpc_request(
-                method="initialize",
-                params={
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "tools": {}
-                    },
-                    "clientInfo": {
-                        "name": self.name,
-                        "version": "1.0.0"
-                    }
-                }
-            )
-            
-            logger.debug(f"📥 MCP初始化响应 {self.name}: {init_result}")
-            
-            # 发送initialized通知（可能返回状态或无返回值）
-            try:
-                await self._send_jsonrpc_request(method="notifications/initialized")
-            except Exception as e:
-                # 通知可能不需要响应或返回特殊格式，忽略错误
-                logger.debug(f"initialized通知响应: {e}")
-            
-            self._is_initialized = True
-            
-            # 获取工具列表并缓存
-            try:
-                tools_result = await self._send_jsonrpc_request(method="tools/list")
-                if tools_result and "tools" in tools_result:
-                    self._tools_cache = [Tool(**tool) for tool in tools_result["tools"]]
-                    logger.info(f"✅ {self.name} 已加载 {len(self._tools_cache)} 个工具")
-            except Exception as e:
-                logger.warning(f"⚠️ 无法获取工具列表 {self.name}: {e}")
-            
-            # 设置伪会话对象以满足 AbstractClient 的期望
-            # 创建一个包含必要方法的对象
-            class PseudoSession:
-                async def list_tools(self):
-                    return await self.list_tools()
-
-                async def list_resources(self):
-                    return await self.list_resources()
-
-                async def list_prompts(self):
-                    return await self.list_prompts()
-
-            self.session = PseudoSession()
-            self.session.list_tools = lambda: self.list_tools()
-            self.session.list_resources = lambda: self.list_resources()
-            self.session.list_prompts = lambda: self.list_prompts()
-            
-            logger.info(f"✅ HTTP MCP连接初始化成功: {self.name}")
-            
-            # 保持会话活跃
-            while True:
-                await asyncio.sleep(30)
-                # HTTP不需要ping，只要客户端保持活跃即可
-                if not self._is_initialized:
-                    break
-                    
-        except Exception as e:
-            error_msg = str(e) or repr(e) or type(e).__name__
-            logger.error(f"❌ HTTP会话维护失败 {self.name}: {type(e).__name__}: {error_msg}")
-            import traceback
-            logger.error(f"完整堆栈:\n{traceback.format_exc()}")
-            self.session = None
-            self._is_initialized = False
+            async with streamable_http_client(
+                self._http_client,
+                self.config.url,
+                self.config.max_response_bytes,
+                self._metrics,
+            ) as streams:
+                # pending requests get no response once the transport is gone, e.g.
+                # after the session expired, the read timeout bounds their wait
+                async with McpClientSession(
+                    *streams,
+                    read_timeout_seconds=timedelta(seconds=self.config.timeouts.read),
+                    notification_handler=self.handle_notification,
+                ) as session:
+                    await session.initialize()
+                    logger.info(f"✅ HTTP MCP连接初始化成功: {self.name}")
+                    self.session = session
+
+                    try:
+                        while True:
+                            await asyncio.sleep(10)
+                            if bridge_config.logging.log_server_pings:
+                                logger.debug(f"pinging session for {self.name}")
+
+                            async with asyncio.timeout(self.config.timeouts.read):
+                                await session.send_ping()
+
+                    except Exception as exc:
+                        logger.error(f"ping failed for {self.name}: {exc}")
+                        self.session = None
         finally:
             # 清理HTTP客户端
-            if self._http_client:
-                await self._http_client.aclose()
-                self._http_client = None
-        
+            await self._http_client.aclose()
+            self._http_client = None
+
         logger.debug(f"退出会话 {self.name}")
 
     async def call_tool(self, name: str, arguments: dict, timeout: int | None = None) -> CallToolResult:
         """调用工具"""
         await self._wait_for_session()
-        
+
         try:
-            async with asyncio.timeout(timeout or 30):
-                result = await self._send_jsonrpc_request(
-                    method="tools/call",
-                    params={
-                        "name": name,
-                        "arguments": arguments
-                    }
+            async with asyncio.timeout(timeout or self.config.timeouts.read):
+                response = await self.session.send_request(
+                    types.ClientRequest(
+                        types.CallToolRequest(
+                            method="tools/call",
+                            params=types.CallToolRequestParams(
+                                name=name, arguments=arguments
+                            ),
+                        )
+                    ),
+                    RawResult,
                 )
-                
+                result = response.root
+
                 # 将结果转换为 CallToolResult
                 if isinstance(result, dict) and "content" in result:
                     content = result["content"]
@@ -289,40 +204,15 @@ class HttpClient(GenericMcpClient):
                 isError=True,
             )
 
-    async def list_tools(self) -> ListToolsResult:
-        """列出所有工具"""
-        await self._wait_for_session()
-        
-        try:
-            # 如果有缓存，直接返回
-            if self._tools_cache:
-                return ListToolsResult(tools=self._tools_cache)
-            
-            # 否则请求
-            result = await self._send_jsonrpc_request(method="tools/list")
-            if result and "tools" in result:
-                tools = [Tool(**tool) for tool in result["tools"]]
-                self._tools_cache = tools
-                return ListToolsResult(tools=tools)
-            
-            return ListToolsResult(tools=[])
-        except Exception as e:
-            logger.error(f"列出工具错误: {e}")
-            return ListToolsResult(tools=[])
-
     async def list_resources(self) -> ListResourcesResult:
         """列出所有资源"""
         await self._wait_for_session()
-        
+
         try:
-            result = await self._send_jsonrpc_request(method="resources/list")
-            if result and "resources" in result:
-                return ListResourcesResult(resources=result["resources"])
-            return ListResourcesResult(resources=[])
+            return await self.session.list_resources()
         except Exception as e:
             # "Method not found" 是可选方法，不是所有MCP服务器都支持，使用debug级别日志
-            error_msg = str(e)
-            if "Method not found" in error_msg:
+            if isinstance(e, McpError) and e.error.code == types.METHOD_NOT_FOUND:
                 logger.debug(f"MCP服务器 {self.name} 不支持 resources/list 方法（这是可选功能）")
             else:
                 logger.error(f"列出资源错误: {e}")
@@ -331,18 +221,13 @@ class HttpClient(GenericMcpClient):
     async def list_prompts(self) -> ListPromptsResult:
         """列出所有提示"""
         await self._wait_for_session()
-        
+
         try:
-            result = await self._send_jsonrpc_request(method="prompts/list")
-            if result and "prompts" in result:
-                return ListPromptsResult(prompts=result["prompts"])
-            return ListPromptsResult(prompts=[])
+            return await self.session.list_prompts()
         except Exception as e:
             # "Method not found" 是可选方法，不是所有MCP服务器都支持，使用debug级别日志
-            error_msg = str(e)
-            if "Method not found" in error_msg:
+            if isinstance(e, McpError) and e.error.code == types.METHOD_NOT_FOUND:
                 logger.debug(f"MCP服务器 {self.name} 不支持 prompts/list 方法（这是可选功能）")
             else:
                 logger.error(f"列出提示错误: {e}")
             return ListPromptsResult(prompts=[])
-
@@ -0,0 +1,185 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+from loguru import logger
+from mcp.types import (
+    BlobResourceContents,
+    CallToolResult,
+    GetPromptResult,
+    ListPromptsResult,
+    ListResourcesResult,
+    ListToolsResult,
+    TextResourceContents,
+    Tool,
+)
+from pydantic import AnyUrl
+
+from mcp_bridge.config import config
+from mcp_bridge.mcp_clients.session import McpClientSession
+from mcp_bridge.mcp_clients.tool_cache import ToolCache, config_fingerprint
+from mcp_bridge.models.mcpServerStatus import McpServerStatus
+
+
+class LazyClient:
+    """Starts an MCP server on its first request and stops it when idle
+
+    while the server is stopped its tools are listed from the tool cache. a
+    server without cached tools is started once at startup to record them and
+    is stopped again after idle_timeout like any other.
+    """
+
+    def __init__(
+        self, name: str, config: Any, client: Any, tool_cache: ToolCache, idle_timeout: float
+    ) -> None:
+        self.name = name
+        self.config = config
+        self.client = client
+        self.tool_cache = tool_cache
+        self.idle_timeout = idle_timeout
+        self.fingerprint = config_fingerprint(config)
+        self.running = False
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+        self.cached_tools: list[Tool] | None = None
+        self._start_lock = asyncio.Lock()
+        self._idle_task: asyncio.Task | None = None
+        self._record_task: asyncio.Task | None = None
+
+    @property
+    def session(self) -> McpClientSession | None:
+        return self.client.session if self.running else None
+
+    async def start(self):
+        self.cached_tools = self.tool_cache.get(self.name, self.fingerprint)
+        if self.cached_tools is None:
+            logger.info(f"no cached tools for lazy server {self.name}, starting it to list them")
+            await self._ensure_running()
+            self._record_task = asyncio.create_task(self._record_tools())
+        else:
+            logger.info(f"{self.name} starts on demand, {len(self.cached_tools)} tools cached")
+
+    async def _record_tools(self) -> None:
+        try:
+            await self.list_tools()
+        except Exception as e:
+            logger.error(f"failed to list the tools of lazy server {self.name}: {e}")
+
+    async def stop(self):
+        if self._idle_task is not None:
+            self._idle_task.cancel()
+            self._idle_task = None
+        async with self._start_lock:
+            if self.running:
+                self.running = False
+                await self.client.stop()
+
+    def is_ready(self) -> bool:
+        return self.cached_tools is not None or self.client.is_ready()
+
+    async def wait_until_ready(self) -> None:
+        """Ready once the tools are known, cached or from the running server"""
+        if self.cached_tools is None:
+            await self.client.wait_until_ready()
+
+    async def _ensure_running(self) -> None:
+        if self.running:
+            return
+        async with self._start_lock:
+            if self.running:
+                return
+            logger.info(f"starting lazy server {self.name}")
+            self.last_used = time.monotonic()
+            await self.client.start()
+            self.running = True
+            self._idle_task = asyncio.create_task(self._stop_when_idle())
+
+    async def _stop_when_idle(self) -> None:
+        while True:
+            idle_for = time.monotonic() - self.last_used
+            if self.in_flight or idle_for < self.idle_timeout:
+                await asyncio.sleep(max(self.idle_timeout - idle_for, 0.1))
+                continue
+
+            async with self._start_lock:
+                # a request that started meanwhile keeps the server running
+                if self.in_flight:
+                    continue
+                logger.info(f"stopping lazy server {self.name} after {idle_for:.0f}s idle")
+                self.running = False
+                self._idle_task = None
+                await self.client.stop()
+                return
+
+    @asynccontextmanager
+    async def _use(self, touch: bool = True) -> AsyncIterator[Any]:
+        """runs a request on the server, starting it first if it is stopped
+
+        requests with touch=False (metadata refreshes) do not keep the server
+        from being stopped when idle
+        """
+        self.in_flight += 1
+        try:
+            await self._ensure_running()
+            try:
+                async with asyncio.timeout(config.mcp_startup.timeout):
+                    await self.client.wait_until_ready()
+            except TimeoutError:
+                logger.warning(f"lazy server {self.name} is not connected yet")
+            yield self.client
+        finally:
+            self.in_flight -= 1
+            if touch:
+                self.last_used = time.monotonic()
+
+    async def call_tool(
+        self, name: str, arguments: dict, timeout: Optional[int] = None
+    ) -> CallToolResult:
+        async with self._use() as client:
+            return await client.call_tool(name, arguments, timeout)
+
+    async def get_prompt(
+        self, prompt: str, arguments: dict[str, str]
+    ) -> GetPromptResult | None:
+        async with self._use() as client:
+            return await client.get_prompt(prompt, arguments)
+
+    async def read_resource(
+        self, uri: AnyUrl
+    ) -> list[TextResourceContents | BlobResourceContents]:
+        async with self._use() as client:
+            return await client.read_resource(uri)
+
+    async def list_tools(self) -> ListToolsResult:
+        if not self.running and self.cached_tools is not None:
+            return ListToolsResult(tools=self.cached_tools)
+
+        async with self._use(touch=False) as client:
+            result = await client.list_tools()
+
+        # an empty list is also what a failed request returns, it is not cached
+        if result.tools:
+            await self.tool_cache.put(self.name, self.fingerprint, result.tools)
+            self.cached_tools = result.tools
+        return result
+
+    async def list_resources(self) -> ListResourcesResult:
+        if not self.running:
+            return ListResourcesResult(resources=[])
+        async with self._use(touch=False) as client:
+            return await client.list_resources()
+
+    async def list_prompts(self) -> ListPromptsResult:
+        if not self.running:
+            return ListPromptsResult(prompts=[])
+        async with self._use(touch=False) as client:
+            return await client.list_prompts()
+
+    async def status(self) -> McpServerStatus:
+        """Get the status of the MCP server, a stopped lazy server is offline"""
+        if self.running:
+            status = await self.client.status()
+            return status.model_copy(update={"lazy": True, "running": True})
+
+        return McpServerStatus(name=self.name, online=False, lazy=True, running=False)
@@ -1,3 +1,5 @@
+import asyncio
+import math
 from typing import Union
 
 from loguru import logger
@@ -6,62 +8,198 @@ from mcpx.client.transports.docker import DockerMCPServer
 
 from mcp_bridge.config import config
 from mcp_bridge.config.final import SSEMCPServer, HTTPMCPServer
+from mcp_bridge.mcp_clients.AbstractClient import GenericMcpClient
+from mcp_bridge.mcp_clients.tool_cache import ToolCache
+from mcp_bridge.models.mcpStartupStatus import McpStartupStatus
 
 from .DockerClient import DockerClient
 from .HttpClient import HttpClient
+from .LazyClient import LazyClient
+from .PooledClient import AutoscalingPooledClient, PooledClient
 from .SseClient import SseClient
 from .StdioClient import StdioClient
 
-client_types = Union[StdioClient, SseClient, HttpClient, DockerClient]
+client_types = Union[
+    StdioClient,
+    SseClient,
+    HttpClient,
+    DockerClient,
+    PooledClient,
+    AutoscalingPooledClient,
+    LazyClient,
+]
 
 
 class MCPClientManager:
-    clients: dict[str, client_types] = {}
+    clients: dict[str, client_types]
+
+    def __init__(self) -> None:
+        self.clients = {}
+        self.failed: list[str] = []  # servers whose client could not be created
+        self.required = 0
+        self._started = False
+        self._quorum_task: asyncio.Task | None = None
+        self._tool_cache: ToolCache | None = None
 
     async def initialize(self):
-        """Initialize the MCP Client Manager and start all clients"""
+        """Initialize the MCP Client Manager and start all clients
+
+        clients are started concurrently. this returns once the startup quorum
+        of servers is connected or the startup timeout expires, servers that are
+        still connecting keep doing so in the background
+        """
 
         logger.log("DEBUG", "Initializing MCP Client Manager")
 
-        for server_name, server_config in config.mcp_servers.items():
-            try:
-                logger.info(f"Initializing {server_name} with config type {type(server_config).__name__}")
-                self.clients[server_name] = await self.construct_client(
-                    server_name, server_config
-                )
-                logger.info(f"Successfully initialized {server_name}")
-            except Exception as e:
-                logger.error(f"Failed to initialize {server_name}: {type(e).__name__}: {e}")
-                import traceback
-                logger.error(f"Stack trace:\n{traceback.format_exc()}")
+        servers = list(config.mcp_servers.items())
+        clients = await asyncio.gather(
+            *(self._start_client(name, server_config) for name, server_config in servers)
+        )
+        for (server_name, _), client in zip(servers, clients):
+            if client is None:
+                self.failed.append(server_name)
+            else:
+                self.clients[server_name] = client
+
+        startup = config.mcp_startup
+        # servers whose client could not be created can never connect
+        self.required = math.ceil(len(self.clients) * startup.quorum)
+        self._started = True
+        self._quorum_task = asyncio.create_task(self._wait_for_quorum())
+
+        done, _ = await asyncio.wait({self._quorum_task}, timeout=startup.timeout)
+        if not done:
+            logger.warning(
+                "{}/{} required MCP servers connected after {}s, "
+                "continuing startup while the rest connect in the background",
+                self.connected_count(),
+                self.required,
+                startup.timeout,
+            )
+
+    async def _start_client(self, name, server_config) -> client_types | None:
+        try:
+            logger.info(f"Initializing {name} with config type {type(server_config).__name__}")
+            client = await self.construct_client(name, server_config)
+            logger.info(f"Successfully initialized {name}")
+            return client
+        except Exception as e:
+            logger.error(f"Failed to initialize {name}: {type(e).__name__}: {e}")
+            import traceback
+            logger.error(f"Stack trace:\n{traceback.format_exc()}")
+            return None
+
+    @property
+    def ready(self) -> bool:
+        """whether startup finished and the quorum of clients is currently ready"""
+        return self._started and self.connected_count() >= self.required
+
+    async def _wait_for_quorum(self) -> None:
+        """returns once the required number of clients is ready
+
+        servers that are down at boot keep reconnecting, so this waits for as
+        long as it takes them
+        """
+        waiters = [
+            asyncio.create_task(client.wait_until_ready())
+            for client in self.clients.values()
+        ]
+        connected = 0
+        try:
+            if self.required:
+                for waiter in asyncio.as_completed(waiters):
+                    await waiter
+                    connected += 1
+                    if connected >= self.required:
+                        break
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+        logger.info(
+            "MCP server quorum reached ({}/{} connected)",
+            self.connected_count(),
+            len(self.clients) + len(self.failed),
+        )
+
+    def connected_count(self) -> int:
+        """clients that are ready, lazy servers with cached tools included"""
+        return sum(client.is_ready() for client in self.clients.values())
+
+    def startup_status(self) -> McpStartupStatus:
+        return McpStartupStatus(
+            ready=self.ready,
+            connected=self.connected_count(),
+            required=self.required,
+            configured=len(self.clients) + len(self.failed),
+            failed=list(self.failed),
+        )
 
     async def construct_client(self, name, server_config) -> client_types:
         logger.log("DEBUG", f"Constructing client for {server_config}")
 
+        autoscale = getattr(server_config, "autoscale", None)
+        pool_size = getattr(server_config, "pool_size", 1)
+        if autoscale is not None:
+            client = AutoscalingPooledClient(
+                name,
+                server_config,
+                autoscale,
+                lambda: self._create_client(name, server_config),
+            )
+        elif pool_size > 1:
+            # HTTP servers multiplex requests on one session and have no pool_size
+            members = [
+                self._create_client(name, self._member_config(server_config, index))
+                for index in range(pool_size)
+            ]
+            client = PooledClient(name, server_config, members)
+        else:
+            client = self._create_client(name, server_config)
+
+        if getattr(server_config, "lazy", False):
+            client = LazyClient(
+                name,
+                server_config,
+                client,
+                self.tool_cache(),
+                server_config.idle_timeout,
+            )
+
+        await client.start()
+        return client
+
+    def tool_cache(self) -> ToolCache:
+        if self._tool_cache is None:
+            self._tool_cache = ToolCache(config.mcp_startup.tool_cache)
+        return self._tool_cache
+
+    def _create_client(self, name, server_config) -> GenericMcpClient:
         if isinstance(server_config, StdioServerParameters):
-            client = StdioClient(name, server_config)
-            await client.start()
-            return client
+            return StdioClient(name, server_config)
 
         if isinstance(server_config, SSEMCPServer):
             # TODO: implement sse client
-            client = SseClient(name, server_config)  # type: ignore
-            await client.start()
-            return client
+            return SseClient(name, server_config)  # type: ignore
         
         if isinstance(server_config, HTTPMCPServer):
             # HTTP MCP client
-            client = HttpClient(name, server_config)  # type: ignore
-            await client.start()
-            return client
+            return HttpClient(name, server_config)  # type: ignore
         
         if isinstance(server_config, DockerMCPServer):
-            client = DockerClient(name, server_config)
-            await client.start()
-            return client
+            return DockerClient(name, server_config)
 
         raise NotImplementedError("Client Type not supported")
 
+    @staticmethod
+    def _member_config(server_config, index: int):
+        """config of one pool member, docker containers need distinct names"""
+        if isinstance(server_config, DockerMCPServer) and server_config.container_name:
+            return server_config.model_copy(
+                update={"container_name": f"{server_config.container_name}-{index + 1}"}
+            )
+        return server_config
+
     def get_client(self, server_name: str):
         return self.clients[server_name]
 
@@ -0,0 +1,330 @@
+import asyncio
+import itertools
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional
+
+from loguru import logger
+from mcp.types import (
+    BlobResourceContents,
+    CallToolResult,
+    GetPromptResult,
+    ListPromptsResult,
+    ListResourcesResult,
+    ListToolsResult,
+    TextResourceContents,
+)
+from pydantic import AnyUrl
+
+from mcp_bridge.config.final import StdioMCPServerAutoscale
+from mcp_bridge.mcp_clients.AbstractClient import GenericMcpClient
+from mcp_bridge.mcp_clients.session import McpClientSession
+from mcp_bridge.models.mcpServerStatus import McpServerStatus
+
+WAIT_SAMPLES = 1000
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """nearest rank percentile, 0 without samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class PooledClient:
+    """Spreads the requests to one MCP server over several sessions
+
+    every member is a complete client with its own session (and process for
+    stdio and docker servers). each request goes to the connected member with
+    the fewest outstanding requests, ties are broken round robin. with
+    max_in_flight set, requests wait in the pool while every member is busy,
+    until a request finishes or a member connects.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: Any,
+        members: list[GenericMcpClient],
+        max_in_flight: int | None = None,
+    ) -> None:
+        assert members, f"empty session pool for {name}"
+        self.name = name
+        self.config = config
+        self.members: list[GenericMcpClient] = []
+        self.outstanding: dict[GenericMcpClient, int] = {}
+        self.last_used: dict[GenericMcpClient, float] = {}
+        self.max_in_flight = max_in_flight
+        self.waiting = 0
+        self.waits: deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self.wait_count = 0  # waits recorded so far, including those dropped from waits
+        self._available = asyncio.Condition()
+        self._rotation = itertools.count()
+        self._wakeups: set[asyncio.Task] = set()
+        for member in members:
+            self._add_member(member)
+
+        logger.debug(f"initializing session pool of {len(members)} for {name}")
+
+    @property
+    def session(self) -> McpClientSession | None:
+        """session of the first connected member, None while none is connected"""
+        for member in self.members:
+            if member.session is not None:
+                return member.session
+        return None
+
+    async def start(self):
+        for member in self.members:
+            await member.start()
+
+    async def stop(self):
+        for member in list(self.members):
+            await member.stop()
+
+    def is_ready(self) -> bool:
+        return any(member.is_ready() for member in self.members)
+
+    async def wait_until_ready(self) -> None:
+        """Waits until any member has an initialized session"""
+        waiters = [
+            asyncio.create_task(member.wait_until_ready()) for member in self.members
+        ]
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    def connected_members(self) -> list[GenericMcpClient]:
+        return [member for member in self.members if member.session is not None]
+
+    def _add_member(self, member: GenericMcpClient) -> None:
+        self.members.append(member)
+        self.outstanding[member] = 0
+        self.last_used[member] = time.monotonic()
+        member.on_session_change = self._session_changed
+
+    async def _remove_member(self, member: GenericMcpClient) -> None:
+        """takes an idle member out of the pool and stops it"""
+        self.members.remove(member)
+        del self.outstanding[member], self.last_used[member]
+        member.on_session_change = None
+        await member.stop()
+
+    def _session_changed(self) -> None:
+        """a member connected or lost its session, waiting requests select again"""
+        wakeup = asyncio.get_running_loop().create_task(self._wake_waiters())
+        self._wakeups.add(wakeup)
+        wakeup.add_done_callback(self._wakeups.discard)
+
+    async def _wake_waiters(self) -> None:
+        async with self._available:
+            self._available.notify_all()
+
+    def _has_capacity(self, member: GenericMcpClient) -> bool:
+        return self.max_in_flight is None or self.outstanding[member] < self.max_in_flight
+
+    def _select(self) -> GenericMcpClient | None:
+        """least outstanding requests among the connected members
+
+        members that are still connecting come next, requests sent to them wait
+        for their session. only when every circuit is open are the requests
+        sent anyway, so they fail fast. None while all of them are busy.
+        """
+        connected = self.connected_members()
+        groups = [
+            connected,
+            [
+                member
+                for member in self.members
+                if member.session is None and not member.circuit.is_open
+            ],
+        ]
+        if not connected:
+            groups.append(self.members)
+
+        for group in groups:
+            candidates = [member for member in group if self._has_capacity(member)]
+            if not candidates:
+                continue
+            least = min(self.outstanding[member] for member in candidates)
+            tied = [member for member in candidates if self.outstanding[member] == least]
+            return tied[next(self._rotation) % len(tied)]
+        return None
+
+    @asynccontextmanager
+    async def _lease(self) -> AsyncIterator[GenericMcpClient]:
+        started = time.monotonic()
+        async with self._available:
+            self.waiting += 1
+            try:
+                member = await self._available.wait_for(self._select)
+            finally:
+                self.waiting -= 1
+            self.outstanding[member] += 1
+            self.waits.append(time.monotonic() - started)
+            self.wait_count += 1
+
+        try:
+            yield member
+        finally:
+            async with self._available:
+                self.outstanding[member] -= 1
+                self.last_used[member] = time.monotonic()
+                # a waiter cancelled after being notified would drop a single wakeup,
+                # the others re-check _select and wait again when nothing is free
+                self._available.notify_all()
+
+    async def call_tool(
+        self, name: str, arguments: dict, timeout: Optional[int] = None
+    ) -> CallToolResult:
+        async with self._lease() as member:
+            return await member.call_tool(name, arguments, timeout)
+
+    async def get_prompt(
+        self, prompt: str, arguments: dict[str, str]
+    ) -> GetPromptResult | None:
+        async with self._lease() as member:
+            return await member.get_prompt(prompt, arguments)
+
+    async def read_resource(
+        self, uri: AnyUrl
+    ) -> list[TextResourceContents | BlobResourceContents]:
+        async with self._lease() as member:
+            return await member.read_resource(uri)
+
+    async def list_tools(self) -> ListToolsResult:
+        async with self._lease() as member:
+            return await member.list_tools()
+
+    async def list_resources(self) -> ListResourcesResult:
+        async with self._lease() as member:
+            return await member.list_resources()
+
+    async def list_prompts(self) -> ListPromptsResult:
+        async with self._lease() as member:
+            return await member.list_prompts()
+
+    async def status(self) -> McpServerStatus:
+        """Get the status of the MCP server, healthy if any member is connected"""
+        statuses = [await member.status() for member in self.members]
+        online = [status for status in statuses if status.online]
+        best = min(statuses, key=lambda status: status.consecutive_failures)
+        retries = [
+            status.next_retry_in for status in statuses if status.next_retry_in is not None
+        ]
+
+        return McpServerStatus(
+            name=self.name,
+            online=bool(online),
+            enabled=True,
+            circuit_state=online[0].circuit_state if online else best.circuit_state,
+            consecutive_failures=best.consecutive_failures,
+            next_retry_in=min(retries) if retries and not online else None,
+            sessions=len(self.members),
+            sessions_online=len(online),
+            outstanding_requests=sum(self.outstanding.values()),
+            waiting_requests=self.waiting,
+            wait_p95=percentile(list(self.waits), 0.95),
+        )
+
+
+class AutoscalingPooledClient(PooledClient):
+    """Session pool that grows and shrinks between min_size and max_size
+
+    every interval one member is added when the requests in flight or waiting
+    per member exceed target_in_flight, or when the 95th percentile of the time
+    requests waited for a member since the last decision exceeds max_wait_p95.
+    members above min_size that stayed idle for idle_cooldown are stopped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: Any,
+        autoscale: StdioMCPServerAutoscale,
+        member_factory: Callable[[], GenericMcpClient],
+    ) -> None:
+        super().__init__(
+            name,
+            config,
+            [member_factory() for _ in range(autoscale.min_size)],
+            max_in_flight=autoscale.max_in_flight,
+        )
+        self.autoscale = autoscale
+        self.member_factory = member_factory
+        self._scaler: asyncio.Task | None = None
+        self._scaled_wait_count = 0
+
+    async def start(self):
+        await super().start()
+        self._scaler = asyncio.create_task(self._autoscale_loop())
+
+    async def stop(self):
+        if self._scaler is not None:
+            self._scaler.cancel()
+            self._scaler = None
+        await super().stop()
+
+    async def _autoscale_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.autoscale.interval)
+            try:
+                await self.scale(percentile(self._waits_since_last_decision(), 0.95))
+            except Exception as e:
+                logger.error(f"failed to scale session pool of {self.name}: {e}")
+
+    def _waits_since_last_decision(self) -> list[float]:
+        """the newest samples of waits, which stays intact for status()"""
+        new = min(self.wait_count - self._scaled_wait_count, len(self.waits))
+        self._scaled_wait_count = self.wait_count
+        return list(itertools.islice(self.waits, len(self.waits) - new, None))
+
+    async def scale(self, wait_p95: float) -> None:
+        """adds or removes at most one member based on the current load"""
+        autoscale = self.autoscale
+        size = len(self.members)
+        load = (sum(self.outstanding.values()) + self.waiting) / size
+        # a member that is still connecting already adds the capacity the load asks for
+        connecting = any(
+            member.session is None and not member.circuit.is_open
+            for member in self.members
+        )
+
+        if (
+            size < autoscale.max_size
+            and not connecting
+            and (load > autoscale.target_in_flight or wait_p95 > autoscale.max_wait_p95)
+        ):
+            member = self.member_factory()
+            logger.info(
+                "scaling {} up to {} processes (load {:.2f}, p95 wait {:.3f}s)",
+                self.name,
+                size + 1,
+                load,
+                wait_p95,
+            )
+            async with self._available:
+                self._add_member(member)
+                self._available.notify_all()
+            await member.start()
+            return
+
+        if size <= autoscale.min_size or self.waiting:
+            return
+
+        now = time.monotonic()
+        idle = [
+            member
+            for member in self.members
+            if not self.outstanding[member]
+            and now - self.last_used[member] >= autoscale.idle_cooldown
+        ]
+        if idle:
+            logger.info("scaling {} down to {} processes", self.name, size - 1)
+            # the newest members go first, the oldest keep the warm caches
+            await self._remove_member(idle[-1])
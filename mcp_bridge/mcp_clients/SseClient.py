@@ -16,9 +16,14 @@ class SseClient(GenericMcpClient):
         self.config = config
         self._tools_cache = []  # Cache for tools list
 
+    def _invalidate_tools_cache(self) -> None:
+        self._tools_cache = []
+
     async def _maintain_session(self):
         async with sse_client(self.config.url) as client:
-            async with McpClientSession(*client) as session:
+            async with McpClientSession(
+                *client, notification_handler=self.handle_notification
+            ) as session:
                 await session.initialize()
                 logger.info(f"✅ {self.name} SSE session initialized")
 
@@ -36,8 +36,7 @@ class StdioClient(GenericMcpClient):
 
         command = shutil.which(config.command)
         if command is None:
-            logger.error(f"could not find command {config.command}")
-            exit(1)
+            raise FileNotFoundError(f"could not find command {config.command}")
 
         own_config.command = command
 
@@ -53,7 +52,9 @@ class StdioClient(GenericMcpClient):
             logger.debug(f"entered stdio_client context manager for {self.name}")
             assert client[0] is not None, f"missing read stream for {self.name}"
             assert client[1] is not None, f"missing write stream for {self.name}"
-            async with McpClientSession(*client) as session:
+            async with McpClientSession(
+                *client, notification_handler=self.handle_notification
+            ) as session:
                 logger.debug(f"entered client session context manager for {self.name}")
                 await session.initialize()
                 logger.debug(f"finished initialise session for {self.name}")
@@ -0,0 +1,53 @@
+import random
+import time
+from typing import Literal
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class CircuitBreaker:
+    """Tracks the connection health of one MCP server
+
+    closed: sessions are connected normally and requests wait for reconnects
+    open: `failure_threshold` connection attempts in a row failed, requests
+        fail fast until the next attempt
+    half_open: a trial connection is in progress, it closes the circuit on
+        success and opens it again on failure
+    """
+
+    def __init__(self, failure_threshold: int) -> None:
+        self.failure_threshold = failure_threshold
+        self.state: CircuitState = "closed"
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == "open"
+
+    def attempt(self) -> None:
+        """called before every connection attempt"""
+        if self.state == "open":
+            self.state = "half_open"
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.state = "closed"
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                self.opened_at = time.time()
+            self.state = "open"
+
+
+def backoff_delay(failures: int, initial: float, maximum: float) -> float:
+    """exponential backoff with jitter, the delay doubles with every failure
+
+    the result is drawn from the upper half of the interval so retries of many
+    servers are spread out without ever retrying immediately
+    """
+    delay = min(maximum, initial * 2 ** min(failures, 32))
+    return random.uniform(delay / 2, delay)
@@ -0,0 +1,188 @@
+"""Incremental parsing of JSON-RPC responses sent as plain JSON or as SSE
+
+MCP servers answer a POST either with an application/json body or with a
+text/event-stream that carries the response (and possibly notifications) as
+`data:` events. The body is consumed chunk by chunk, so a response is
+returned as soon as its event is complete and oversized bodies are rejected
+before they are fully buffered.
+"""
+
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from mcp_bridge import fastjson
+
+MessageHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+class ResponseTooLargeError(RuntimeError):
+    pass
+
+
+class StreamClosedError(RuntimeError):
+    """the event stream ended before the response arrived"""
+
+
+@dataclass(frozen=True)
+class SSEEvent:
+    data: bytes
+    event: str = "message"
+    id: str | None = None
+
+
+class SSEDecoder:
+    """Incremental text/event-stream decoder
+
+    only the incomplete trailing line is kept between chunks, and every byte is
+    scanned for line breaks once, so large single line events stay linear
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._data: list[bytes] = []
+        self._event = ""
+        self._id: str | None = None
+
+    def feed(self, chunk: bytes) -> list[SSEEvent]:
+        events: list[SSEEvent] = []
+        scan = len(self._buffer)
+        self._buffer += chunk
+        start = 0
+        while (end := self._buffer.find(b"\n", scan)) != -1:
+            line = bytes(self._buffer[start:end])
+            if line.endswith(b"\r"):
+                line = line[:-1]
+            event = self._process_line(line)
+            if event is not None:
+                events.append(event)
+            start = scan = end + 1
+        del self._buffer[:start]
+        return events
+
+    @property
+    def pending_bytes(self) -> int:
+        """size of the event that is still being received"""
+        return len(self._buffer) + sum(len(data) for data in self._data)
+
+    def flush(self) -> list[SSEEvent]:
+        """dispatches what is left when the stream ends without a final blank line"""
+        events = self.feed(b"\n") if self._buffer else []
+        event = self._process_line(b"")
+        return events + ([event] if event is not None else [])
+
+    def _process_line(self, line: bytes) -> SSEEvent | None:
+        if not line:
+            return self._dispatch()
+        if line.startswith(b":"):
+            return None
+
+        field, _, value = line.partition(b":")
+        if value.startswith(b" "):
+            value = value[1:]
+
+        if field == b"data":
+            self._data.append(value)
+        elif field == b"event":
+            self._event = value.decode()
+        elif field == b"id":
+            self._id = value.decode()
+        return None
+
+    def _dispatch(self) -> SSEEvent | None:
+        if not self._data:
+            self._event = ""
+            return None
+        event = SSEEvent(
+            data=b"\n".join(self._data), event=self._event or "message", id=self._id
+        )
+        self._data = []
+        self._event = ""
+        return event
+
+
+def _is_response(message: Any) -> bool:
+    return isinstance(message, dict) and ("result" in message or "error" in message)
+
+
+async def read_jsonrpc_response(
+    chunks: AsyncIterator[bytes],
+    request_id: int | str,
+    max_bytes: int,
+    on_message: MessageHandler | None = None,
+    on_event_id: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """returns the JSON-RPC response for request_id from a JSON or SSE body
+
+    SSE events are parsed as they arrive and reading stops at the response
+    with the matching id, other messages are passed to on_message and event
+    ids to on_event_id. a response without a matching id is only used when the
+    body has no better match.
+    """
+    received = 0
+    head = bytearray()
+    decoder: SSEDecoder | None = None
+    fallback: dict[str, Any] | None = None
+
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > max_bytes:
+            raise ResponseTooLargeError(
+                f"response to request {request_id} exceeds {max_bytes} bytes"
+            )
+
+        if decoder is None:
+            head += chunk
+            stripped = head.lstrip()
+            if not stripped or stripped[:1] in (b"{", b"["):
+                # plain JSON (or nothing seen yet), it can only be parsed as a whole
+                continue
+            decoder = SSEDecoder()
+            chunk, head = bytes(head), bytearray()
+
+        for event in decoder.feed(chunk):
+            if event.id and on_event_id is not None:
+                on_event_id(event.id)
+            message = _parse_event(event)
+            if message is None:
+                continue
+            if _is_response(message) and message.get("id") == request_id:
+                return message
+            if _is_response(message):
+                fallback = fallback or message
+            elif on_message is not None:
+                await on_message(message)
+
+    if decoder is not None:
+        for event in decoder.flush():
+            message = _parse_event(event)
+            if _is_response(message) and message.get("id") == request_id:
+                return message
+            if _is_response(message):
+                fallback = fallback or message
+        if fallback is not None:
+            return fallback
+        raise StreamClosedError(
+            f"no response to request {request_id} in the event stream"
+        )
+
+    body = fastjson.loads(bytes(head))
+    if isinstance(body, list):
+        responses = [message for message in body if _is_response(message)]
+        for message in responses:
+            if message.get("id") == request_id:
+                return message
+        if responses:
+            return responses[0]
+        raise RuntimeError(f"no response to request {request_id} in the batch")
+    if not isinstance(body, dict):
+        raise RuntimeError(f"unexpected JSON-RPC response: {type(body).__name__}")
+    return body
+
+
+def _parse_event(event: SSEEvent) -> Any:
+    if not event.data.strip():
+        return None
+    try:
+        return fastjson.loads(event.data)
+    except ValueError:
+        return None
@@ -15,6 +15,14 @@ sampling_function_signature = Callable[
     [types.CreateMessageRequestParams], Awaitable[types.CreateMessageResult]
 ]
 
+notification_handler_signature = Callable[[types.ServerNotification], Awaitable[None]]
+
+LIST_CHANGED_NOTIFICATIONS = (
+    types.ToolListChangedNotification,
+    types.ResourceListChangedNotification,
+    types.PromptListChangedNotification,
+)
+
 
 class McpClientSession(
     BaseSession[
@@ -31,6 +39,7 @@ class McpClientSession(
         read_stream: MemoryObjectReceiveStream[types.JSONRPCMessage | Exception],
         write_stream: MemoryObjectSendStream[types.JSONRPCMessage],
         read_timeout_seconds: timedelta | None = None,
+        notification_handler: notification_handler_signature | None = None,
     ) -> None:
         super().__init__(
             read_stream,
@@ -39,6 +48,7 @@ class McpClientSession(
             types.ServerNotification,
             read_timeout_seconds=read_timeout_seconds,
         )
+        self._notification_handler = notification_handler
 
     async def __aenter__(self):
         session = await super().__aenter__()
@@ -48,27 +58,41 @@ class McpClientSession(
     async def _consume_messages(self):
         """Consume incoming messages from the server"""
         try:
-            # Read from the _read_stream directly
-            async for message in self._read_stream:
+            # BaseSession's receive loop reads the transport stream, routes responses
+            # and passes everything else on through incoming_messages, which must be
+            # drained or the receive loop blocks
+            async for message in self.incoming_messages:
                 try:
                     if isinstance(message, Exception):
                         logger.error(f"Received exception in message stream: {message}")
                     elif isinstance(message, RequestResponder):
-                        logger.debug(f"Received request: {message.request}")
-                        # Handle the request
-                        await self._received_request(message)
+                        # _received_request already ran in the receive loop
+                        logger.debug("Received unhandled request: {}", message.request)
                     elif isinstance(message, types.ServerNotification):
+                        # list_changed notifications are handled in _received_notification
                         if isinstance(message.root, types.LoggingMessageNotification):
-                            logger.debug(f"Received notification from server: {message.root.params}")
+                            logger.debug("Received notification from server: {}", message.root.params)
                         else:
-                            logger.debug(f"Received notification from server: {message}")
+                            logger.debug("Received notification from server: {}", message)
                     else:
-                        logger.debug(f"Received notification: {message}")
+                        logger.debug("Received notification: {}", message)
                 except Exception as e:
                     logger.exception(f"Error processing message: {e}")
         except Exception as e:
             logger.exception(f"Message consumer task failed: {e}")
 
+    async def _received_notification(
+        self, notification: types.ServerNotification
+    ) -> None:
+        await self._handle_list_changed(notification)
+
+    async def _handle_list_changed(self, notification: types.ServerNotification) -> None:
+        """Forward list_changed notifications so cached metadata can be invalidated"""
+        if self._notification_handler is None:
+            return
+        if isinstance(notification.root, LIST_CHANGED_NOTIFICATIONS):
+            await self._notification_handler(notification)
+
     async def initialize(self) -> types.InitializeResult:
         result = await self.send_request(
             types.ClientRequest(
@@ -275,7 +299,12 @@ class McpClientSession(
             # handle create message request (sampling)
             response = await self.sample(responder.request.root.params)
             client_response = types.ClientResult(**response.model_dump())
-            await responder.respond(client_response)
+            with responder:
+                await responder.respond(client_response)
+        elif isinstance(responder.request.root, types.PingRequest):
+            # responders must be entered, respond() raises outside of the context
+            with responder:
+                await responder.respond(types.ClientResult(root=types.EmptyResult()))
 
     async def sample(self, params: types.CreateMessageRequestParams) -> types.CreateMessageResult:
         logger.info("got sampling request from mcp server")
@@ -0,0 +1,353 @@
+"""Streamable HTTP client transport
+
+every client message is POSTed to the MCP endpoint in its own task, so any
+number of requests can be in flight on one session. responses, and the
+notifications and requests a server sends while answering, arrive as JSON or
+as an SSE stream on the POST response. after initialization a GET stream is
+opened for messages the server sends on its own. both kinds of stream are
+resumed with `Last-Event-ID` when they break.
+
+like the transports of the mcp package this yields a pair of memory streams,
+so the messages are handled by McpClientSession.
+"""
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+import anyio
+import httpx
+import mcp.types as types
+from anyio.abc import TaskGroup
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from loguru import logger
+
+from mcp_bridge import fastjson
+from .circuit_breaker import backoff_delay
+from .jsonrpc_stream import (
+    ResponseTooLargeError,
+    SSEDecoder,
+    StreamClosedError,
+    read_jsonrpc_response,
+)
+
+MCP_SESSION_ID = "mcp-session-id"
+MCP_PROTOCOL_VERSION = "mcp-protocol-version"
+LAST_EVENT_ID = "last-event-id"
+
+LISTEN_RETRY_DELAY = 1.0
+LISTEN_MAX_RETRY_DELAY = 60.0
+# client errors that may go away, any other one means the server has no GET stream
+RETRYABLE_LISTEN_STATUSES = {408, 429}
+MAX_RESUME_ATTEMPTS = 3
+
+
+class SessionExpiredError(RuntimeError):
+    """the server no longer knows the session, a new one has to be initialized"""
+
+
+@dataclass
+class RequestMetrics:
+    """request counters of one HTTP MCP server, shared by all its sessions"""
+
+    requests: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    connections_opened: int = 0
+
+    def started(self) -> None:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finished(self) -> None:
+        self.in_flight -= 1
+
+    async def trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+
+
+class StreamableHttpTransport:
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        url: str,
+        read_stream_writer: MemoryObjectSendStream[types.JSONRPCMessage | Exception],
+        max_response_bytes: int,
+        metrics: RequestMetrics | None = None,
+    ) -> None:
+        self.http_client = http_client
+        self.url = url
+        self.max_response_bytes = max_response_bytes
+        self.metrics = metrics or RequestMetrics()
+        self.session_id: str | None = None
+        self.protocol_version: str | None = None
+        self.last_event_id: str | None = None
+        self._read_stream_writer = read_stream_writer
+        self._listening = False
+
+    def _headers(self, accept: str) -> dict[str, str]:
+        headers = {"accept": accept}
+        if self.session_id:
+            headers[MCP_SESSION_ID] = self.session_id
+        if self.protocol_version:
+            headers[MCP_PROTOCOL_VERSION] = self.protocol_version
+        return headers
+
+    async def post_writer(
+        self,
+        write_stream_reader: MemoryObjectReceiveStream[types.JSONRPCMessage],
+        tg: TaskGroup,
+    ) -> None:
+        """POSTs every client message concurrently"""
+        async with write_stream_reader:
+            async for message in write_stream_reader:
+                tg.start_soon(self._post, message, tg)
+
+    async def _post(self, message: types.JSONRPCMessage, tg: TaskGroup) -> None:
+        root = message.root
+        request_id = root.id if isinstance(root, types.JSONRPCRequest) else None
+        body = fastjson.dumps(
+            message.model_dump(by_alias=True, mode="json", exclude_none=True)
+        )
+
+        self.metrics.started()
+        try:
+            async with self.http_client.stream(
+                "POST",
+                self.url,
+                content=body,
+                headers={
+                    **self._headers("application/json, text/event-stream"),
+                    "content-type": "application/json",
+                },
+                extensions={"trace": self.metrics.trace},
+            ) as response:
+                self._check_session(response)
+                if request_id is None:
+                    # notifications and responses are only acknowledged (202)
+                    return
+
+                response.raise_for_status()
+                if root.method == "initialize":
+                    self.session_id = response.headers.get(MCP_SESSION_ID)
+
+                last_event_id: list[str] = []
+                try:
+                    result = await read_jsonrpc_response(
+                        response.aiter_bytes(),
+                        request_id,
+                        self.max_response_bytes,
+                        on_message=self._forward,
+                        on_event_id=last_event_id.append,
+                    )
+                except (StreamClosedError, httpx.TransportError):
+                    if not last_event_id:
+                        raise
+                    result = await self._resume(request_id, last_event_id[-1])
+
+            await self._forward_response(result, request_id)
+            if root.method == "initialize":
+                self.protocol_version = (result.get("result") or {}).get(
+                    "protocolVersion"
+                )
+                if not self._listening:
+                    self._listening = True
+                    tg.start_soon(self.listen)
+
+        except SessionExpiredError:
+            raise
+        except Exception as exc:
+            if request_id is None:
+                # responses to server requests have no method
+                sent = getattr(root, "method", type(root).__name__)
+                logger.warning("failed to send {} to {}: {}", sent, self.url, exc)
+                return
+            # fail the waiting request instead of leaving it without a response
+            await self._forward_error(request_id, exc)
+        finally:
+            self.metrics.finished()
+
+    async def _resume(self, request_id: types.RequestId, event_id: str) -> dict[str, Any]:
+        """continues a broken POST event stream on a GET stream"""
+        for attempt in range(MAX_RESUME_ATTEMPTS):
+            try:
+                async with self.http_client.stream(
+                    "GET",
+                    self.url,
+                    headers={
+                        **self._headers("text/event-stream"),
+                        LAST_EVENT_ID: event_id,
+                    },
+                    extensions={"trace": self.metrics.trace},
+                ) as response:
+                    self._check_session(response)
+                    response.raise_for_status()
+                    last_event_id: list[str] = []
+                    try:
+                        return await read_jsonrpc_response(
+                            response.aiter_bytes(),
+                            request_id,
+                            self.max_response_bytes,
+                            on_message=self._forward,
+                            on_event_id=last_event_id.append,
+                        )
+                    finally:
+                        event_id = last_event_id[-1] if last_event_id else event_id
+            except (StreamClosedError, httpx.TransportError) as exc:
+                logger.debug(
+                    "resuming request {} on {} failed (attempt {}): {}",
+                    request_id,
+                    self.url,
+                    attempt + 1,
+                    exc,
+                )
+        raise StreamClosedError(f"could not resume the response to request {request_id}")
+
+    async def listen(self) -> None:
+        """receives server initiated messages on the GET stream
+
+        the stream is reopened whenever the server closes it, after errors with
+        exponential backoff. a server that refuses it with a client error does
+        not offer a GET stream, it is not requested again.
+        """
+        failures = 0
+        while True:
+            headers = self._headers("text/event-stream")
+            if self.last_event_id:
+                headers[LAST_EVENT_ID] = self.last_event_id
+            try:
+                async with self.http_client.stream(
+                    "GET",
+                    self.url,
+                    headers=headers,
+                    timeout=httpx.Timeout(self.http_client.timeout.connect, read=None),
+                    extensions={"trace": self.metrics.trace},
+                ) as response:
+                    self._check_session(response)
+                    if response.status_code == 405:
+                        logger.debug("{} does not offer a GET stream", self.url)
+                        return
+                    if (
+                        response.is_client_error
+                        and response.status_code not in RETRYABLE_LISTEN_STATUSES
+                    ):
+                        logger.warning(
+                            "{} refused the GET stream with {}, not listening for server messages",
+                            self.url,
+                            response.status_code,
+                        )
+                        return
+                    response.raise_for_status()
+                    failures = 0
+                    await self._read_listen_stream(response)
+            except (httpx.HTTPError, ResponseTooLargeError) as exc:
+                failures += 1
+                logger.debug("GET stream of {} closed: {}", self.url, exc)
+
+            await anyio.sleep(
+                backoff_delay(failures, LISTEN_RETRY_DELAY, LISTEN_MAX_RETRY_DELAY)
+            )
+
+    async def _read_listen_stream(self, response: httpx.Response) -> None:
+        decoder = SSEDecoder()
+        async for chunk in response.aiter_bytes():
+            for event in decoder.feed(chunk):
+                if event.id:
+                    self.last_event_id = event.id
+                if event.data.strip():
+                    await self._forward_bytes(event.data)
+            if decoder.pending_bytes > self.max_response_bytes:
+                raise ResponseTooLargeError(
+                    f"event on the GET stream exceeds {self.max_response_bytes} bytes"
+                )
+
+    def _check_session(self, response: httpx.Response) -> None:
+        if response.status_code == 404 and self.session_id:
+            raise SessionExpiredError(f"session {self.session_id} expired on {self.url}")
+
+    async def _forward(self, message: dict[str, Any]) -> None:
+        try:
+            parsed = types.JSONRPCMessage.model_validate(message)
+        except Exception as exc:
+            logger.warning("invalid message from {}: {}", self.url, exc)
+            await self._read_stream_writer.send(exc)
+            return
+        await self._read_stream_writer.send(parsed)
+
+    async def _forward_bytes(self, data: bytes) -> None:
+        try:
+            message = fastjson.loads(data)
+        except ValueError as exc:
+            logger.warning("invalid JSON from {}: {}", self.url, exc)
+            await self._read_stream_writer.send(exc)
+            return
+        for item in message if isinstance(message, list) else [message]:
+            await self._forward(item)
+
+    async def _forward_response(
+        self, message: dict[str, Any], request_id: types.RequestId
+    ) -> None:
+        if message.get("id") != request_id:
+            # lenient servers answer with a different or no id on the request's own stream
+            logger.debug(
+                "{} answered request {} with id {}", self.url, request_id, message.get("id")
+            )
+            message = {**message, "id": request_id}
+        await self._forward(message)
+
+    async def _forward_error(self, request_id: types.RequestId, exc: Exception) -> None:
+        await self._read_stream_writer.send(
+            types.JSONRPCMessage(
+                types.JSONRPCError(
+                    jsonrpc="2.0",
+                    id=request_id,
+                    error=types.ErrorData(
+                        code=types.INTERNAL_ERROR,
+                        message=f"{type(exc).__name__}: {exc}",
+                    ),
+                )
+            )
+        )
+
+    async def terminate(self) -> None:
+        """ends the session on the server, servers that do not allow it answer 405"""
+        if not self.session_id:
+            return
+        try:
+            await self.http_client.delete(
+                self.url, headers=self._headers("application/json")
+            )
+        except httpx.HTTPError as exc:
+            logger.debug("failed to terminate session on {}: {}", self.url, exc)
+
+
+@asynccontextmanager
+async def streamable_http_client(
+    http_client: httpx.AsyncClient,
+    url: str,
+    max_response_bytes: int,
+    metrics: RequestMetrics | None = None,
+):
+    """Client transport for Streamable HTTP, yields (read_stream, write_stream)"""
+    read_stream_writer, read_stream = anyio.create_memory_object_stream[
+        types.JSONRPCMessage | Exception
+    ](0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream[
+        types.JSONRPCMessage
+    ](0)
+
+    transport = StreamableHttpTransport(
+        http_client, url, read_stream_writer, max_response_bytes, metrics
+    )
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(transport.post_writer, write_stream_reader, tg)
+        try:
+            yield read_stream, write_stream
+        finally:
+            tg.cancel_scope.cancel()
+            with anyio.CancelScope(shield=True):
+                await transport.terminate()
+            await read_stream_writer.aclose()
+            await write_stream.aclose()
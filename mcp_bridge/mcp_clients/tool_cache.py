@@ -0,0 +1,79 @@
+"""Tool lists of MCP servers persisted across restarts
+
+lazy servers are only started when they are used, until then their tools are
+listed from this cache. an entry is only used while the server config it was
+recorded with is unchanged.
+"""
+
+import asyncio
+import hashlib
+import os
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from mcp.types import Tool
+
+from mcp_bridge import fastjson
+
+# options that decide how a server is run, not which tools it offers
+RUNTIME_OPTIONS = {"lazy", "idle_timeout", "pool_size", "autoscale"}
+
+
+def config_fingerprint(server_config: Any) -> str:
+    dumped = server_config.model_dump_json(exclude=RUNTIME_OPTIONS)
+    return hashlib.sha256(dumped.encode()).hexdigest()
+
+
+class ToolCache:
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._entries: dict[str, Any] | None = None
+        self._write_lock = asyncio.Lock()
+
+    def _load(self) -> dict[str, Any]:
+        if self._entries is None:
+            try:
+                entries = fastjson.loads(self.path.read_bytes())
+            except FileNotFoundError:
+                entries = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"ignoring unreadable tool cache {self.path}: {e}")
+                entries = {}
+            self._entries = entries if isinstance(entries, dict) else {}
+        return self._entries
+
+    def get(self, server: str, fingerprint: str) -> list[Tool] | None:
+        """cached tools of the server, None without an entry for its current config"""
+        entry = self._load().get(server)
+        if not isinstance(entry, dict) or entry.get("fingerprint") != fingerprint:
+            return None
+        try:
+            return [Tool.model_validate(tool) for tool in entry["tools"]]
+        except Exception as e:
+            logger.warning(f"ignoring invalid cached tools of {server}: {e}")
+            return None
+
+    async def put(self, server: str, fingerprint: str, tools: list[Tool]) -> None:
+        entry = {
+            "fingerprint": fingerprint,
+            "tools": [tool.model_dump(mode="json", exclude_none=True) for tool in tools],
+        }
+        entries = self._load()
+        if entries.get(server) == entry:
+            return
+
+        entries[server] = entry
+        data = fastjson.dumps(entries)
+        async with self._write_lock:
+            try:
+                await asyncio.to_thread(self._write, data)
+            except OSError as e:
+                logger.warning(f"failed to write tool cache {self.path}: {e}")
+
+    def _write(self, data: bytes) -> None:
+        # written next to the cache and renamed, so readers never see a partial file
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(f"{self.path.name}.tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, self.path)
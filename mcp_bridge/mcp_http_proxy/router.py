@@ -7,6 +7,7 @@
 from fastapi import APIRouter, Request
 from loguru import logger
 from mcp import types
+from mcp_bridge import fastjson
 from mcp_bridge.gateway import ToolRegistry
 from mcp_bridge.mcp_clients.McpClientManager import ClientManager
 from mcp_bridge.mcp_http_proxy.models import (
@@ -15,7 +16,11 @@ from mcp_bridge.mcp_http_proxy.models import (
     JSONRPCResponse,
 )
 
-router = APIRouter(prefix="/v1/mcp", tags=["MCP HTTP Proxy"])
+router = APIRouter(
+    prefix="/v1/mcp",
+    tags=["MCP HTTP Proxy"],
+    default_response_class=fastjson.FastJSONResponse,
+)
 
 
 class JSONRPCMethodNotFoundError(Exception):
@@ -53,7 +58,7 @@ async def handle_mcp_jsonrpc(request: Request) -> JSONRPCResponse:
     """
     try:
         # 解析请求体
-        request_data = await request.json()
+        request_data = fastjson.loads(await request.body())
 
         # 验证JSON-RPC 2.0基本格式
         if not isinstance(request_data, dict):
@@ -179,7 +184,7 @@ async def _handle_tools_call(params: dict | None):
     tool_name = params["name"]
     arguments = params.get("arguments", {})
 
-    logger.info(f"🔧 调用工具: {tool_name} 参数: {arguments}")
+    logger.info("🔧 调用工具: {} 参数: {}", tool_name, arguments)
 
     result = await ToolRegistry.call_exposed_tool(ClientManager, tool_name, arguments)
     return serialize_call_tool_result(result)
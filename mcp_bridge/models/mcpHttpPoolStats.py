@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+
+
+class McpHttpPoolStats(BaseModel):
+    name: str = Field(..., description="Name of the MCP server")
+    started: bool = Field(..., description="Whether the server's HTTP client is running")
+    http2: bool = Field(..., description="Whether HTTP/2 is negotiated by the pool")
+    max_connections: int = Field(..., description="Configured connection limit")
+    max_keepalive_connections: int = Field(
+        ..., description="Configured keep-alive connection limit"
+    )
+    requests: int = Field(..., description="Requests sent through the pool")
+    in_flight: int = Field(..., description="Requests currently waiting for a response")
+    peak_in_flight: int = Field(
+        ..., description="Highest number of concurrent requests seen"
+    )
+    connections_opened: int = Field(
+        ..., description="New TCP connections opened by the pool"
+    )
+    reused_requests: int = Field(
+        ..., description="Requests served over an existing connection"
+    )
+    reuse_rate: float = Field(
+        ..., description="Fraction of requests that reused a pooled connection"
+    )
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -5,3 +7,28 @@ class McpServerStatus(BaseModel):
     name: str = Field(..., description="Name of the MCP server")
     online: bool = Field(..., description="Whether the server is online")
     enabled: bool = Field(True, description="Whether the server is enabled")
+    lazy: bool = Field(False, description="Whether the server is only started on demand")
+    running: bool = Field(
+        True, description="Whether the server is running, lazy servers stop when idle"
+    )
+    circuit_state: Literal["closed", "open", "half_open"] = Field(
+        "closed", description="Circuit breaker state, requests fail fast while open"
+    )
+    consecutive_failures: int = Field(
+        0, description="Connection attempts that failed in a row"
+    )
+    next_retry_in: float | None = Field(
+        None, description="Seconds until the next connection attempt while disconnected"
+    )
+    sessions: int = Field(1, description="Sessions opened to the server")
+    sessions_online: int = Field(0, description="Sessions that are connected")
+    outstanding_requests: int | None = Field(
+        None, description="Requests in flight, reported for session pools"
+    )
+    waiting_requests: int | None = Field(
+        None, description="Requests waiting for a free session, reported for session pools"
+    )
+    wait_p95: float | None = Field(
+        None,
+        description="95th percentile of the seconds recent requests waited for a session",
+    )
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+
+
+class McpStartupStatus(BaseModel):
+    ready: bool = Field(
+        ..., description="Whether the startup quorum of MCP servers has connected"
+    )
+    connected: int = Field(..., description="MCP servers with an active session")
+    required: int = Field(
+        ..., description="Connected MCP servers required for the bridge to be ready"
+    )
+    configured: int = Field(..., description="MCP servers in the configuration")
+    failed: list[str] = Field(
+        default_factory=list, description="MCP servers whose client could not be created"
+    )
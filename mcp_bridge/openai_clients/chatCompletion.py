@@ -5,10 +5,16 @@ from lmos_openai_types import (
     ChatCompletionRequestMessage,
 )
 
-from .utils import call_tool, chat_completion_add_tools, is_mcp_bridge_tool
+from .utils import (
+    call_tools,
+    chat_completion_add_tools,
+    is_mcp_bridge_tool,
+    tool_result_message,
+)
 from .genericHttpxClient import get_client
+from mcp_bridge.log_utils import debug_enabled
+from .requestBody import chat_completion_request_body
 from loguru import logger
-import json
 
 
 async def chat_completions(
@@ -18,20 +24,14 @@ async def chat_completions(
     """performs a chat completion using the inference server"""
 
     request = await chat_completion_add_tools(request)
+    body = await chat_completion_request_body(request, http_request)
+    debug = debug_enabled()
 
     while True:
         # logger.debug(request.model_dump_json())
         async with get_client(http_request) as client:
             text = (
-                await client.post(
-                    "/chat/completions",
-                    # content=request.model_dump_json(
-                    #    exclude_defaults=True, exclude_none=True, exclude_unset=True
-                    # ),
-                    json=request.model_dump(
-                        exclude_defaults=True, exclude_none=True, exclude_unset=True
-                    ),
-                )
+                await client.post("/chat/completions", content=body.encode())
             ).text
         logger.debug(text)
         try:
@@ -47,9 +47,9 @@ async def chat_completions(
             content=msg.content,
             tool_calls=msg.tool_calls,
         )  # type: ignore
-        request.messages.append(msg)
+        body.append(msg)
 
-        logger.debug(f"finish reason: {response.choices[0].finish_reason}")
+        logger.debug("finish reason: {}", response.choices[0].finish_reason)
         if response.choices[0].finish_reason.value in ["stop", "length"]:
             logger.debug("no tool calls found")
             return response
@@ -62,39 +62,32 @@ async def chat_completions(
             logger.debug("returning external tool calls without local execution")
             return response
 
-        for tool_call in response.choices[0].message.tool_calls.root:
+        tool_calls = response.choices[0].message.tool_calls.root
+        for tool_call in tool_calls:
             logger.debug(
-                f"tool call: {tool_call.function.name} arguments: {json.loads(tool_call.function.arguments)}"
+                "tool call: {} arguments: {}",
+                tool_call.function.name,
+                tool_call.function.arguments,
             )
-            # FIXME: this can probably be done in parallel using asyncio gather
-            tool_call_result = await call_tool(
-                tool_call.function.name, tool_call.function.arguments
-            )
-            if tool_call_result is None:
-                continue
 
-            logger.debug(
-                f"tool call result for {tool_call.function.name}: {tool_call_result.model_dump()}"
-            )
+        tool_call_results = await call_tools(
+            [
+                (tool_call.function.name, tool_call.function.arguments)
+                for tool_call in tool_calls
+            ]
+        )
 
-            logger.debug(f"tool call result content: {tool_call_result.content}")
+        for tool_call, tool_call_result in zip(tool_calls, tool_call_results):
+            if tool_call_result is None:
+                continue
 
-            tools_content = [
-                {"type": "text", "text": part.text}
-                for part in filter(lambda x: x.type == "text", tool_call_result.content)
-            ]
-            if len(tools_content) == 0:
-                tools_content = [
-                    {"type": "text", "text": "the tool call result is empty"}
-                ]
-            request.messages.append(
-                ChatCompletionRequestMessage.model_validate(
-                    {
-                        "role": "tool",
-                        "content": tools_content,
-                        "tool_call_id": tool_call.id,
-                    }
+            if debug:
+                logger.debug(
+                    "tool call result for {}: {}",
+                    tool_call.function.name,
+                    tool_call_result.model_dump(),
                 )
-            )
 
-            logger.debug("sending next iteration of chat completion request")
+            body.append(tool_result_message(tool_call.id, tool_call_result))
+
+        logger.debug("sending next iteration of chat completion request")
@@ -1,42 +1,146 @@
-from httpx import AsyncClient
+from typing import Any
+from httpx import AsyncClient, Limits, Response
 from mcp_bridge.config import config
+from mcp_bridge.models.inferencePoolStats import InferencePoolStats
 from fastapi import Request
 from contextlib import asynccontextmanager
+from loguru import logger
+
+OPENWEBUI_HEADERS = (
+    "x-openwebui-user-name",
+    "x-openwebui-user-id",
+    "x-openwebui-user-email",
+    "x-openwebui-user-role",
+)
+
+
+class InferenceClientPool:
+    """Owns the app-lifetime client shared by all inference server requests"""
+
+    def __init__(self) -> None:
+        self._client: AsyncClient | None = None
+        self.http2 = False
+        self.requests = 0
+        self.connections_opened = 0
+
+    @property
+    def client(self) -> AsyncClient:
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    async def start(self) -> None:
+        """Creates the shared client, called from the fastapi lifespan"""
+        _ = self.client
+        logger.debug(f"inference client pool started (http2={self.http2})")
+
+    async def aclose(self) -> None:
+        """Closes the shared client and every pooled connection"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _create_client(self) -> AsyncClient:
+        pool_config = config.inference_server.pool
+        client_kwargs: dict[str, Any] = dict(
+            base_url=config.inference_server.base_url,
+            headers={
+                "Authorization": f"Bearer {config.inference_server.api_key}",
+                "Content-Type": "application/json",
+            },
+            timeout=config.inference_server.timeout,
+            limits=Limits(
+                max_connections=pool_config.max_connections,
+                max_keepalive_connections=pool_config.max_keepalive_connections,
+                keepalive_expiry=pool_config.keepalive_expiry,
+            ),
+            trust_env=True,  # Enable proxy support from environment variables
+        )
+
+        if pool_config.http2:
+            try:
+                client = AsyncClient(http2=True, **client_kwargs)
+                self.http2 = True
+                return client
+            except ImportError:
+                logger.warning(
+                    "http2 is enabled for the inference server but the h2 package "
+                    "is not installed, falling back to HTTP/1.1"
+                )
+
+        self.http2 = False
+        return AsyncClient(**client_kwargs)
+
+    async def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+
+    def stats(self) -> InferencePoolStats:
+        pool_config = config.inference_server.pool
+        reused = max(self.requests - self.connections_opened, 0)
+        return InferencePoolStats(
+            started=self._client is not None,
+            http2=self.http2,
+            max_connections=pool_config.max_connections,
+            max_keepalive_connections=pool_config.max_keepalive_connections,
+            requests=self.requests,
+            connections_opened=self.connections_opened,
+            reused_requests=reused,
+            reuse_rate=reused / self.requests if self.requests else 0.0,
+        )
+
+
+class InferenceClient:
+    """Request scoped view of the shared client that overlays caller headers"""
+
+    def __init__(self, pool: InferenceClientPool, headers: dict[str, str]) -> None:
+        self._pool = pool
+        self.headers = headers
+
+    def _request_kwargs(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        self._pool.requests += 1
+        headers = {**self.headers, **(kwargs.pop("headers", None) or {})}
+        extensions = dict(kwargs.pop("extensions", None) or {})
+        extensions.setdefault("trace", self._pool._trace)
+        return {**kwargs, "headers": headers, "extensions": extensions}
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> Response:
+        return await self._pool.client.request(
+            method, url, **self._request_kwargs(kwargs)
+        )
+
+    async def get(self, url: str, **kwargs: Any) -> Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> Response:
+        return await self.request("POST", url, **kwargs)
+
+    def stream(self, method: str, url: str, **kwargs: Any):
+        return self._pool.client.stream(method, url, **self._request_kwargs(kwargs))
+
+
+InferencePool = InferenceClientPool()
+
+
+def request_headers(request: Request | None) -> dict[str, str]:
+    """Returns the open-webui user headers that should be forwarded upstream"""
+    if request is None:
+        return {}
+
+    headers = {k.lower(): v for k, v in request.headers.items()}
+    return {header: headers[header] for header in OPENWEBUI_HEADERS if header in headers}
+
+
+async def create_client(request: Request | None = None) -> InferenceClient:
+    """Creates a request scoped client backed by the shared connection pool"""
+    return InferenceClient(InferencePool, request_headers(request))
 
-async def create_client(request: Request = None):
-    """Creates a new client instance with the appropriate headers"""
-    client = AsyncClient(
-        base_url=config.inference_server.base_url,
-        headers={
-            "Authorization": f"Bearer {config.inference_server.api_key}",
-            "Content-Type": "application/json"
-        },
-        timeout=10000,
-        trust_env=True,  # Enable proxy support from environment variables
-    )
-    
-    if request:
-        # Dodaj nagłówki z żądania
-        headers = {k.lower(): v for k, v in request.headers.items()}
-        
-        openwebui_headers = [
-            "x-openwebui-user-name",
-            "x-openwebui-user-id",
-            "x-openwebui-user-email",
-            "x-openwebui-user-role"
-        ]
-        
-        for header in openwebui_headers:
-            if header in headers:
-                client.headers[header] = headers[header]
-    
-    return client
 
 @asynccontextmanager
-async def get_client(request: Request = None):
-    """Context manager for HTTP client"""
-    client = await create_client(request)
-    try:
-        yield client
-    finally:
-        await client.aclose()
+async def get_client(request: Request | None = None):
+    """Context manager for HTTP client
+
+    the underlying connection pool is owned by the lifespan, so leaving the
+    context does not close any connections
+    """
+    yield await create_client(request)
@@ -0,0 +1,99 @@
+from typing import Any
+
+from fastapi import Request
+from lmos_openai_types import ChatCompletionRequestMessage, CreateChatCompletionRequest
+
+from mcp_bridge import fastjson
+
+DUMP_OPTIONS: dict[str, Any] = dict(
+    exclude_defaults=True, exclude_none=True, exclude_unset=True
+)
+
+
+class ChatCompletionRequestBody:
+    """Chat completion request JSON assembled from pre-serialized parts
+
+    the request fields, the existing messages and the tool definitions are
+    serialized once, later tool loop iterations only serialize the messages
+    they append
+    """
+
+    def __init__(
+        self,
+        request: CreateChatCompletionRequest,
+        fields: dict[str, Any],
+        messages: list[str],
+        tools: list[str],
+    ) -> None:
+        self._request = request
+        self._head = fastjson.dumps_str(fields)[1:-1]
+        self._messages = messages
+        self._tools = ",".join(tools)
+
+    def append(self, message: ChatCompletionRequestMessage) -> None:
+        """appends a message to the request and to the serialized body"""
+        self._request.messages.append(message)
+        self._messages.append(message.model_dump_json(**DUMP_OPTIONS))
+
+    def encode(self) -> bytes:
+        parts = [self._head] if self._head else []
+        parts.append(f'"messages":[{",".join(self._messages)}]')
+        if self._tools:
+            parts.append(f'"tools":[{self._tools}]')
+        return f"{{{','.join(parts)}}}".encode()
+
+
+async def chat_completion_request_body(
+    request: CreateChatCompletionRequest,
+    http_request: Request | None = None,
+    **overrides: Any,
+) -> ChatCompletionRequestBody:
+    """builds the upstream body for a request that went through chat_completion_add_tools
+
+    the client's original body is reused when available, so its messages and
+    tools are forwarded as received instead of being dumped from the model
+    """
+    bridge_tools: list[str] = getattr(request, "_mcp_bridge_tools_json", [])
+    client_tool_count = len(request.tools or []) - len(bridge_tools)
+
+    raw_body = await _raw_body(http_request)
+    if raw_body is not None:
+        fields = dict(raw_body)
+        messages = [
+            fastjson.dumps_str(message) for message in fields.pop("messages", [])
+        ]
+        client_tools = [
+            fastjson.dumps_str(tool) for tool in fields.pop("tools", None) or []
+        ]
+    else:
+        fields = request.model_dump(**DUMP_OPTIONS, exclude={"messages", "tools"})
+        fields.pop("messages", None)
+        fields.pop("tools", None)
+        messages = [message.model_dump_json(**DUMP_OPTIONS) for message in request.messages]
+        client_tools = [
+            tool.model_dump_json(**DUMP_OPTIONS)
+            for tool in (request.tools or [])[:client_tool_count]
+        ]
+
+    if len(client_tools) != client_tool_count:
+        # the model no longer matches the original body, dump the client tools again
+        client_tools = [
+            tool.model_dump_json(**DUMP_OPTIONS)
+            for tool in (request.tools or [])[:client_tool_count]
+        ]
+
+    fields.update(overrides)
+    return ChatCompletionRequestBody(
+        request, fields, messages, [*client_tools, *bridge_tools]
+    )
+
+
+async def _raw_body(http_request: Request | None) -> dict[str, Any] | None:
+    if not isinstance(http_request, Request):
+        return None
+    try:
+        # starlette caches the body that fastapi already read to build the request model
+        body = fastjson.loads(await http_request.body())
+    except Exception:
+        return None
+    return body if isinstance(body, dict) else None
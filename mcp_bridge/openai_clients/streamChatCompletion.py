@@ -1,16 +1,21 @@
-import json
 from typing import Optional
 from fastapi import HTTPException, Request
 from lmos_openai_types import (
     ChatCompletionMessageToolCall,
     ChatCompletionRequestMessage,
     CreateChatCompletionRequest,
-    CreateChatCompletionStreamResponse,
     Function1,
 )
-from .utils import call_tool, chat_completion_add_tools, is_mcp_bridge_tool
-from mcp_bridge.models import SSEData
+from .utils import (
+    call_tools,
+    chat_completion_add_tools,
+    is_mcp_bridge_tool,
+    tool_result_message,
+)
+from mcp_bridge import fastjson
+from mcp_bridge.log_utils import debug_enabled
 from .genericHttpxClient import get_client
+from .requestBody import chat_completion_request_body
 from loguru import logger
 from httpx_sse import aconnect_sse
 
@@ -39,28 +44,21 @@ async def chat_completions(request: CreateChatCompletionRequest, http_request: R
     request.stream = True
 
     request = await chat_completion_add_tools(request)
+    body = await chat_completion_request_body(request, http_request, stream=True)
+    debug = debug_enabled()
 
     fully_done = False
     while not fully_done:
-        # json_data = request.model_dump_json(
-        #     exclude_defaults=True, exclude_none=True, exclude_unset=True
-        # )
-
-        json_data = json.dumps(
-            request.model_dump(
-                exclude_defaults=True, exclude_none=True, exclude_unset=True
-            )
-        )
+        json_data = body.encode()
 
         # logger.debug(json_data)
 
-        last: Optional[CreateChatCompletionStreamResponse] = None  # last message
+        # finish reason of the last chunk that had one
+        finish_reason: Optional[str] = None
 
-        tool_call_name: str = ""
-        tool_call_json: str = ""
+        tool_calls: dict[int, dict[str, str]] = {}
         should_forward: bool = True
         response_content: str = ""
-        tool_call_id: str = ""
         buffered_tool_events: list[str] = []
 
         async with get_client(http_request) as client:
@@ -75,7 +73,7 @@ async def chat_completions(request: CreateChatCompletionRequest, http_request: R
                         logger.error(f"Unexpected Content-Type: {content_type}")
                         error_data = await event_source.response.aread()
                         logger.error(f"Request URL: {event_source.response.url}")
-                        logger.error(f"Request Data: {json_data}")
+                        logger.error(f"Request Data: {json_data.decode()}")
                         logger.error(
                             f"Response Status: {event_source.response.status_code}"
                         )
@@ -88,120 +86,79 @@ async def chat_completions(request: CreateChatCompletionRequest, http_request: R
 
                 # iterate over the SSE stream
                 async for sse in event_source.aiter_sse():
-                    event = sse.event
                     data = sse.data
-                    id = sse.id
-                    retry = sse.retry
 
-                    logger.debug(
-                        f"event: {event},\ndata: {data},\nid: {id},\nretry: {retry}"
-                    )
+                    if debug:
+                        logger.debug(
+                            "event: {},\ndata: {},\nid: {},\nretry: {}",
+                            sse.event,
+                            data,
+                            sse.id,
+                            sse.retry,
+                        )
 
                     # handle if the SSE stream is done
                     if data == "[DONE]":
                         logger.debug("inference serverstream done")
                         break
 
-                    # for some reason openrouter uses uppercase for finish_reason
-                    try:
-                        data["choices"][0]["finish_reason"] = data["choices"][0][
-                            "finish_reason"
-                        ].lower()  # type: ignore
-                    except Exception as e:
-                        logger.debug(f"failed to lowercase finish_reason: {e}")
-
+                    # a single plain parse, the chunk itself is forwarded unchanged
                     try:
-                        parsed_data = (
-                            CreateChatCompletionStreamResponse.model_validate_json(data)
-                        )
+                        chunk = fastjson.loads(data)
                     except Exception as e:
                         logger.debug(data)
                         raise e
 
-                    # add the delta to the response content
-                    content = (
-                        parsed_data.choices[0].delta.content
-                        if len(parsed_data.choices) > 0
-                        else ""
-                    )
-                    content = content if content is not None else ""
-                    response_content += content
-
-                    # handle stop reasons
-                    if (
-                        len(parsed_data.choices) > 0
-                        and parsed_data.choices[0].finish_reason is not None
-                    ):
-                        if parsed_data.choices[0].finish_reason.value in [
-                            "stop",
-                            "length",
-                        ]:
-                            fully_done = True
-                        else:
+                    choices = chunk.get("choices") or []
+                    if choices:
+                        choice = choices[0]
+                        delta = choice.get("delta") or {}
+                        response_content += delta.get("content") or ""
+
+                        # for some reason openrouter uses uppercase for finish_reason
+                        if choice.get("finish_reason") is not None:
+                            finish_reason = str(choice["finish_reason"]).lower()
+                            if finish_reason in ("stop", "length"):
+                                fully_done = True
+                            else:
+                                should_forward = False
+
+                        # tool calls are streamed as fragments keyed by their index
+                        if delta.get("tool_calls") is not None:
                             should_forward = False
-
-                    # this manages the incoming tool call schema
-                    # most of this is assertions to please mypy
-                    if (
-                        len(parsed_data.choices) > 0
-                        and parsed_data.choices[0].delta.tool_calls is not None
-                    ):
-                        should_forward = False
-                        assert (
-                            parsed_data.choices[0].delta.tool_calls[0].function
-                            is not None
-                        )
-
-                        name = parsed_data.choices[0].delta.tool_calls[0].function.name
-                        name = name if name is not None else ""
-                        tool_call_name = (
-                            name if tool_call_name == "" else tool_call_name
-                        )
-
-                        call_id = parsed_data.choices[0].delta.tool_calls[0].id
-                        call_id = call_id if call_id is not None else ""
-                        tool_call_id = call_id if tool_call_id == "" else tool_call_id
-
-                        arg = (
-                            parsed_data.choices[0]
-                            .delta.tool_calls[0]
-                            .function.arguments
-                        )
-                        tool_call_json += arg if arg is not None else ""
+                            for tool_call_chunk in delta["tool_calls"]:
+                                function = tool_call_chunk.get("function") or {}
+                                tool_call = tool_calls.setdefault(
+                                    tool_call_chunk.get("index", 0),
+                                    {"id": "", "name": "", "arguments": ""},
+                                )
+                                if tool_call_chunk.get("id") and not tool_call["id"]:
+                                    tool_call["id"] = tool_call_chunk["id"]
+                                if function.get("name") and not tool_call["name"]:
+                                    tool_call["name"] = function["name"]
+                                if function.get("arguments") is not None:
+                                    tool_call["arguments"] += function["arguments"]
 
                     # forward SSE messages to the client
-                    logger.debug(f"{should_forward=}")
                     if should_forward:
-                        logger.debug("forwarding message")
-                        yield SSEData.model_validate_json(sse.data).model_dump_json()
+                        yield data
                     else:
-                        buffered_tool_events.append(sse.data)
-
-                    # save the last message
-                    last = parsed_data
+                        buffered_tool_events.append(data)
 
-        # ideally we should check this properly
-        assert last is not None
-        if len(last.choices) > 0:
-            assert last.choices[0].finish_reason is not None
-
-        if len(last.choices) > 0 and last.choices[0].finish_reason.value in [
-            "stop",
-            "length",
-        ]:
+        if finish_reason in ("stop", "length"):
             logger.debug("no tool calls found")
             fully_done = True
             continue
 
+        ordered_tool_calls = [tool_calls[index] for index in sorted(tool_calls)]
         logger.debug("tool calls found")
-        logger.debug(
-            f"{tool_call_name=} {tool_call_json=}"
-        )  # this should not be error but its easier to debug
-
-        if not is_mcp_bridge_tool(request, tool_call_name):
-            logger.debug(
-                f"forwarding external tool call without local execution: {tool_call_name}"
-            )
+        logger.debug("ordered_tool_calls={}", ordered_tool_calls)
+
+        if not ordered_tool_calls or any(
+            not is_mcp_bridge_tool(request, tool_call["name"])
+            for tool_call in ordered_tool_calls
+        ):
+            logger.debug("forwarding external tool calls without local execution")
             for event_data in buffered_tool_events:
                 yield event_data
             yield ServerSentEvent(event="message", data="[DONE]", id=None, retry=None)
@@ -213,41 +170,36 @@ async def chat_completions(request: CreateChatCompletionRequest, http_request: R
             content=response_content,
             tool_calls=[
                 ChatCompletionMessageToolCall(
-                    id=tool_call_id,
+                    id=tool_call["id"],
                     type="function",
-                    function=Function1(name=tool_call_name, arguments=tool_call_json),
+                    function=Function1(
+                        name=tool_call["name"], arguments=tool_call["arguments"]
+                    ),
                 )
+                for tool_call in ordered_tool_calls
             ],
         )  # type: ignore
-        request.messages.append(msg)
+        body.append(msg)
 
-        #### MOST OF THIS IS COPY PASTED FROM CHAT_COMPLETIONS
-        # FIXME: this can probably be done in parallel using asyncio gather
-        tool_call_result = await call_tool(tool_call_name, tool_call_json)
-        if tool_call_result is None:
-            continue
-
-        logger.debug(
-            f"tool call result for {tool_call_name}: {tool_call_result.model_dump()}"
+        tool_call_results = await call_tools(
+            [
+                (tool_call["name"], tool_call["arguments"])
+                for tool_call in ordered_tool_calls
+            ]
         )
 
-        logger.debug(f"tool call result content: {tool_call_result.content}")
-
-        tools_content = [
-            {"type": "text", "text": part.text}
-            for part in filter(lambda x: x.type == "text", tool_call_result.content)
-        ]
-        if len(tools_content) == 0:
-            tools_content = [{"type": "text", "text": "the tool call result is empty"}]
-        request.messages.append(
-            ChatCompletionRequestMessage.model_validate(
-                {
-                    "role": "tool",
-                    "content": tools_content,
-                    "tool_call_id": tool_call_id,
-                }
-            )
-        )
+        for tool_call, tool_call_result in zip(ordered_tool_calls, tool_call_results):
+            if tool_call_result is None:
+                continue
+
+            if debug:
+                logger.debug(
+                    "tool call result for {}: {}",
+                    tool_call["name"],
+                    tool_call_result.model_dump(),
+                )
+
+            body.append(tool_result_message(tool_call["id"], tool_call_result))
 
         logger.debug("sending next iteration of chat completion request")
 
@@ -1,11 +1,16 @@
-from typing import Optional
+from typing import Any, Optional
 from loguru import logger
-from lmos_openai_types import CreateChatCompletionRequest
+from lmos_openai_types import ChatCompletionRequestMessage, CreateChatCompletionRequest
 import mcp.types
+import asyncio
 import json
 
+import mcp_bridge.config as bridge_config
+from mcp_bridge import fastjson
 from mcp_bridge.gateway import ToolRegistry
-from mcp_bridge.tool_mappers import mcp2openai
+from mcp_bridge.gateway.tool_registry import ToolListContext
+from mcp_bridge.log_utils import debug_enabled
+from mcp_bridge.tool_mappers import mcp2openai_payload
 
 
 def _get_client_manager():
@@ -19,27 +24,84 @@ async def chat_completion_add_tools(request: CreateChatCompletionRequest):
     if request.tools is None:
         request.tools = []
 
-    tools = await ToolRegistry.list_exposed_tools(ClientManager)
-    logger.info(f"🔧 Loaded {len(tools)} exposed gateway tools")
+    payload = await ToolRegistry.list_exposed_tool_payload(
+        ClientManager, tool_list_context(request), "openai", mcp2openai_payload
+    )
+    logger.info(f"🔧 Loaded {len(payload.tools)} exposed gateway tools")
     existing_names = {tool.function.name for tool in request.tools}
-    mcp_tool_names = set()
-    for tool in tools:
-        tool_obj = mcp2openai(tool)
-        if tool_obj.function.name in existing_names:
-            logger.warning(
-                f"Skipping duplicate OpenAI tool name: {tool_obj.function.name}"
-            )
-            continue
-        request.tools.append(tool_obj)
-        existing_names.add(tool_obj.function.name)
-        mcp_tool_names.add(tool_obj.function.name)
-        logger.debug(f"   - {tool_obj.function.name}: {tool_obj.function.description}")
+    if existing_names.isdisjoint(payload.names):
+        request.tools.extend(payload.tools)
+        mcp_tool_names = set(payload.names)
+        mcp_tools_json = payload.json
+    else:
+        mcp_tool_names = set()
+        mcp_tools_json = []
+        for tool_obj, tool_json in zip(payload.tools, payload.json):
+            if tool_obj.function.name in existing_names:
+                logger.warning(
+                    f"Skipping duplicate OpenAI tool name: {tool_obj.function.name}"
+                )
+                continue
+            request.tools.append(tool_obj)
+            existing_names.add(tool_obj.function.name)
+            mcp_tool_names.add(tool_obj.function.name)
+            mcp_tools_json.append(tool_json)
+    if debug_enabled():
+        logger.debug("   - gateway tools: {}", ", ".join(sorted(mcp_tool_names)))
 
     setattr(request, "_mcp_bridge_tool_names", mcp_tool_names)
+    # pre-serialized tool definitions reused by the request body builder
+    setattr(request, "_mcp_bridge_tools_json", mcp_tools_json)
     logger.info(f"✅ Total tools available: {len(request.tools)}")
     return request
 
 
+def tool_list_context(request: CreateChatCompletionRequest) -> ToolListContext | None:
+    """derives the dynamic tool filter query from the end of the conversation
+
+    the latest user messages are combined with the tools the model called in
+    those turns, so follow-up turns keep access to the tools they were using
+    """
+    filter_config = bridge_config.config.gateway.tools.dynamic_filter
+    if not filter_config.enabled:
+        return None
+
+    user_texts: list[str] = []
+    tool_names: list[str] = []
+    for message in reversed(getattr(request, "messages", None) or []):
+        message = getattr(message, "root", message)
+        role = getattr(message, "role", None)
+        role = getattr(role, "value", role)
+        if role == "user":
+            text = _content_text(getattr(message, "content", None))
+            if text:
+                user_texts.append(text)
+            if len(user_texts) >= filter_config.context_user_messages:
+                break
+        elif role == "assistant":
+            tool_calls = getattr(message, "tool_calls", None)
+            for tool_call in getattr(tool_calls, "root", tool_calls) or []:
+                name = tool_call.function.name
+                if name and name not in tool_names:
+                    tool_names.append(name)
+
+    # tool names first so truncation only ever cuts the oldest user text
+    query = " ".join([*tool_names, *user_texts])[: filter_config.context_max_chars]
+    if not query.strip():
+        return None
+    return ToolListContext(query=query)
+
+
+def _content_text(content: Any) -> str:
+    content = getattr(content, "root", content)
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        texts = (getattr(getattr(part, "root", part), "text", None) for part in content)
+        return " ".join(text for text in texts if isinstance(text, str))
+    return ""
+
+
 def is_mcp_bridge_tool(
     request: CreateChatCompletionRequest, tool_call_name: str
 ) -> bool:
@@ -60,7 +122,7 @@ async def call_tool(
         return None
 
     try:
-        tool_call_args = json.loads(tool_call_json)
+        tool_call_args = fastjson.loads(tool_call_json)
     except json.JSONDecodeError:
         logger.error(f"failed to decode json for {tool_call_name}")
         return None
@@ -71,3 +133,58 @@ async def call_tool(
         tool_call_args,
         timeout,
     )
+
+
+async def call_tools(
+    tool_calls: list[tuple[str, str]], timeout: Optional[int] = None
+) -> list[Optional[mcp.types.CallToolResult]]:
+    """calls tools concurrently, results are returned in the order of tool_calls
+
+    a failing call is turned into an error result so the other results are kept
+    """
+    semaphore = asyncio.Semaphore(
+        bridge_config.config.gateway.tool_calls.max_parallel_calls
+    )
+
+    async def run(
+        tool_call_name: str, tool_call_json: str
+    ) -> Optional[mcp.types.CallToolResult]:
+        async with semaphore:
+            try:
+                return await call_tool(tool_call_name, tool_call_json, timeout)
+            except Exception as e:
+                logger.error(f"tool call {tool_call_name} failed: {e}")
+                return mcp.types.CallToolResult(
+                    content=[
+                        mcp.types.TextContent(
+                            type="text", text=f"Error calling {tool_call_name}: {e}"
+                        )
+                    ],
+                    isError=True,
+                )
+
+    return list(
+        await asyncio.gather(
+            *(run(name, arguments) for name, arguments in tool_calls)
+        )
+    )
+
+
+def tool_result_message(
+    tool_call_id: str, tool_call_result: mcp.types.CallToolResult
+) -> ChatCompletionRequestMessage:
+    """builds the tool message that is sent back to the inference server"""
+    tools_content = [
+        {"type": "text", "text": part.text}
+        for part in filter(lambda x: x.type == "text", tool_call_result.content)
+    ]
+    if len(tools_content) == 0:
+        tools_content = [{"type": "text", "text": "the tool call result is empty"}]
+
+    return ChatCompletionRequestMessage.model_validate(
+        {
+            "role": "tool",
+            "content": tools_content,
+            "tool_call_id": tool_call_id,
+        }
+    )
@@ -1,3 +1,3 @@
-from .mcp2openaiConverters import mcp2openai
+from .mcp2openaiConverters import OpenAIToolPayload, mcp2openai, mcp2openai_payload
 
-__all__ = ["mcp2openai"]
+__all__ = ["OpenAIToolPayload", "mcp2openai", "mcp2openai_payload"]
@@ -1,7 +1,18 @@
+from dataclasses import dataclass
+
 from mcp import Tool
 from lmos_openai_types import ChatCompletionTool
 
 
+@dataclass(frozen=True)
+class OpenAIToolPayload:
+    """Converted tools with their request body JSON, shared between requests"""
+
+    tools: list[ChatCompletionTool]
+    names: frozenset[str]
+    json: list[str]
+
+
 def mcp2openai(mcp_tool: Tool) -> ChatCompletionTool:
     """Convert a MCP Tool to an OpenAI ChatCompletionTool."""
 
@@ -14,3 +25,19 @@ def mcp2openai(mcp_tool: Tool) -> ChatCompletionTool:
             "strict": False,
         },
     )
+
+
+def mcp2openai_payload(mcp_tools: list[Tool]) -> OpenAIToolPayload:
+    """Convert MCP Tools to OpenAI tools and serialize them once."""
+
+    tools = [mcp2openai(mcp_tool) for mcp_tool in mcp_tools]
+    return OpenAIToolPayload(
+        tools=tools,
+        names=frozenset(tool.function.name for tool in tools),
+        json=[
+            tool.model_dump_json(
+                exclude_defaults=True, exclude_none=True, exclude_unset=True
+            )
+            for tool in tools
+        ],
+    )
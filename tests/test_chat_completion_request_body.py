@@ -0,0 +1,95 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Request
+
+from mcp_bridge.openai_clients.requestBody import chat_completion_request_body
+
+pytestmark = pytest.mark.unit
+
+
+class FakeMessage:
+    dumps = 0
+
+    def __init__(self, role: str, content: str) -> None:
+        self.role = role
+        self.content = content
+
+    def model_dump_json(self, **_):
+        FakeMessage.dumps += 1
+        return json.dumps({"role": self.role, "content": self.content})
+
+
+def make_request(messages, tools=None, bridge_tools=None):
+    request = SimpleNamespace(
+        messages=messages,
+        tools=tools or [],
+        model_dump=lambda **_: {"model": "test-model", "messages": []},
+    )
+    setattr(request, "_mcp_bridge_tools_json", bridge_tools or [])
+    return request
+
+
+def make_http_request(body: dict) -> Request:
+    async def receive():
+        return {"type": "http.request", "body": json.dumps(body).encode()}
+
+    return Request({"type": "http", "method": "POST", "headers": []}, receive)
+
+
+@pytest.mark.asyncio
+async def test_request_body_only_serializes_appended_messages():
+    FakeMessage.dumps = 0
+    request = make_request(
+        [FakeMessage("user", "hi")],
+        tools=[SimpleNamespace(name="search_web")],
+        bridge_tools=['{"type":"function","function":{"name":"search_web"}}'],
+    )
+
+    body = await chat_completion_request_body(request, None, stream=True)
+    body.append(FakeMessage("assistant", "calling"))
+    body.append(FakeMessage("tool", "result"))
+
+    assert json.loads(body.encode()) == {
+        "model": "test-model",
+        "stream": True,
+        "messages": [
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": "calling"},
+            {"role": "tool", "content": "result"},
+        ],
+        "tools": [{"type": "function", "function": {"name": "search_web"}}],
+    }
+    assert FakeMessage.dumps == 3
+    assert [message.role for message in request.messages] == ["user", "assistant", "tool"]
+
+
+@pytest.mark.asyncio
+async def test_request_body_reuses_the_original_client_body():
+    client_tool = {"type": "function", "function": {"name": "client_tool"}}
+    http_request = make_http_request(
+        {
+            "model": "test-model",
+            "messages": [{"role": "user", "content": "hi", "name": "alice"}],
+            "tools": [client_tool],
+            "temperature": 1,
+        }
+    )
+    request = make_request(
+        [FakeMessage("user", "hi")],
+        tools=[SimpleNamespace(name="client_tool"), SimpleNamespace(name="mcp_tool")],
+        bridge_tools=['{"type":"function","function":{"name":"mcp_tool"}}'],
+    )
+
+    body = await chat_completion_request_body(request, http_request)
+
+    assert json.loads(body.encode()) == {
+        "model": "test-model",
+        "temperature": 1,
+        "messages": [{"role": "user", "content": "hi", "name": "alice"}],
+        "tools": [
+            client_tool,
+            {"type": "function", "function": {"name": "mcp_tool"}},
+        ],
+    }
@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+from mcp_bridge import fastjson
+
+pytestmark = pytest.mark.unit
+
+
+def test_dumps_is_compact_utf8_and_round_trips():
+    payload = {"tool": "查询", "args": {"limit": 10}}
+
+    encoded = fastjson.dumps(payload)
+
+    assert encoded == '{"tool":"查询","args":{"limit":10}}'.encode()
+    assert fastjson.loads(encoded) == payload
+    assert fastjson.dumps_str(payload) == encoded.decode()
+
+
+def test_dumps_falls_back_to_stdlib_for_unsupported_values():
+    assert fastjson.loads(fastjson.dumps({"big": 2**70})) == {"big": 2**70}
+
+
+def test_loads_raises_stdlib_decode_error():
+    with pytest.raises(json.JSONDecodeError):
+        fastjson.loads("{not json")
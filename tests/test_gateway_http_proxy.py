@@ -108,8 +108,9 @@ async def test_tools_list_returns_router_tools_in_router_mode(
 @pytest.mark.asyncio
 async def test_unknown_method_returns_jsonrpc_method_not_found():
     class FakeRequest:
-        async def json(self):
-            return {"jsonrpc": "2.0", "method": "invalid/method", "id": 7}
+        # the proxy parses the raw body itself
+        async def body(self):
+            return b'{"jsonrpc": "2.0", "method": "invalid/method", "id": 7}'
 
     response = await http_proxy_router.handle_mcp_jsonrpc(FakeRequest())
 
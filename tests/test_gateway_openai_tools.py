@@ -1,3 +1,4 @@
+import asyncio
 from types import SimpleNamespace
 
 import pytest
@@ -94,3 +95,99 @@ async def test_chat_completion_add_tools_injects_router_tools_in_router_mode():
         "mcp_bridge_search_tools",
         "mcp_bridge_call_tool",
     ]
+
+
+@pytest.mark.asyncio
+async def test_call_tools_runs_concurrently_and_keeps_order_on_partial_failure(
+    monkeypatch,
+):
+    bridge_config.config.gateway.tool_calls.max_parallel_calls = 2
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_call_tool(name: str, arguments: str, timeout=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01 if name != "first" else 0.03)
+        in_flight -= 1
+        if name == "broken":
+            raise RuntimeError("server unavailable")
+        return types.CallToolResult(
+            content=[types.TextContent(type="text", text=name)], isError=False
+        )
+
+    monkeypatch.setattr(utils, "call_tool", fake_call_tool)
+
+    results = await utils.call_tools(
+        [("first", "{}"), ("broken", "{}"), ("third", "{}")]
+    )
+
+    assert [result.content[0].text for result in results] == [
+        "first",
+        "Error calling broken: server unavailable",
+        "third",
+    ]
+    assert results[1].isError is True
+    assert max_in_flight == 2
+
+
+def make_message(role: str, content=None, tool_calls=None):
+    return SimpleNamespace(role=role, content=content, tool_calls=tool_calls)
+
+
+def make_tool_call(name: str):
+    return SimpleNamespace(function=SimpleNamespace(name=name, arguments="{}"))
+
+
+def test_tool_list_context_uses_latest_user_messages_and_called_tools():
+    bridge_config.config.gateway.tools.dynamic_filter.enabled = True
+    bridge_config.config.gateway.tools.dynamic_filter.context_user_messages = 1
+    request = SimpleNamespace(
+        messages=[
+            make_message("user", "list my files"),
+            make_message("user", [SimpleNamespace(type="text", text="weather in")]),
+            make_message("assistant", tool_calls=[make_tool_call("get_forecast")]),
+            make_message("tool", "sunny"),
+            make_message("user", "and tomorrow?"),
+        ]
+    )
+
+    assert utils.tool_list_context(request).query == "and tomorrow?"
+
+    bridge_config.config.gateway.tools.dynamic_filter.context_user_messages = 2
+    assert (
+        utils.tool_list_context(request).query
+        == "get_forecast and tomorrow? weather in"
+    )
+
+
+def test_tool_list_context_is_skipped_when_dynamic_filter_is_disabled():
+    request = SimpleNamespace(messages=[make_message("user", "weather")])
+
+    assert utils.tool_list_context(request) is None
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_add_tools_filters_by_conversation(
+    patch_gateway_dependencies,
+):
+    bridge_config.config.gateway.tools.dynamic_filter.enabled = True
+    bridge_config.config.gateway.tools.dynamic_filter.include_router_fallback = False
+    patch_gateway_dependencies.clients["files"] = FakeClient(
+        "files", [make_tool("read_file")]
+    )
+    request = SimpleNamespace(tools=[], messages=[make_message("user", "read a file")])
+
+    result = await utils.chat_completion_add_tools(request)
+
+    assert [tool.function.name for tool in result.tools] == ["read_file"]
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_add_tools_reuses_converted_tools_between_requests():
+    first = await utils.chat_completion_add_tools(SimpleNamespace(tools=[]))
+    second = await utils.chat_completion_add_tools(SimpleNamespace(tools=[]))
+
+    assert first.tools[0] is second.tools[0]
+    assert first.tools is not second.tools
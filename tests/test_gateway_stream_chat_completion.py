@@ -50,7 +50,9 @@ class FakeClientContext:
         return None
 
 
-def tool_chunk(name: str, arguments: str, finish_reason=None) -> str:
+def tool_chunk(
+    name: str, arguments: str, finish_reason=None, index: int = 0, call_id="call_1"
+) -> str:
     return json.dumps(
         {
             "id": "chatcmpl-1",
@@ -63,8 +65,8 @@ def tool_chunk(name: str, arguments: str, finish_reason=None) -> str:
                     "delta": {
                         "tool_calls": [
                             {
-                                "index": 0,
-                                "id": "call_1",
+                                "index": index,
+                                "id": call_id,
                                 "type": "function",
                                 "function": {"name": name, "arguments": arguments},
                             }
@@ -104,11 +106,14 @@ async def return_request(request):
     return request
 
 
-async def fake_call_tool(name: str, arguments: str):
-    return SimpleNamespace(
-        content=[SimpleNamespace(type="text", text="ok")],
-        model_dump=lambda: {},
-    )
+async def fake_call_tools(tool_calls: list[tuple[str, str]]):
+    return [
+        SimpleNamespace(
+            content=[SimpleNamespace(type="text", text=f"{name}:{arguments}")],
+            model_dump=lambda: {},
+        )
+        for name, arguments in tool_calls
+    ]
 
 
 @pytest.mark.asyncio
@@ -163,7 +168,7 @@ async def test_streaming_mcp_tool_call_preserves_tool_call_id(monkeypatch):
         "aconnect_sse",
         lambda client, method, path, content: FakeEventSource(events_by_call.pop(0)),
     )
-    monkeypatch.setattr(streamChatCompletion, "call_tool", fake_call_tool)
+    monkeypatch.setattr(streamChatCompletion, "call_tools", fake_call_tools)
     request = request_with_tool_names({"mcp_tool"})
 
     outputs = [
@@ -178,3 +183,102 @@ async def test_streaming_mcp_tool_call_preserves_tool_call_id(monkeypatch):
     assert assistant_message["tool_calls"][0]["id"] == "call_1"
     assert tool_message["tool_call_id"] == "call_1"
     assert outputs[-1].data == "[DONE]"
+
+
+@pytest.mark.asyncio
+async def test_streaming_parallel_tool_calls_are_tracked_by_index(monkeypatch):
+    events_by_call = [
+        [
+            tool_chunk("first_tool", "", index=0, call_id="call_a"),
+            tool_chunk("second_tool", '{"y":', index=1, call_id="call_b"),
+            tool_chunk("", '{"x":1}', index=0, call_id=None),
+            tool_chunk("", "2}", "tool_calls", index=1, call_id=None),
+            "[DONE]",
+        ],
+        [stop_chunk(), "[DONE]"],
+    ]
+    dispatched = []
+
+    async def record_call_tools(tool_calls):
+        dispatched.append(tool_calls)
+        return await fake_call_tools(tool_calls)
+
+    monkeypatch.setattr(
+        streamChatCompletion,
+        "chat_completion_add_tools",
+        return_request,
+    )
+    monkeypatch.setattr(
+        streamChatCompletion,
+        "get_client",
+        lambda http_request: FakeClientContext(),
+    )
+    monkeypatch.setattr(
+        streamChatCompletion,
+        "aconnect_sse",
+        lambda client, method, path, content: FakeEventSource(events_by_call.pop(0)),
+    )
+    monkeypatch.setattr(streamChatCompletion, "call_tools", record_call_tools)
+    request = request_with_tool_names({"first_tool", "second_tool"})
+
+    _ = [
+        item
+        async for item in streamChatCompletion.chat_completions(
+            request, SimpleNamespace()
+        )
+    ]
+
+    assert dispatched == [[("first_tool", '{"x":1}'), ("second_tool", '{"y":2}')]]
+    assistant_message = request.messages[0].model_dump(mode="json")
+    assert [call["id"] for call in assistant_message["tool_calls"]] == [
+        "call_a",
+        "call_b",
+    ]
+    tool_messages = [message.model_dump(mode="json") for message in request.messages[1:]]
+    assert [message["tool_call_id"] for message in tool_messages] == [
+        "call_a",
+        "call_b",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_streaming_forwards_content_chunks_unchanged(monkeypatch):
+    content_chunk = json.dumps(
+        {
+            "id": "chatcmpl-1",
+            "object": "chat.completion.chunk",
+            "created": 1,
+            "model": "test-model",
+            "system_fingerprint": "fp_1",
+            "choices": [
+                {"index": 0, "delta": {"content": "Hi"}, "finish_reason": None}
+            ],
+        }
+    )
+    final_chunk = stop_chunk().replace('"stop"', '"STOP"')
+    events = [content_chunk, final_chunk, "[DONE]"]
+    monkeypatch.setattr(
+        streamChatCompletion,
+        "chat_completion_add_tools",
+        return_request,
+    )
+    monkeypatch.setattr(
+        streamChatCompletion,
+        "get_client",
+        lambda http_request: FakeClientContext(),
+    )
+    monkeypatch.setattr(
+        streamChatCompletion,
+        "aconnect_sse",
+        lambda client, method, path, content: FakeEventSource(events),
+    )
+
+    outputs = [
+        item
+        async for item in streamChatCompletion.chat_completions(
+            request_with_tool_names(), SimpleNamespace()
+        )
+    ]
+
+    assert outputs[:2] == [content_chunk, final_chunk]
+    assert outputs[2].data == "[DONE]"
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import re
 from types import SimpleNamespace
@@ -6,8 +7,18 @@ import pytest
 from mcp import types
 
 import mcp_bridge.config as bridge_config
-from mcp_bridge.config.final import GatewayConfig, ToolExposureRule
-from mcp_bridge.gateway.tool_registry import GatewayToolRegistry
+from mcp_bridge.config.final import (
+    GatewayConfig,
+    ToolEmbeddingConfig,
+    ToolExposureRule,
+)
+from mcp_bridge.gateway.embeddings import (
+    HashingEmbeddingBackend,
+    ToolVectorIndex,
+    create_embedding_backend,
+)
+from mcp_bridge.gateway.search_index import tokenize
+from mcp_bridge.gateway.tool_registry import GatewayToolRegistry, ToolListContext
 
 pytestmark = pytest.mark.unit
 
@@ -290,3 +301,435 @@ async def test_router_inventory_only_lists_exposed_tools():
     payload = json.loads(result.content[0].text)
 
     assert payload == {"servers": {"filesystem": ["read_file"]}}
+
+
+@pytest.mark.asyncio
+async def test_per_server_limit_caps_in_flight_downstream_calls():
+    bridge_config.config.gateway.tool_calls.server_limits = {"slow": 2}
+    registry = GatewayToolRegistry()
+    in_flight = 0
+    max_in_flight = 0
+
+    class SlowClient(FakeClient):
+        async def call_tool(self, name, arguments, timeout=None):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return await super().call_tool(name, arguments, timeout)
+
+    client = SlowClient("slow", [make_tool("lookup")])
+    manager = FakeClientManager({"slow": client})
+
+    results = await asyncio.gather(
+        *(registry.call_exposed_tool(manager, "lookup", {"id": i}) for i in range(5))
+    )
+
+    assert all(result.isError is False for result in results)
+    assert len(client.calls) == 5
+    assert max_in_flight == 2
+
+
+class SlowListClient(FakeClient):
+    def __init__(self, name: str, tools: list[types.Tool], delay: float) -> None:
+        super().__init__(name, tools)
+        self.delay = delay
+
+    async def list_tools(self):
+        await asyncio.sleep(self.delay)
+        return await super().list_tools()
+
+
+class BarrierListClient(SlowListClient):
+    """lists its tools only once every client of the barrier is listing"""
+
+    def __init__(self, name, tools, delay, barrier: dict) -> None:
+        super().__init__(name, tools, delay)
+        self.barrier = barrier
+
+    async def list_tools(self):
+        barrier = self.barrier
+        barrier["in_flight"] += 1
+        barrier["peak"] = max(barrier["peak"], barrier["in_flight"])
+        if barrier["peak"] == barrier["parties"]:
+            barrier["all_listing"].set()
+        try:
+            await barrier["all_listing"].wait()
+            return await super().list_tools()
+        finally:
+            barrier["in_flight"] -= 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_lists_servers_concurrently_and_records_latency():
+    registry = GatewayToolRegistry()
+    barrier = {"parties": 2, "in_flight": 0, "peak": 0, "all_listing": asyncio.Event()}
+    manager = FakeClientManager(
+        {
+            "first": BarrierListClient("first", [make_tool("first_tool")], 0.05, barrier),
+            "second": BarrierListClient("second", [make_tool("second_tool")], 0.05, barrier),
+        }
+    )
+
+    # listing the servers one after another would never pass the barrier
+    async with asyncio.timeout(5):
+        snapshot = await registry.refresh(manager)
+
+    assert barrier["peak"] == 2
+    assert list(snapshot.tools_by_server) == ["first", "second"]
+    assert set(snapshot.refresh_latency) == {"first", "second"}
+    assert all(latency >= 0.05 for latency in snapshot.refresh_latency.values())
+
+
+@pytest.mark.asyncio
+async def test_refresh_keeps_previous_tools_when_server_times_out():
+    bridge_config.config.gateway.tools.refresh_timeout_seconds = 0.02
+    registry = GatewayToolRegistry()
+    slow_client = SlowListClient("slow", [make_tool("lookup")], 0)
+    manager = FakeClientManager({"slow": slow_client})
+    await registry.refresh(manager)
+
+    slow_client.delay = 1
+    snapshot = await registry.refresh(manager, force=True)
+
+    assert [ref.tool_name for ref in snapshot.tools_by_server["slow"]] == ["lookup"]
+    assert snapshot.stale_servers == {"slow"}
+    assert "lookup" in snapshot.tools_by_gateway_name
+
+
+class CountingClient(FakeClient):
+    def __init__(self, name: str, tools: list[types.Tool]) -> None:
+        super().__init__(name, tools)
+        self.list_calls = 0
+
+    async def list_tools(self):
+        self.list_calls += 1
+        await asyncio.sleep(0.01)
+        return await super().list_tools()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_are_coalesced_into_one_rebuild():
+    registry = GatewayToolRegistry()
+    client = CountingClient("search", [make_tool("search_web")])
+    manager = FakeClientManager({"search": client})
+
+    snapshots = await asyncio.gather(*(registry.refresh(manager) for _ in range(10)))
+
+    assert client.list_calls == 1
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate_serves_expired_snapshot_and_rebuilds():
+    tools_config = bridge_config.config.gateway.tools
+    tools_config.cache_ttl_seconds = 0
+    tools_config.stale_while_revalidate = True
+    registry = GatewayToolRegistry()
+    client = CountingClient("search", [make_tool("search_web")])
+    manager = FakeClientManager({"search": client})
+    first = await registry.refresh(manager)
+    first.created_at -= 1
+
+    stale = await registry.refresh(manager)
+    assert stale is first
+    assert client.list_calls == 1
+
+    await registry._refresh_task
+    assert client.list_calls == 2
+    assert registry._snapshot is not first
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate_blocks_past_max_staleness():
+    tools_config = bridge_config.config.gateway.tools
+    tools_config.cache_ttl_seconds = 0
+    tools_config.stale_while_revalidate = True
+    tools_config.max_stale_seconds = 5
+    registry = GatewayToolRegistry()
+    client = CountingClient("search", [make_tool("search_web")])
+    manager = FakeClientManager({"search": client})
+    first = await registry.refresh(manager)
+    first.created_at -= 10
+
+    snapshot = await registry.refresh(manager)
+
+    assert snapshot is not first
+    assert client.list_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_server_requeries_only_that_server():
+    bridge_config.config.gateway.tools.cache_ttl_seconds = 3600
+    registry = GatewayToolRegistry()
+    changed = CountingClient("changed", [make_tool("old_tool")])
+    untouched = CountingClient("untouched", [make_tool("other_tool")])
+    manager = FakeClientManager({"changed": changed, "untouched": untouched})
+    first = await registry.refresh(manager)
+
+    changed._tools = [make_tool("new_tool")]
+    registry.invalidate_server("changed")
+    snapshot = await registry.refresh(manager)
+
+    assert changed.list_calls == 2
+    assert untouched.list_calls == 1
+    assert set(snapshot.tools_by_gateway_name) == {"new_tool", "other_tool"}
+    assert snapshot.created_at == first.created_at
+    assert await registry.refresh(manager) is snapshot
+
+
+@pytest.mark.asyncio
+async def test_incremental_rebuild_rederives_only_changed_server_and_collisions(
+    monkeypatch,
+):
+    bridge_config.config.gateway.tools.cache_ttl_seconds = 3600
+    bridge_config.config.gateway.tools.collision_strategy = "namespace"
+    registry = GatewayToolRegistry()
+    changed = FakeClient("changed", [make_tool("read")])
+    untouched = FakeClient("untouched", [make_tool("lookup"), make_tool("write")])
+    manager = FakeClientManager({"changed": changed, "untouched": untouched})
+    first = await registry.refresh(manager)
+
+    evaluated: list[str] = []
+    original_matches = registry._matches_exposure_rules
+
+    def record_matches(server_name, tool_name, tools_config):
+        evaluated.append(server_name)
+        return original_matches(server_name, tool_name, tools_config)
+
+    monkeypatch.setattr(registry, "_matches_exposure_rules", record_matches)
+
+    changed._tools = [make_tool("read"), make_tool("lookup")]
+    registry.invalidate_server("changed")
+    snapshot = await registry.refresh(manager)
+
+    assert set(evaluated) == {"changed"}
+    assert snapshot.segments["untouched"] is not first.segments["untouched"]
+    assert snapshot.segments["untouched"].refs is first.segments["untouched"].refs
+    assert set(snapshot.collisions) == {"lookup"}
+    assert set(snapshot.tools_by_gateway_name) == {
+        "read",
+        "write",
+        "changed__lookup",
+        "untouched__lookup",
+    }
+
+    changed._tools = [make_tool("read")]
+    registry.invalidate_server("changed")
+    snapshot = await registry.refresh(manager)
+
+    assert snapshot.collisions == {}
+    assert set(snapshot.tools_by_gateway_name) == {"read", "lookup", "write"}
+
+
+@pytest.mark.asyncio
+async def test_unchanged_server_content_reuses_segment():
+    bridge_config.config.gateway.tools.cache_ttl_seconds = 3600
+    registry = GatewayToolRegistry()
+    client = FakeClient("search", [make_tool("search_web")])
+    manager = FakeClientManager({"search": client})
+    first = await registry.refresh(manager)
+
+    snapshot = await registry.refresh(manager, force=True)
+
+    assert snapshot is not first
+    assert snapshot.segments["search"] is first.segments["search"]
+
+
+@pytest.mark.asyncio
+async def test_call_downstream_tool_uses_indexed_lookup_and_respects_exposure():
+    bridge_config.config.gateway.tools.exclude = [
+        ToolExposureRule(server="filesystem", tools=["delete_*"])
+    ]
+    registry = GatewayToolRegistry()
+    client = FakeClient(
+        "filesystem", [make_tool("read_file"), make_tool("delete_file")]
+    )
+    manager = FakeClientManager({"filesystem": client})
+
+    snapshot = await registry.refresh(manager)
+    assert snapshot.segments["filesystem"].refs_by_name["read_file"].exposed
+
+    hidden = await registry.call_downstream_tool(manager, "filesystem", "delete_file", {})
+    internal = await registry.call_downstream_tool(
+        manager, "filesystem", "delete_file", {}, require_exposed=False
+    )
+    missing = await registry.call_downstream_tool(manager, "filesystem", "nope", {})
+
+    assert hidden.isError is True
+    assert internal.isError is False
+    assert missing.isError is True
+    assert client.calls == [("delete_file", {})]
+
+
+@pytest.mark.asyncio
+async def test_router_payloads_are_reused_until_inputs_change():
+    tools_config = bridge_config.config.gateway.tools
+    tools_config.mode = "router"
+    tools_config.router.expose_inventory_tool = True
+    registry = GatewayToolRegistry()
+    manager = FakeClientManager(
+        {"search": FakeClient("search", [make_tool("search_web")])}
+    )
+
+    first_inventory = await registry.call_exposed_tool(manager, "mcp_bridge_inventory", {})
+    second_inventory = await registry.call_exposed_tool(
+        manager, "mcp_bridge_inventory", {}
+    )
+    assert first_inventory is second_inventory
+
+    first_tools = registry._build_router_tools(tools_config)
+    assert registry._build_router_tools(tools_config) is first_tools
+
+    tools_config.router.prefix = "gateway"
+    renamed = await registry.list_exposed_tools(manager)
+    assert [tool.name for tool in renamed] == [
+        "gateway_search_tools",
+        "gateway_call_tool",
+        "gateway_inventory",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_router_search_ranks_name_matches_above_description_and_prefixes():
+    bridge_config.config.gateway.tools.mode = "router"
+    registry = GatewayToolRegistry()
+    manager = FakeClientManager(
+        {
+            "search": FakeClient(
+                "search",
+                [
+                    make_tool("fetch_page", "download a weather report page"),
+                    make_tool("get_weather", "current conditions for a city"),
+                    make_tool("list_files", "list directory entries"),
+                ],
+            )
+        }
+    )
+
+    result = await registry.call_exposed_tool(
+        manager, "mcp_bridge_search_tools", {"query": "weather"}
+    )
+    payload = json.loads(result.content[0].text)
+    assert [tool["tool"] for tool in payload["tools"]] == ["get_weather", "fetch_page"]
+
+    result = await registry.call_exposed_tool(
+        manager, "mcp_bridge_search_tools", {"query": "dir"}
+    )
+    payload = json.loads(result.content[0].text)
+    assert [tool["tool"] for tool in payload["tools"]] == ["list_files"]
+
+
+@pytest.mark.asyncio
+async def test_search_index_is_built_once_per_snapshot_and_used_by_dynamic_filter():
+    bridge_config.config.gateway.tools.dynamic_filter.enabled = True
+    bridge_config.config.gateway.tools.dynamic_filter.include_router_fallback = False
+    registry = GatewayToolRegistry()
+    manager = FakeClientManager(
+        {
+            "db": FakeClient("db", [make_tool("run_query", "execute SQL")]),
+            "web": FakeClient("web", [make_tool("fetch_url", "fetch a web page")]),
+        }
+    )
+
+    tools = await registry.list_exposed_tools(manager, ToolListContext("sql query"))
+    search_index = registry._snapshot.search_index
+    assert [tool.name for tool in tools] == ["run_query"]
+
+    tools = await registry.list_exposed_tools(manager, ToolListContext("fetch"))
+    assert [tool.name for tool in tools] == ["fetch_url"]
+    assert registry._snapshot.search_index is search_index
+
+
+def test_tokenize_splits_identifiers_and_cjk_text():
+    assert tokenize("getWeather search_web") == ["get", "weather", "search", "web"]
+    assert tokenize("查询数据") == ["查询", "询数", "数据"]
+
+
+@pytest.mark.asyncio
+async def test_embedding_dynamic_filter_ranks_by_similarity_and_reuses_vectors():
+    filter_config = bridge_config.config.gateway.tools.dynamic_filter
+    filter_config.enabled = True
+    filter_config.include_router_fallback = False
+    filter_config.retrieval = "embedding"
+    filter_config.max_tools = 1
+    registry = GatewayToolRegistry()
+    manager = FakeClientManager(
+        {
+            "files": FakeClient(
+                "files", [make_tool("read_file", "read the contents of a file")]
+            ),
+            "weather": FakeClient(
+                "weather", [make_tool("get_forecast", "weather forecast for a city")]
+            ),
+        }
+    )
+
+    tools = await registry.list_exposed_tools(
+        manager, ToolListContext("what is the weather forecast in Paris")
+    )
+    vector_index = registry._snapshot.vector_index
+    assert [tool.name for tool in tools] == ["get_forecast"]
+
+    tools = await registry.list_exposed_tools(manager, ToolListContext("read files"))
+    assert [tool.name for tool in tools] == ["read_file"]
+    assert registry._snapshot.vector_index is vector_index
+
+
+def test_vector_index_returns_top_k_by_cosine_similarity():
+    index = ToolVectorIndex([[1.0, 0.0], [0.6, 0.8], [0.0, 2.0]])
+
+    assert [doc_id for doc_id, _ in index.top_k([0.0, 1.0], 2)] == [2, 1]
+    assert index.top_k([1.0, 0.0], 5)[0] == (0, pytest.approx(1.0))
+
+
+def test_unknown_embedding_backend_falls_back_to_hashing():
+    backend = create_embedding_backend(ToolEmbeddingConfig(backend="missing"))
+
+    assert isinstance(backend, HashingEmbeddingBackend)
+    assert backend.embed(["search web"]) == backend.embed(["search web"])
+
+
+@pytest.mark.asyncio
+async def test_tool_payload_is_built_once_per_snapshot_version_and_context():
+    registry = GatewayToolRegistry()
+    client = CountingClient("search", [make_tool("search_web")])
+    manager = FakeClientManager({"search": client})
+    builds = []
+
+    def build(tools):
+        builds.append([tool.name for tool in tools])
+        return tuple(tool.name for tool in tools)
+
+    first = await registry.list_exposed_tool_payload(manager, None, "test", build)
+    second = await registry.list_exposed_tool_payload(manager, None, "test", build)
+    assert first is second
+    assert builds == [["search_web"]]
+
+    client._tools = [make_tool("search_web"), make_tool("fetch_url")]
+    registry.invalidate_server("search")
+    third = await registry.list_exposed_tool_payload(manager, None, "test", build)
+    assert third == ("search_web", "fetch_url")
+    assert len(builds) == 2
+
+
+@pytest.mark.asyncio
+async def test_tool_payload_cache_is_dropped_for_a_new_config():
+    bridge_config.config.gateway.tools.mode = "router"
+    registry = GatewayToolRegistry()
+    manager = FakeClientManager({"search": FakeClient("search", [make_tool("search_web")])})
+
+    def build(tools):
+        return tuple(tool.name for tool in tools)
+
+    first = await registry.list_exposed_tool_payload(manager, None, "test", build)
+    assert first == ("mcp_bridge_search_tools", "mcp_bridge_call_tool")
+
+    tools_config = GatewayConfig().tools
+    tools_config.mode = "router"
+    tools_config.router.prefix = "gateway"
+    bridge_config.config = SimpleNamespace(gateway=GatewayConfig(tools=tools_config))
+
+    second = await registry.list_exposed_tool_payload(manager, None, "test", build)
+    assert second == ("gateway_search_tools", "gateway_call_tool")
@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from mcp_bridge.config.final import InferenceServer
+from mcp_bridge.openai_clients import genericHttpxClient
+
+pytestmark = pytest.mark.unit
+
+
+class FakeRequest:
+    def __init__(self, headers: dict[str, str]) -> None:
+        self.headers = headers
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(
+        genericHttpxClient,
+        "config",
+        SimpleNamespace(inference_server=InferenceServer(base_url="http://test/v1")),
+    )
+    seen_headers: list[httpx.Headers] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers)
+        return httpx.Response(200, json={"ok": True})
+
+    pool = genericHttpxClient.InferenceClientPool()
+    pool._client = httpx.AsyncClient(
+        base_url="http://test/v1", transport=httpx.MockTransport(handler)
+    )
+    pool.seen_headers = seen_headers
+    monkeypatch.setattr(genericHttpxClient, "InferencePool", pool)
+    yield pool
+
+
+@pytest.mark.asyncio
+async def test_get_client_reuses_shared_client_and_overlays_openwebui_headers(pool):
+    shared_client = pool.client
+    request = FakeRequest(
+        {"X-OpenWebUI-User-Id": "42", "X-Unrelated": "dropped"}
+    )
+
+    async with genericHttpxClient.get_client(request) as client:
+        await client.post("/chat/completions", json={})
+    async with genericHttpxClient.get_client() as client:
+        await client.get("/models")
+
+    assert pool.client is shared_client
+    assert pool.seen_headers[0]["x-openwebui-user-id"] == "42"
+    assert "x-unrelated" not in pool.seen_headers[0]
+    assert "x-openwebui-user-id" not in pool.seen_headers[1]
+    assert pool.stats().requests == 2
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_count_opened_connections_from_trace_events(pool):
+    opened: set[str] = set()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        # httpcore reports a new connection through the request's trace hook
+        host = request.url.host
+        if host not in opened:
+            opened.add(host)
+            await request.extensions["trace"]("connection.connect_tcp.complete", {})
+        return httpx.Response(200, json={"ok": True})
+
+    pool._client = httpx.AsyncClient(
+        base_url="http://test/v1", transport=httpx.MockTransport(handler)
+    )
+
+    async with genericHttpxClient.get_client() as client:
+        for _ in range(4):
+            await client.post("/chat/completions", json={})
+        async with client.stream("GET", "http://other/v1/models") as response:
+            await response.aread()
+
+    stats = pool.stats()
+    assert (stats.requests, stats.connections_opened) == (5, 2)
+    assert stats.reused_requests == 3
+    assert stats.reuse_rate == 0.6
+
+    await pool.aclose()
+    assert pool.stats().started is False
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from mcp_bridge.mcp_clients.jsonrpc_stream import (
+    ResponseTooLargeError,
+    SSEDecoder,
+    read_jsonrpc_response,
+)
+
+pytestmark = pytest.mark.unit
+
+
+async def chunked(data: bytes, size: int = 7, stream_stays_open: bool = False):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+    if stream_stays_open:
+        raise AssertionError("read past the matching response")
+
+
+def sse(*messages: dict) -> bytes:
+    return b"".join(b"data: " + json.dumps(m).encode() + b"\n\n" for m in messages)
+
+
+def test_sse_decoder_handles_split_lines_comments_and_multiline_data():
+    decoder = SSEDecoder()
+    stream = b": keep-alive\r\nevent: message\r\nid: 7\r\ndata: {\"a\":\r\ndata: 1}\r\n\r\n"
+
+    events = [event for i in range(len(stream)) for event in decoder.feed(stream[i : i + 1])]
+
+    assert len(events) == 1
+    assert (events[0].event, events[0].id, events[0].data) == ("message", "7", b'{"a":\n1}')
+
+
+@pytest.mark.asyncio
+async def test_sse_response_stops_at_the_matching_id():
+    notification = {"jsonrpc": "2.0", "method": "notifications/progress", "params": {}}
+    other = {"jsonrpc": "2.0", "id": 1, "result": {"other": True}}
+    response = {"jsonrpc": "2.0", "id": 2, "result": {"rows": ["x" * 100]}}
+    seen = []
+
+    async def on_message(message):
+        seen.append(message)
+
+    result = await read_jsonrpc_response(
+        chunked(sse(notification, other, response), stream_stays_open=True),
+        2,
+        max_bytes=10_000,
+        on_message=on_message,
+    )
+
+    assert result == response
+    assert seen == [notification]
+
+
+@pytest.mark.asyncio
+async def test_plain_json_and_batch_responses():
+    response = {"jsonrpc": "2.0", "id": 3, "result": {}}
+
+    assert await read_jsonrpc_response(chunked(json.dumps(response).encode()), 3, 1000) == response
+    batch = [{"jsonrpc": "2.0", "id": 2, "result": {}}, response]
+    assert await read_jsonrpc_response(chunked(json.dumps(batch).encode()), 3, 1000) == response
+
+
+@pytest.mark.asyncio
+async def test_sse_without_a_final_blank_line():
+    response = {"jsonrpc": "2.0", "id": 1, "result": {"ok": True}}
+    body = b"event: message\ndata: " + json.dumps(response).encode()
+
+    assert await read_jsonrpc_response(chunked(body), 1, 1000) == response
+
+
+@pytest.mark.asyncio
+async def test_responses_larger_than_the_limit_are_rejected():
+    response = {"jsonrpc": "2.0", "id": 1, "result": {"rows": ["x" * 5000]}}
+
+    with pytest.raises(ResponseTooLargeError):
+        await read_jsonrpc_response(chunked(sse(response), size=512), 1, max_bytes=1024)
@@ -0,0 +1,22 @@
+from types import SimpleNamespace
+
+import pytest
+
+import mcp_bridge.config as bridge_config
+from mcp_bridge.log_utils import debug_enabled
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize(
+    ("config", "expected"),
+    [
+        (SimpleNamespace(logging=SimpleNamespace(log_level="DEBUG")), True),
+        (SimpleNamespace(logging=SimpleNamespace(log_level="INFO")), False),
+        (SimpleNamespace(), True),
+    ],
+)
+def test_debug_enabled_follows_configured_log_level(monkeypatch, config, expected):
+    monkeypatch.setattr(bridge_config, "config", config)
+
+    assert debug_enabled() is expected
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from mcp import StdioServerParameters
+
+import mcp_bridge.mcp_clients.McpClientManager as manager_module
+from mcp_bridge.config.final import McpStartup
+from mcp_bridge.mcp_clients.AbstractClient import GenericMcpClient
+from mcp_bridge.mcp_clients.McpClientManager import MCPClientManager
+from mcp_bridge.mcp_clients.StdioClient import StdioClient
+
+pytestmark = pytest.mark.unit
+
+
+class DelayedClient(GenericMcpClient):
+    def __init__(self, name: str, delay: float) -> None:
+        super().__init__(name=name)
+        self.delay = delay
+
+    async def _maintain_session(self):
+        await asyncio.sleep(self.delay)
+        self.session = object()
+        await asyncio.Event().wait()
+
+
+def make_manager(monkeypatch, delays: dict[str, float | None], **startup) -> MCPClientManager:
+    monkeypatch.setattr(
+        manager_module,
+        "config",
+        SimpleNamespace(
+            mcp_servers={name: name for name in delays},
+            mcp_startup=McpStartup(**startup),
+        ),
+    )
+    manager = MCPClientManager()
+
+    async def construct_client(name, server_config):
+        if delays[name] is None:
+            raise FileNotFoundError(f"could not find command {name}")
+        client = DelayedClient(name, delays[name])
+        await client.start()
+        return client
+
+    monkeypatch.setattr(manager, "construct_client", construct_client)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_initialize_returns_once_the_quorum_is_connected(monkeypatch):
+    manager = make_manager(
+        monkeypatch, {"fast": 0.01, "also_fast": 0.01, "slow": 5}, quorum=0.5, timeout=5
+    )
+
+    started = time.perf_counter()
+    await manager.initialize()
+
+    assert time.perf_counter() - started < 1
+    assert manager.ready
+    assert manager.startup_status().connected == 2
+    assert manager.clients["slow"].session is None
+
+
+@pytest.mark.asyncio
+async def test_initialize_stops_waiting_at_the_deadline(monkeypatch):
+    manager = make_manager(
+        monkeypatch, {"fast": 0.01, "slow": 0.3}, quorum=1.0, timeout=0.05
+    )
+
+    await manager.initialize()
+
+    assert not manager.ready
+    status = manager.startup_status()
+    assert (status.connected, status.required, status.configured) == (1, 2, 2)
+
+    # the slow server keeps connecting in the background
+    async with asyncio.timeout(1):
+        while not manager.ready:
+            await asyncio.sleep(0.01)
+    assert manager.clients["slow"].session is not None
+
+
+@pytest.mark.asyncio
+async def test_failed_clients_do_not_stop_the_other_servers(monkeypatch):
+    manager = make_manager(monkeypatch, {"missing": None, "ok": 0.01}, quorum=0.5)
+
+    await manager.initialize()
+
+    assert manager.ready
+    assert list(manager.clients) == ["ok"]
+    assert manager.startup_status().failed == ["missing"]
+
+
+@pytest.mark.asyncio
+async def test_servers_that_fail_to_construct_do_not_count_towards_the_quorum(
+    monkeypatch,
+):
+    manager = make_manager(
+        monkeypatch, {"missing": None, "ok": 0.01}, quorum=1.0, timeout=5
+    )
+
+    started = time.perf_counter()
+    await manager.initialize()
+
+    assert time.perf_counter() - started < 1
+    assert manager.ready
+    status = manager.startup_status()
+    assert (status.connected, status.required, status.configured) == (1, 1, 2)
+
+
+@pytest.mark.asyncio
+async def test_servers_that_are_down_at_boot_make_the_manager_ready_later(monkeypatch):
+    manager = make_manager(monkeypatch, {"down": 0.2}, quorum=1.0, timeout=0.01)
+
+    await manager.initialize()
+    assert not manager.ready
+
+    async with asyncio.timeout(1):
+        while not manager.ready:
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_manager_is_ready_without_waiting_by_default(monkeypatch):
+    manager = make_manager(monkeypatch, {"slow": 5})
+
+    started = time.perf_counter()
+    await manager.initialize()
+
+    assert time.perf_counter() - started < 1
+    assert manager.ready
+    assert manager.startup_status().required == 0
+
+
+def test_stdio_client_raises_for_a_missing_command():
+    with pytest.raises(FileNotFoundError):
+        StdioClient(
+            "missing", StdioServerParameters(command="definitely-not-a-real-command")
+        )
@@ -0,0 +1,246 @@
+import asyncio
+
+import pytest
+from mcp.types import CallToolResult, TextContent
+from pydantic import ValidationError
+
+from mcp_bridge.config.final import (
+    DockerMCPServerConfig,
+    StdioMCPServer,
+    StdioMCPServerAutoscale,
+)
+from mcp_bridge.mcp_clients.AbstractClient import GenericMcpClient
+from mcp_bridge.mcp_clients.McpClientManager import MCPClientManager
+from mcp_bridge.mcp_clients.PooledClient import (
+    AutoscalingPooledClient,
+    PooledClient,
+    percentile,
+)
+
+pytestmark = pytest.mark.unit
+
+
+class FakeSession:
+    def __init__(self, member: str, delays: dict[str, float]) -> None:
+        self.member = member
+        self.delays = delays
+        self.calls: list[str] = []
+
+    async def call_tool(self, name: str, arguments: dict) -> CallToolResult:
+        self.calls.append(name)
+        await asyncio.sleep(self.delays.get(name, 0.01))
+        return CallToolResult(content=[TextContent(type="text", text=self.member)])
+
+
+class PoolMember(GenericMcpClient):
+    def __init__(self, name: str, member: str, connected: bool = True, **delays) -> None:
+        super().__init__(name=name)
+        self.connected = connected
+        self.fake_session = FakeSession(member, delays)
+
+    async def _maintain_session(self):
+        if not self.connected:
+            raise ConnectionRefusedError("connection refused")
+        self.session = self.fake_session
+        await asyncio.Event().wait()
+
+
+async def wait_connected(pool: PooledClient) -> PooledClient:
+    async with asyncio.timeout(1):
+        await pool.wait_until_ready()
+        while len(pool.connected_members()) < sum(m.connected for m in pool.members):
+            await asyncio.sleep(0.01)
+    return pool
+
+
+async def start_pool(*members: PoolMember, **options) -> PooledClient:
+    pool = PooledClient("fetch", None, list(members), **options)
+    await pool.start()
+    return await wait_connected(pool)
+
+
+async def start_autoscaling_pool(**autoscale) -> AutoscalingPooledClient:
+    created = []
+
+    def member_factory():
+        created.append(PoolMember("fetch", str(len(created)), fetch=0.1))
+        return created[-1]
+
+    # scaling decisions are made by the tests
+    pool = AutoscalingPooledClient(
+        "fetch", None, StdioMCPServerAutoscale(interval=60, **autoscale), member_factory
+    )
+    await pool.start()
+    return await wait_connected(pool)
+
+
+@pytest.mark.asyncio
+async def test_pool_spreads_concurrent_calls_over_its_sessions():
+    pool = await start_pool(*(PoolMember("fetch", str(i)) for i in range(3)))
+
+    results = await asyncio.gather(*(pool.call_tool("fetch", {}) for _ in range(6)))
+
+    served = [result.content[0].text for result in results]
+    assert sorted(served) == ["0", "0", "1", "1", "2", "2"]
+    assert sum(pool.outstanding.values()) == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_sends_calls_to_the_least_busy_session():
+    pool = await start_pool(*(PoolMember("fetch", str(i), slow=0.3) for i in range(2)))
+
+    slow_call = asyncio.create_task(pool.call_tool("slow", {}))
+    await asyncio.sleep(0.01)
+    busy, idle = sorted(pool.members, key=lambda member: -pool.outstanding[member])
+    for _ in range(3):
+        await pool.call_tool("fetch", {})
+
+    assert busy.fake_session.calls == ["slow"]
+    assert idle.fake_session.calls == ["fetch"] * 3
+    await slow_call
+
+
+@pytest.mark.asyncio
+async def test_pool_skips_disconnected_sessions():
+    pool = await start_pool(
+        PoolMember("fetch", "down", connected=False), PoolMember("fetch", "up")
+    )
+
+    results = await asyncio.gather(*(pool.call_tool("fetch", {}) for _ in range(4)))
+
+    assert {result.content[0].text for result in results} == {"up"}
+    status = await pool.status()
+    assert status.online
+    assert (status.sessions, status.sessions_online) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_construct_client_starts_one_member_per_pool_slot(monkeypatch):
+    manager = MCPClientManager()
+    created = []
+
+    def create_client(name, server_config):
+        created.append(server_config)
+        return PoolMember(name, str(len(created)))
+
+    monkeypatch.setattr(manager, "_create_client", create_client)
+
+    client = await manager.construct_client(
+        "docker", DockerMCPServerConfig(image="mcp/fetch", container_name="fetch", pool_size=3)
+    )
+    single = await manager.construct_client(
+        "stdio", StdioMCPServer(command="uvx", args=["mcp-server-fetch"])
+    )
+
+    assert isinstance(client, PooledClient)
+    assert len(client.members) == 3
+    assert [config.container_name for config in created[:3]] == [
+        "fetch-1",
+        "fetch-2",
+        "fetch-3",
+    ]
+    assert isinstance(single, PoolMember)
+
+
+@pytest.mark.asyncio
+async def test_pool_queues_requests_while_every_session_is_busy():
+    pool = await start_pool(PoolMember("fetch", "0", fetch=0.05), max_in_flight=1)
+
+    calls = asyncio.gather(*(pool.call_tool("fetch", {}) for _ in range(3)))
+    await asyncio.sleep(0.01)
+    status = await pool.status()
+    await calls
+
+    assert (status.outstanding_requests, status.waiting_requests) == (1, 2)
+    assert percentile(list(pool.waits), 0.95) >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_waiting_requests_go_to_a_member_that_connects():
+    reconnecting = PoolMember("fetch", "reconnected", connected=False)
+    pool = await start_pool(PoolMember("fetch", "busy", slow=5), reconnecting, max_in_flight=1)
+    reconnecting.circuit.state = "open"
+
+    slow_call = asyncio.create_task(pool.call_tool("slow", {}))
+    waiting_call = asyncio.create_task(pool.call_tool("fetch", {}))
+    await asyncio.sleep(0.01)
+    assert pool.waiting == 1
+
+    reconnecting.circuit.record_success()
+    reconnecting.session = reconnecting.fake_session
+    async with asyncio.timeout(1):
+        result = await waiting_call
+
+    assert result.content[0].text == "reconnected"
+    slow_call.cancel()
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_autoscaling_pool_adds_a_process_under_load():
+    pool = await start_autoscaling_pool(min_size=1, max_size=2, max_wait_p95=10)
+
+    calls = asyncio.gather(*(pool.call_tool("fetch", {}) for _ in range(4)))
+    await asyncio.sleep(0.01)
+    await pool.scale(wait_p95=0)
+    await wait_connected(pool)
+    # at max_size, further load does not add processes
+    await pool.scale(wait_p95=0)
+    results = await calls
+
+    assert len(pool.members) == 2
+    assert {result.content[0].text for result in results} == {"0", "1"}
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_autoscaling_pool_adds_a_process_when_requests_wait_too_long():
+    pool = await start_autoscaling_pool(max_wait_p95=0.5)
+
+    await pool.scale(wait_p95=0.2)
+    assert len(pool.members) == 1
+
+    await pool.scale(wait_p95=0.8)
+    assert len(pool.members) == 2
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_autoscaling_pool_stops_idle_processes_after_the_cooldown():
+    pool = await start_autoscaling_pool(min_size=2, max_size=3, max_wait_p95=0)
+    await pool.scale(wait_p95=1)
+    await wait_connected(pool)
+    newest = pool.members[-1]
+
+    await pool.scale(wait_p95=0)
+    assert len(pool.members) == 3
+
+    pool.autoscale = pool.autoscale.model_copy(update={"idle_cooldown": 0.05})
+    await asyncio.sleep(0.06)
+    await pool.scale(wait_p95=0)
+    await pool.scale(wait_p95=0)
+
+    assert len(pool.members) == 2
+    assert newest not in pool.members
+    assert newest.session is None
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_autoscaling_pool_keeps_the_waits_reported_by_status():
+    pool = await start_autoscaling_pool(max_size=1)
+
+    await asyncio.gather(*(pool.call_tool("fetch", {}) for _ in range(3)))
+    assert len(pool._waits_since_last_decision()) == 3
+    await pool.call_tool("fetch", {})
+
+    assert len(pool._waits_since_last_decision()) == 1
+    assert pool._waits_since_last_decision() == []
+    assert len(pool.waits) == 4
+    assert (await pool.status()).wait_p95 >= 0.1
+    await pool.stop()
+
+
+def test_autoscale_bounds_are_validated():
+    with pytest.raises(ValidationError):
+        StdioMCPServerAutoscale(min_size=3, max_size=2)
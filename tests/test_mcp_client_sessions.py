@@ -0,0 +1,184 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import anyio
+import mcp.types as types
+import pytest
+
+import mcp_bridge.mcp_clients.AbstractClient as client_module
+from mcp_bridge.config.final import McpSessions
+from mcp_bridge.mcp_clients.AbstractClient import GenericMcpClient
+from mcp_bridge.mcp_clients.circuit_breaker import CircuitBreaker, backoff_delay
+from mcp_bridge.mcp_clients.session import McpClientSession
+
+pytestmark = pytest.mark.unit
+
+
+class ScriptedClient(GenericMcpClient):
+    """client whose sessions fail or last for as long as the test says"""
+
+    def __init__(self, name: str, fail: bool = False) -> None:
+        super().__init__(name=name)
+        self.fail = fail
+        self.attempts = 0
+
+    async def _maintain_session(self):
+        self.attempts += 1
+        if self.fail:
+            raise ConnectionRefusedError("connection refused")
+        self.session = object()
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def sessions_config(monkeypatch):
+    def configure(**sessions):
+        monkeypatch.setattr(
+            client_module,
+            "config",
+            SimpleNamespace(mcp_sessions=McpSessions(**sessions)),
+        )
+
+    configure()
+    return configure
+
+
+@pytest.mark.asyncio
+async def test_wait_for_session_wakes_up_when_the_session_is_set(sessions_config):
+    client = ScriptedClient("fetch")
+    asyncio.get_running_loop().call_later(0.02, setattr, client, "session", object())
+
+    started = time.perf_counter()
+    await client._wait_for_session()
+
+    assert time.perf_counter() - started < 0.5
+    assert client.session is not None
+
+
+@pytest.mark.asyncio
+async def test_wait_for_session_uses_the_per_server_deadline(sessions_config):
+    sessions_config(wait_timeout=30, server_wait_timeouts={"fetch": 0.05})
+    client = ScriptedClient("fetch")
+
+    started = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        await client._wait_for_session(http_error=False)
+
+    assert time.perf_counter() - started < 1
+
+
+@pytest.mark.asyncio
+async def test_wait_for_session_fails_fast_for_an_unavailable_server(sessions_config):
+    sessions_config(wait_timeout=30, failure_threshold=1)
+    client = ScriptedClient("fetch", fail=True)
+    await client.start()
+    await asyncio.sleep(0.01)
+
+    started = time.perf_counter()
+    with pytest.raises(ConnectionError):
+        await client._wait_for_session(http_error=False)
+
+    assert time.perf_counter() - started < 0.1
+
+    status = await client.status()
+    assert status.circuit_state == "open"
+    assert status.consecutive_failures == 1
+    assert not status.online
+    assert 0 < status.next_retry_in <= 1
+
+
+@pytest.mark.asyncio
+async def test_ended_sessions_are_cleared(sessions_config):
+    client = ScriptedClient("fetch")
+    await client.start()
+    await client.wait_until_ready()
+
+    await asyncio.sleep(0.05)
+
+    assert client.attempts == 1
+    assert client.session is None
+    assert client.circuit.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_failed_connections_back_off(sessions_config, monkeypatch):
+    sessions_config(reconnect_initial_delay=0.01, reconnect_max_delay=10)
+    delays = []
+    sleep = asyncio.sleep
+
+    async def record_sleep(delay):
+        delays.append(delay)
+        if len(delays) == 5:
+            raise asyncio.CancelledError
+        await sleep(0)
+
+    monkeypatch.setattr(client_module.asyncio, "sleep", record_sleep)
+    client = ScriptedClient("fetch", fail=True)
+
+    with pytest.raises(asyncio.CancelledError):
+        await client._session_maintainer()
+
+    assert client.attempts == 5
+    assert all(later > earlier for earlier, later in zip(delays, delays[1:]))
+
+
+def test_circuit_breaker_opens_and_recovers_through_half_open():
+    circuit = CircuitBreaker(failure_threshold=2)
+
+    circuit.attempt()
+    circuit.record_failure()
+    assert circuit.state == "closed"
+
+    circuit.attempt()
+    circuit.record_failure()
+    assert circuit.state == "open"
+
+    circuit.attempt()
+    assert circuit.state == "half_open"
+    circuit.record_failure()
+    assert circuit.state == "open"
+
+    circuit.attempt()
+    circuit.record_success()
+    assert (circuit.state, circuit.failures) == ("closed", 0)
+
+
+def test_backoff_delay_is_capped_and_jittered():
+    delays = [backoff_delay(failures, 0.5, 60) for failures in range(12)]
+
+    assert 0.25 <= delays[0] <= 0.5
+    assert all(30 <= delay <= 60 for delay in delays[8:])
+    assert len({backoff_delay(3, 0.5, 60) for _ in range(10)}) > 1
+
+
+@pytest.mark.asyncio
+async def test_session_answers_server_pings_and_stays_usable():
+    to_client, client_read = anyio.create_memory_object_stream(10)
+    client_write, from_client = anyio.create_memory_object_stream(10)
+
+    async def receive() -> types.JSONRPCMessage:
+        async with asyncio.timeout(1):
+            return await from_client.receive()
+
+    async with McpClientSession(client_read, client_write) as session:
+        for ping_id in ("ping-1", "ping-2"):
+            await to_client.send(
+                types.JSONRPCMessage(
+                    types.JSONRPCRequest(jsonrpc="2.0", id=ping_id, method="ping")
+                )
+            )
+            response = (await receive()).root
+            assert isinstance(response, types.JSONRPCResponse)
+            assert (response.id, response.result) == (ping_id, {})
+
+        listing = asyncio.create_task(session.list_tools())
+        request = (await receive()).root
+        assert request.method == "tools/list"
+        await to_client.send(
+            types.JSONRPCMessage(
+                types.JSONRPCResponse(jsonrpc="2.0", id=request.id, result={"tools": []})
+            )
+        )
+        async with asyncio.timeout(1):
+            assert (await listing).tools == []
@@ -0,0 +1,301 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from mcp import types
+
+import mcp_bridge.mcp_clients.streamable_http as streamable_http
+from mcp_bridge.config.final import HTTPMCPServer
+from mcp_bridge.mcp_clients.HttpClient import HttpClient
+from mcp_bridge.mcp_clients.session import McpClientSession
+from mcp_bridge.mcp_clients.streamable_http import streamable_http_client
+
+pytestmark = pytest.mark.unit
+
+
+def sse_event(message: dict, event_id: str | None = None) -> bytes:
+    event = f"id: {event_id}\n" if event_id else ""
+    return f"{event}event: message\ndata: {json.dumps(message)}\n\n".encode()
+
+
+class FakeStreamableHttpServer:
+    """answers like a Streamable HTTP MCP server backed by httpx.MockTransport"""
+
+    def __init__(
+        self,
+        tool_delay: float = 0.0,
+        result_size: int = 10,
+        drop_responses: bool = False,
+        fail_client_responses: bool = False,
+        unanswered: str | None = None,
+        listen_status: int | None = None,
+    ) -> None:
+        self.tool_delay = tool_delay
+        self.result_size = result_size
+        self.drop_responses = drop_responses
+        self.fail_client_responses = fail_client_responses
+        self.unanswered = unanswered
+        self.listen_status = listen_status
+        self.pending: dict[str, dict] = {}
+        self.requests: list[httpx.Request] = []
+        self.get_requests: list[httpx.Request] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.method == "DELETE":
+            return httpx.Response(200)
+        if request.method == "GET":
+            return self._listen(request)
+
+        message = json.loads(request.content)
+        if "method" not in message and self.fail_client_responses:
+            raise httpx.ConnectError("connection reset", request=request)
+        if "id" not in message or "method" not in message:
+            return httpx.Response(202)
+
+        if message["method"] == self.unanswered:
+            await asyncio.Event().wait()
+
+        if message["method"] == "initialize":
+            return httpx.Response(
+                200,
+                headers={"mcp-session-id": "session-1"},
+                json={
+                    "jsonrpc": "2.0",
+                    "id": message["id"],
+                    "result": {
+                        "protocolVersion": "2024-11-05",
+                        "capabilities": {},
+                        "serverInfo": {"name": "fake", "version": "1"},
+                    },
+                },
+            )
+
+        if message["method"] == "tools/call":
+            await asyncio.sleep(self.tool_delay)
+            event_id = f"post-{message['id']}"
+            response = {
+                "jsonrpc": "2.0",
+                "id": message["id"],
+                "result": {
+                    "content": [{"type": "text", "text": "x" * self.result_size}]
+                },
+            }
+            body = sse_event(
+                {"jsonrpc": "2.0", "method": "notifications/tools/list_changed"},
+                event_id=event_id,
+            )
+            if self.drop_responses:
+                # the stream breaks before the response, it is replayed on a GET
+                self.pending[event_id] = response
+            else:
+                body += sse_event(response)
+            return httpx.Response(
+                200, headers={"content-type": "text/event-stream"}, content=body
+            )
+
+        return httpx.Response(
+            200, json={"jsonrpc": "2.0", "id": message["id"], "result": {}}
+        )
+
+    def _listen(self, request: httpx.Request) -> httpx.Response:
+        resumed = self.pending.pop(request.headers.get("last-event-id", ""), None)
+        if resumed is not None:
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                content=sse_event(resumed),
+            )
+
+        self.get_requests.append(request)
+        if self.listen_status is not None:
+            return httpx.Response(self.listen_status)
+        if len(self.get_requests) > 2:
+            return httpx.Response(405)
+        body = sse_event(
+            {"jsonrpc": "2.0", "method": "notifications/prompts/list_changed"},
+            event_id=f"event-{len(self.get_requests)}",
+        )
+        return httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=body
+        )
+
+
+def make_client(server: FakeStreamableHttpServer, **config) -> HttpClient:
+    client = HttpClient("starrocks", HTTPMCPServer(url="http://mcp.test/mcp", **config))
+    client._create_http_client = lambda: httpx.AsyncClient(
+        transport=httpx.MockTransport(server)
+    )
+    client.notifications = []
+
+    async def handle_notification(notification):
+        client.notifications.append(notification.root.method)
+
+    client.handle_notification = handle_notification
+    return client
+
+
+async def connect(client: HttpClient) -> HttpClient:
+    await client.start()
+    async with asyncio.timeout(2):
+        await client.wait_until_ready()
+    return client
+
+
+def test_http_client_uses_the_configured_pool_and_timeouts():
+    client = HttpClient(
+        "starrocks",
+        HTTPMCPServer(
+            url="http://mcp.test/mcp",
+            pool={"max_connections": 4, "max_keepalive_connections": 2},
+            timeouts={"connect": 1.5, "read": 120},
+        ),
+    )
+
+    http_client = client._create_http_client()
+
+    assert http_client.timeout.connect == 1.5
+    assert http_client.timeout.read == 120
+    pool = http_client._transport._pool
+    assert (pool._max_connections, pool._max_keepalive_connections) == (4, 2)
+
+
+@pytest.mark.asyncio
+async def test_http_client_multiplexes_concurrent_tool_calls():
+    server = FakeStreamableHttpServer(tool_delay=0.1)
+    client = await connect(make_client(server))
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(client.call_tool("query", {"sql": "select 1"}) for _ in range(5))
+    )
+
+    assert time.perf_counter() - started < 0.3
+    assert [result.content[0].text for result in results] == ["x" * 10] * 5
+    assert client.pool_stats().peak_in_flight >= 5
+
+    posts = [r for r in server.requests if r.method == "POST"]
+    assert "mcp-session-id" not in posts[0].headers
+    assert all(r.headers["mcp-session-id"] == "session-1" for r in posts[1:])
+    assert all(r.headers["mcp-protocol-version"] == "2024-11-05" for r in posts[1:])
+
+
+@pytest.mark.asyncio
+async def test_http_client_receives_notifications_from_both_streams():
+    server = FakeStreamableHttpServer()
+    client = await connect(make_client(server))
+
+    await client.call_tool("query", {})
+    async with asyncio.timeout(3):
+        while len(server.get_requests) < 3:
+            await asyncio.sleep(0.05)
+
+    assert "notifications/tools/list_changed" in client.notifications
+    assert client.notifications.count("notifications/prompts/list_changed") == 2
+    # the GET stream is resumed after the last event it delivered
+    assert "last-event-id" not in server.get_requests[0].headers
+    assert server.get_requests[1].headers["last-event-id"] == "event-1"
+
+
+@pytest.mark.asyncio
+async def test_http_client_resumes_a_broken_response_stream():
+    server = FakeStreamableHttpServer(drop_responses=True)
+    client = await connect(make_client(server))
+
+    result = await client.call_tool("query", {})
+
+    assert not result.isError
+    assert result.content[0].text == "x" * 10
+    assert not server.pending
+
+
+@pytest.mark.asyncio
+async def test_http_client_fails_calls_with_oversized_responses():
+    server = FakeStreamableHttpServer(result_size=4096)
+    client = await connect(make_client(server, max_response_bytes=1024))
+
+    result = await client.call_tool("query", {})
+
+    assert result.isError
+    assert "ResponseTooLargeError" in result.content[0].text
+
+
+@pytest.mark.asyncio
+async def test_http_client_requests_without_a_response_time_out():
+    server = FakeStreamableHttpServer(unanswered="tools/list")
+    client = await connect(make_client(server, timeouts={"read": 0.2}))
+
+    async with asyncio.timeout(2):
+        result = await client.list_tools()
+
+    assert result.tools == []
+
+
+@pytest.mark.asyncio
+async def test_streamable_http_client_terminates_the_session():
+    server = FakeStreamableHttpServer()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as http_client:
+        async with streamable_http_client(
+            http_client, "http://mcp.test/mcp", max_response_bytes=1024
+        ) as streams:
+            async with McpClientSession(*streams) as session:
+                await session.initialize()
+                assert isinstance(await session.send_ping(), types.EmptyResult)
+
+    delete = next(r for r in server.requests if r.method == "DELETE")
+    assert delete.headers["mcp-session-id"] == "session-1"
+
+
+@pytest.mark.asyncio
+async def test_streamable_http_client_survives_a_failed_response_post():
+    server = FakeStreamableHttpServer(fail_client_responses=True)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as http_client:
+        async with streamable_http_client(
+            http_client, "http://mcp.test/mcp", max_response_bytes=1024
+        ) as (read_stream, write_stream):
+            async with McpClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                # e.g. the reply to a ping the server sent
+                await write_stream.send(
+                    types.JSONRPCMessage(
+                        types.JSONRPCResponse(jsonrpc="2.0", id="server-1", result={})
+                    )
+                )
+                await asyncio.sleep(0.05)
+
+                assert isinstance(await session.send_ping(), types.EmptyResult)
+
+
+@pytest.mark.asyncio
+async def test_http_client_stops_listening_when_the_get_stream_is_refused(monkeypatch):
+    monkeypatch.setattr(streamable_http, "LISTEN_RETRY_DELAY", 0.01)
+    server = FakeStreamableHttpServer(listen_status=400)
+    client = await connect(make_client(server))
+
+    await asyncio.sleep(0.2)
+
+    assert len(server.get_requests) == 1
+    await client.call_tool("query", {})
+    await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_http_client_backs_off_when_the_get_stream_fails(monkeypatch):
+    failures = []
+
+    def record_backoff(count, initial, maximum):
+        failures.append(count)
+        return 0.01
+
+    monkeypatch.setattr(streamable_http, "backoff_delay", record_backoff)
+    server = FakeStreamableHttpServer(listen_status=503)
+    client = await connect(make_client(server))
+
+    async with asyncio.timeout(2):
+        while len(server.get_requests) < 4:
+            await asyncio.sleep(0.01)
+
+    assert failures[:3] == [1, 2, 3]
+    await client.stop()
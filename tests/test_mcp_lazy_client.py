@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+from mcp.types import CallToolResult, ListToolsResult, TextContent, Tool
+
+from mcp_bridge.config.final import StdioMCPServer
+from mcp_bridge.mcp_clients.AbstractClient import GenericMcpClient
+from mcp_bridge.mcp_clients.LazyClient import LazyClient
+from mcp_bridge.mcp_clients.McpClientManager import MCPClientManager
+from mcp_bridge.mcp_clients.tool_cache import ToolCache, config_fingerprint
+
+pytestmark = pytest.mark.unit
+
+FETCH = Tool(name="fetch", inputSchema={"type": "object"})
+
+
+class FakeSession:
+    async def list_tools(self) -> ListToolsResult:
+        return ListToolsResult(tools=[FETCH])
+
+    async def call_tool(self, name: str, arguments: dict) -> CallToolResult:
+        await asyncio.sleep(0.01)
+        return CallToolResult(content=[TextContent(type="text", text=name)])
+
+
+class CountingClient(GenericMcpClient):
+    def __init__(self, name: str) -> None:
+        super().__init__(name=name)
+        self.starts = 0
+
+    async def _maintain_session(self):
+        self.starts += 1
+        self.session = FakeSession()
+        await asyncio.Event().wait()
+
+
+def server_config(**options) -> StdioMCPServer:
+    return StdioMCPServer(command="uvx", args=["mcp-server-fetch"], lazy=True, **options)
+
+
+def make_client(tmp_path, **options) -> LazyClient:
+    config = server_config(**options)
+    return LazyClient(
+        "fetch",
+        config,
+        CountingClient("fetch"),
+        ToolCache(str(tmp_path / "tools.json")),
+        config.idle_timeout,
+    )
+
+
+@pytest.mark.asyncio
+async def test_lazy_server_without_cached_tools_is_started_to_record_them(tmp_path):
+    client = make_client(tmp_path)
+
+    await client.start()
+    async with asyncio.timeout(1):
+        await client.wait_until_ready()
+        while client.cached_tools is None:
+            await asyncio.sleep(0.01)
+
+    assert client.running
+    cache = ToolCache(str(tmp_path / "tools.json"))
+    assert cache.get("fetch", client.fingerprint) == [FETCH]
+    await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_lazy_server_lists_cached_tools_and_starts_on_the_first_call(tmp_path):
+    await ToolCache(str(tmp_path / "tools.json")).put(
+        "fetch", config_fingerprint(server_config()), [FETCH]
+    )
+    client = make_client(tmp_path)
+
+    await client.start()
+    await client.wait_until_ready()
+
+    assert (await client.list_tools()).tools == [FETCH]
+    assert not client.running and client.client.starts == 0
+
+    result = await client.call_tool("fetch", {})
+
+    assert result.content[0].text == "fetch"
+    assert client.running and client.client.starts == 1
+    await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_lazy_server_stops_after_the_idle_timeout(tmp_path):
+    await ToolCache(str(tmp_path / "tools.json")).put(
+        "fetch", config_fingerprint(server_config(idle_timeout=0.1)), [FETCH]
+    )
+    client = make_client(tmp_path, idle_timeout=0.1)
+    await client.start()
+
+    await client.call_tool("fetch", {})
+    await asyncio.sleep(0.05)
+    # tool listings do not keep an idle server running
+    await client.list_tools()
+    async with asyncio.timeout(1):
+        while client.running:
+            await asyncio.sleep(0.02)
+
+    assert client.client.session is None
+    status = await client.status()
+    assert (status.lazy, status.running, status.online) == (True, False, False)
+
+    await client.call_tool("fetch", {})
+    assert client.client.starts == 2
+    await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_tool_cache_ignores_entries_of_a_changed_config(tmp_path):
+    cache = ToolCache(str(tmp_path / "tools.json"))
+    await cache.put("fetch", config_fingerprint(server_config()), [FETCH])
+
+    changed = StdioMCPServer(command="uvx", args=["mcp-server-fetch@2"])
+    runtime_only = server_config(idle_timeout=5, pool_size=3)
+
+    assert cache.get("fetch", config_fingerprint(changed)) is None
+    assert cache.get("fetch", config_fingerprint(runtime_only)) == [FETCH]
+
+
+def test_tool_cache_ignores_an_unreadable_file(tmp_path):
+    path = tmp_path / "tools.json"
+    path.write_text("{not json")
+
+    assert ToolCache(str(path)).get("fetch", "fingerprint") is None
+
+
+@pytest.mark.asyncio
+async def test_construct_client_wraps_lazy_servers(tmp_path, monkeypatch):
+    manager = MCPClientManager()
+    manager._tool_cache = ToolCache(str(tmp_path / "tools.json"))
+    await manager._tool_cache.put("fetch", config_fingerprint(server_config()), [FETCH])
+    monkeypatch.setattr(manager, "_create_client", lambda name, _: CountingClient(name))
+
+    client = await manager.construct_client("fetch", server_config())
+
+    assert isinstance(client, LazyClient)
+    assert not client.running
+    # cached tools make a stopped lazy server ready, as wait_until_ready does
+    manager.clients["fetch"] = client
+    assert client.is_ready()
+    assert manager.connected_count() == 1